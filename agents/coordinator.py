@@ -20,6 +20,7 @@ def analyze_ticker(ticker, progress_callback=None):
             "research": dict,
             "synthesis": dict,
             "report_text": str,
+            "quant_engine": QuantEngine (renders charts on demand),
             "error": str (optional)
         }
     """
@@ -30,7 +31,8 @@ def analyze_ticker(ticker, progress_callback=None):
     try:
         # 1. Fetch Data
         update_progress(10, f"📥 Fetching Market Data for {ticker}...")
-        df = get_market_data(ticker, period="2y", save_dir=None)
+        # QuantEngine only reads the frame, so the cached history is shared as-is
+        df = get_market_data(ticker, period="2y", copy=False)
         
         if df.empty:
             return {"error": f"Could not find data for {ticker}. Check spelling or add .BA for Argentina."}
@@ -38,13 +40,14 @@ def analyze_ticker(ticker, progress_callback=None):
         # 2. Researcher & NLP
         update_progress(30, f"🕵️ Researcher Agent: Analyzing Fundamentals & News...")
         researcher = Researcher()
-        intel = researcher.get_market_intel(ticker)
-        sentiment = researcher.get_sentiment(ticker)
+        # Fundamentals and news are fetched concurrently
+        research = researcher.research(ticker)
+        intel, sentiment = research['intel'], research['sentiment']
         intel['data']['sentiment'] = sentiment # Merge
         
         # 3. Quant
         update_progress(60, f"📉 Quant Agent: Calculating Technicals...")
-        # Temp dir for plots
+        # Temp dir for plots (rendered only if a consumer asks for them)
         temp_dir = "temp_dashboard"
         os.makedirs(temp_dir, exist_ok=True)
         
@@ -63,7 +66,8 @@ def analyze_ticker(ticker, progress_callback=None):
             "quant": quant_res,
             "research": intel['data'],
             "synthesis": analysis,
-            "report_text": report
+            "report_text": report,
+            "quant_engine": quant
         }
         
     except Exception as e:
@@ -3,7 +3,8 @@ import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
 import scipy.optimize as sco
-from utils.data_loader import get_market_data
+from utils.data_loader import get_price_panel
+from utils.risk import risk_report
 from utils.logger import setup_logger
 import os
 
@@ -20,23 +21,30 @@ class PortfolioManager:
     def load_data(self):
         """Fetches and aligns historical data for all tickers."""
         logger.info(f"Loading data for portfolio: {self.tickers}")
-        df_list = []
-        
+
+        # One grouped download for the whole portfolio, aligned on dates
+        panel = get_price_panel(self.tickers, period=self.period, field="Close")
+
         for ticker in self.tickers:
-            df = get_market_data(ticker, period=self.period, save_dir="data/portfolio")
-            if not df.empty:
-                # Keep only Close price and rename col to Ticker
-                df_close = df[['Close']].rename(columns={'Close': ticker})
-                df_list.append(df_close)
-            else:
+            if ticker not in panel.columns:
                 logger.warning(f"Could not load data for {ticker}")
 
-        if df_list:
-            self.data = pd.concat(df_list, axis=1).dropna()
+        if not panel.empty:
+            self.data = panel.dropna()
             logger.info(f"Data aligned. Shape: {self.data.shape}")
         else:
             logger.error("No data loaded for portfolio.")
 
+    def risk_report(self, allocation=None, **kwargs):
+        """
+        VaR/CVaR of the portfolio (historical, parametric, Monte Carlo) for an
+        allocation dict as returned by the optimizers. Equal weights if None.
+        """
+        if self.data.empty: return None
+
+        returns = np.log(self.data / self.data.shift(1)).dropna()
+        return risk_report(returns, weights=allocation, **kwargs)
+
     def plot_correlation_matrix(self):
         """Generates and saves a correlation heatmap."""
         if self.data.empty: return
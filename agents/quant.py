@@ -3,14 +3,38 @@ import numpy as np
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import os
+from utils.indicators import max_drawdown, batch_metrics, compute
+from utils.benchmarks import benchmark_for, get_benchmark_returns, beta_matrix, universe_betas
+from utils.render_cache import RenderCache
+from utils.risk import historical_var, risk_report
+from utils.timeframes import multi_timeframe
+from utils.downsample import MAX_CHART_POINTS, ohlc_buckets, decimate_line, volume_colors
+
+# Bump a version when the drawing code changes so cached renders are not reused
+STATIC_CHART_SPEC = {"kind": "static", "version": 1}
+INTERACTIVE_CHART_SPEC = {"kind": "interactive", "version": 2}
+
+# Columns derived from the price history by analyze() and the charts
+DERIVED_COLUMNS = ["Log Returns", "RSI_14", "SMA_20", "SMA_10"]
 
 class QuantEngine:
+    """
+    Metrics and charts for one ticker. The input frame is only read, never
+    modified, so a cached history can be shared across threads and sessions
+    without copies. Derived series live in `self.derived`.
+    """
     def __init__(self, ticker, data, output_dir="output"):
         self.ticker = ticker
+        # Flatten MultiIndex columns if present (common issue with yfinance)
+        # on a new frame instead of renaming the caller's columns
+        if isinstance(data.columns, pd.MultiIndex):
+            data = data.set_axis(data.columns.get_level_values(0), axis=1)
         self.data = data
+        self._derived = None
         self.output_dir = output_dir
-        os.makedirs(self.output_dir, exist_ok=True)
+        self._interactive_charts = {}
+        self._static_chart = None
+        self.render_cache = RenderCache(self.output_dir)
 
     def analyze(self):
         """
@@ -19,102 +43,132 @@ class QuantEngine:
         if self.data.empty:
             return {"error": "No data available"}
 
-        # Flatten MultiIndex columns if present (common issue with yfinance)
-        if isinstance(self.data.columns, pd.MultiIndex):
-            self.data.columns = self.data.columns.get_level_values(0)
-
-        # Calculate Log Returns
-        self.data['Log Returns'] = np.log(self.data['Close'] / self.data['Close'].shift(1))
+        # Log Returns, RSI (14), SMA 20 (basis for the chart) and SMA 10
+        returns = self.derived['Log Returns']
 
         # Risk Metrics
-        annualized_volatility = self.data['Log Returns'].std() * np.sqrt(252)
+        annualized_volatility = returns.std() * np.sqrt(252)
         
         # Max Drawdown
-        cumulative_returns = (1 + self.data['Log Returns']).cumprod()
-        peak = cumulative_returns.expanding(min_periods=1).max()
-        drawdown = (cumulative_returns / peak) - 1
-        max_drawdown = drawdown.min()
+        max_dd = max_drawdown(returns)
 
         # Momentum Metrics
-        # RSI (14)
-        delta = self.data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        self.data['RSI_14'] = 100 - (100 / (1 + rs))
-        current_rsi = self.data['RSI_14'].iloc[-1]
-
-        # SMA 20 (Basis for previous BB section, kept for chart)
-        self.data['SMA_20'] = self.data['Close'].rolling(window=20).mean()
-
-        # SMA 10
-        self.data['SMA_10'] = self.data['Close'].rolling(window=10).mean()
+        current_rsi = self.derived['RSI_14'].iloc[-1]
 
         # --- Advanced Analytics ---
         # 1. Sharpe Ratio (Risk Free Rate = 4%)
         risk_free_daily = 0.04 / 252
-        excess_returns = self.data['Log Returns'] - risk_free_daily
-        sharpe_ratio = (excess_returns.mean() / self.data['Log Returns'].std()) * np.sqrt(252)
+        excess_returns = returns - risk_free_daily
+        sharpe_ratio = (excess_returns.mean() / returns.std()) * np.sqrt(252)
 
-        # 2. Value at Risk (VaR 95%)
-        var_95 = np.percentile(self.data['Log Returns'].dropna(), 5)
+        # 2. Value at Risk (VaR 95%) and Expected Shortfall (CVaR 95%)
+        var_95, cvar_95 = historical_var(returns, confidence=0.95)
 
-        # 3. Beta (vs SPY)
-        beta = self._calculate_beta(self.data['Log Returns'])
+        # 3. Beta & correlation (vs SPY, or ^MERV for .BA tickers)
+        benchmark = benchmark_for(self.ticker)
+        beta, correlation = self._calculate_beta(returns, benchmark)
 
         # 4. (Removed Linear Regression)
         slope, intercept, r_squared = 0, 0, 0
-        
-        # 5. Plotting (Interactive & Static)
-        # We generate a Plotly figure for the Web App
-        fig = self._create_plotly_chart()
-        
-        # We also save a static image for Telegram/Reports (using matplotlib as fallback if kaleido is missing/heavy)
-        # Or we can use the same matplotlib logic as before for the static file.
-        # Let's keep the matplotlib logic for the static file to ensure the bot works without heavy dependencies.
-        static_plot_path = self._plot_results_static()
 
+        # 5. Weekly / Monthly view, resampled from the daily bars
+        timeframes = multi_timeframe(self.ticker, self.data)
+
+        # Charts are rendered on demand (get_interactive_chart / get_static_chart)
         return {
             "Annualized Volatility": annualized_volatility,
-            "Max Drawdown": max_drawdown,
+            "Max Drawdown": max_dd,
             "RSI (14)": current_rsi,
             "Last Price": self.data['Close'].iloc[-1],
             "Sharpe Ratio": sharpe_ratio,
             "VaR (95%)": var_95,
+            "CVaR (95%)": cvar_95,
             "Beta": beta,
+            "Correlation": correlation,
+            "Benchmark": benchmark,
             "Trend Slope": slope,
             "R-Squared": r_squared,
-            "Plot Path": static_plot_path,
-            "Interactive Chart": fig # Plotly Figure Object
+            "Timeframes": timeframes,
         }
 
-    def _calculate_beta(self, stock_returns):
+    @property
+    def derived(self) -> pd.DataFrame:
+        """Derived series (DERIVED_COLUMNS) on the input's index, computed once."""
+        if self._derived is None:
+            self._derived = compute(self.data, DERIVED_COLUMNS)
+        return self._derived
+
+    def indicators(self, names) -> pd.DataFrame:
+        """
+        Computes only the requested indicators from the registry in
+        utils.indicators (e.g. ["MACD", "BB_Upper", "ATR_14", "OBV", "Stoch_K"]),
+        sharing intermediates. self.data is not modified.
+        """
+        return compute(self.data, names)
+
+    def risk(self, **kwargs) -> pd.DataFrame:
+        """
+        Historical, parametric and Monte Carlo VaR/CVaR at several confidence
+        levels and horizons (see utils.risk.risk_report for the options).
+        """
+        return risk_report(self.derived['Log Returns'].dropna(), **kwargs)
+
+    def get_interactive_chart(self, period=None, max_points=MAX_CHART_POINTS):
+        """
+        Plotly figure for the Web App, built on first request.
+
+        Args:
+            period (str, optional): Zoom window ending at the last bar (e.g. "6mo"). Full history if None.
+            max_points (int): Points per series sent to the browser; longer windows are decimated.
+        """
+        view = (period, max_points)
+        if view not in self._interactive_charts:
+            spec = dict(INTERACTIVE_CHART_SPEC, period=period, max_points=max_points)
+            key = RenderCache.key(self.ticker, self.data, spec)
+            self._interactive_charts[view] = self.render_cache.get_figure(
+                self.ticker, key, lambda: self._create_plotly_chart(period, max_points))
+        return self._interactive_charts[view]
+
+    def get_static_chart(self):
+        """
+        Path of the static PNG for Telegram/Reports, rendered on first request
+        and reused from the render cache while the data is unchanged.
+        Uses matplotlib so the bot works without heavy dependencies (kaleido).
+        """
+        if self._static_chart is None:
+            key = RenderCache.key(self.ticker, self.data, STATIC_CHART_SPEC)
+            self._static_chart = self.render_cache.get_png(self.ticker, key, self._plot_results_static)
+        return self._static_chart
+
+    def _calculate_beta(self, stock_returns, benchmark):
         try:
-            # Helper to fetch SPY data locally with persistence
-            from utils.data_loader import get_market_data
-            import os
-            spy_data = get_market_data("SPY", period="5y", save_dir=os.path.join("data", "raw"))
-            if isinstance(spy_data.columns, pd.MultiIndex):
-                spy_data.columns = spy_data.columns.get_level_values(0)
-            
-            spy_returns = np.log(spy_data['Close'] / spy_data['Close'].shift(1))
-            
-            # Align data content
-            combined = pd.concat([stock_returns, spy_returns], axis=1).dropna()
-            combined.columns = ['Stock', 'Market']
-            
-            covariance = combined.cov().iloc[0, 1]
-            market_variance = combined['Market'].var()
-            
-            return covariance / market_variance
+            # Benchmark returns are loaded once per process (utils.benchmarks)
+            market_returns = get_benchmark_returns(benchmark)
+            if market_returns.empty:
+                raise ValueError(f"No data for benchmark {benchmark}")
+            row = beta_matrix(stock_returns.to_frame(self.ticker), market_returns).iloc[0]
+            if pd.isna(row['Beta']):
+                raise ValueError("Not enough overlapping returns")
+            return row['Beta'], row['Correlation']
         except Exception as e:
             print(f"Beta calc error: {e}")
-            return 1.0 # Default to 1 if fails
+            return 1.0, np.nan # Default to 1 if fails
 
-    def _create_plotly_chart(self):
+    def _create_plotly_chart(self, period=None, max_points=MAX_CHART_POINTS):
         import plotly.graph_objects as go
         from plotly.subplots import make_subplots
 
+        # Zoom: indicators were computed on the full history, only the view is cut
+        data, derived = self.data, self.derived
+        if period:
+            from utils.data_loader import _period_start
+            start = _period_start(period, data.index[-1])
+            if start is not None:
+                data, derived = data[data.index >= start], derived[derived.index >= start]
+
+        # Decimate to about one point per pixel: OHLC buckets for candles, LTTB for lines
+        candles = ohlc_buckets(data, max_points)
+
         # Create subplots: Price on row 1, RSI & Volume on row 2
         fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
                             vertical_spacing=0.03, subplot_titles=(f'{self.ticker} Price', 'Volume & RSI'),
@@ -122,29 +176,29 @@ class QuantEngine:
                             specs=[[{"secondary_y": False}], [{"secondary_y": True}]])
 
         # Candlestick
-        fig.add_trace(go.Candlestick(x=self.data.index,
-                        open=self.data['Open'],
-                        high=self.data['High'],
-                        low=self.data['Low'],
-                        close=self.data['Close'], name='OHLC'), row=1, col=1)
+        fig.add_trace(go.Candlestick(x=candles.index,
+                        open=candles['Open'],
+                        high=candles['High'],
+                        low=candles['Low'],
+                        close=candles['Close'], name='OHLC'), row=1, col=1)
 
         # (Bollinger Bands Removed)
 
         # SMAs (10, 20)
-        if 'SMA_10' in self.data.columns:
-            fig.add_trace(go.Scatter(x=self.data.index, y=self.data['SMA_10'], name='SMA 10',
-                                     line=dict(color='yellow', width=1.5)), row=1, col=1)
-        if 'SMA_20' in self.data.columns:
-            fig.add_trace(go.Scatter(x=self.data.index, y=self.data['SMA_20'], name='SMA 20',
-                                     line=dict(color='cyan', width=1.5)), row=1, col=1)
+        sma_10 = decimate_line(derived['SMA_10'], max_points)
+        fig.add_trace(go.Scatter(x=sma_10.index, y=sma_10, name='SMA 10',
+                                 line=dict(color='yellow', width=1.5)), row=1, col=1)
+        sma_20 = decimate_line(derived['SMA_20'], max_points)
+        fig.add_trace(go.Scatter(x=sma_20.index, y=sma_20, name='SMA 20',
+                                 line=dict(color='cyan', width=1.5)), row=1, col=1)
 
         # Volume (Secondary Axis on Row 2) with Colors
-        colors = ['green' if row['Close'] >= row['Open'] else 'red' for _, row in self.data.iterrows()]
-        fig.add_trace(go.Bar(x=self.data.index, y=self.data['Volume'], name='Volume',
-                             marker_color=colors, opacity=0.5), row=2, col=1, secondary_y=True)
+        fig.add_trace(go.Bar(x=candles.index, y=candles['Volume'], name='Volume',
+                             marker_color=volume_colors(candles), opacity=0.5), row=2, col=1, secondary_y=True)
 
         # RSI (Primary Axis on Row 2)
-        fig.add_trace(go.Scatter(x=self.data.index, y=self.data['RSI_14'], name='RSI',
+        rsi_line = decimate_line(derived['RSI_14'], max_points)
+        fig.add_trace(go.Scatter(x=rsi_line.index, y=rsi_line, name='RSI',
                                  line=dict(color='purple', width=2)), row=2, col=1, secondary_y=False)
         
         # RSI Levels
@@ -160,14 +214,13 @@ class QuantEngine:
         
         return fig
 
-    def _plot_results_static(self):
+    def _plot_results_static(self, output_path):
         plt.figure(figsize=(14, 7))
         plt.plot(self.data.index, self.data['Close'], label='Close Price', color='blue')
         
         # Plot Volume on secondary axis with colors
         ax2 = plt.gca().twinx()
-        colors = ['green' if row['Close'] >= row['Open'] else 'red' for _, row in self.data.iterrows()]
-        ax2.bar(self.data.index, self.data['Volume'], color=colors, alpha=0.3, label='Volume')
+        ax2.bar(self.data.index, self.data['Volume'], color=volume_colors(self.data), alpha=0.3, label='Volume')
         ax2.set_ylabel("Volume")
 
         plt.title(f"Technical Analysis for {self.ticker}")
@@ -176,7 +229,28 @@ class QuantEngine:
         plt.legend()
         plt.grid(True)
         
-        output_path = os.path.join(self.output_dir, f"{self.ticker}_analysis.png")
-        plt.savefig(output_path)
+        plt.savefig(output_path, format="png")
         plt.close()
         return output_path
+
+class BatchQuantEngine:
+    """
+    Universe-wide counterpart of QuantEngine: computes the metric set for every
+    ticker of a (dates x tickers) close-price panel in single vectorized passes.
+    Betas come from one covariance pass per benchmark. No charts are produced.
+    """
+    def __init__(self, close_panel: pd.DataFrame, with_beta=True):
+        self.close = close_panel
+        self.with_beta = with_beta
+
+    def analyze(self) -> pd.DataFrame:
+        """
+        Returns:
+            pd.DataFrame: Tidy metrics table, one row per ticker.
+        """
+        if self.close.empty:
+            return pd.DataFrame()
+        metrics = batch_metrics(self.close)
+        if self.with_beta:
+            metrics = metrics.join(universe_betas(self.close))
+        return metrics
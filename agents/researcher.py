@@ -1,51 +1,142 @@
-import yfinance as yf
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 import pandas as pd
+from utils.providers import get_provider
+from utils.fundamentals_cache import FundamentalsCache, has_info
+from utils.rate_limiter import deadline as limiter_deadline
+from utils.sentiment_store import get_sentiment_store
+from utils.news_store import NewsStore, get_news_store
+from utils.singleflight import SingleFlight
+
+# Shared across Researcher instances: concurrent requests for the same ticker
+# (bot bursts, scheduler overlapping with bot traffic) wait on one upstream fetch.
+_flights = SingleFlight()
+
+# Upstream calls of research() and get_market_intel() run here, concurrently,
+# each bounded by FETCH_TIMEOUT
+FETCH_TIMEOUT = 20.0
+_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="research")
+
+def _call_until(at, fn, *args):
+    # A call abandoned at the deadline stops retrying and frees its worker
+    with limiter_deadline(at):
+        return fn(*args)
 
 class Researcher:
-    def __init__(self):
-        pass
+    def __init__(self, provider=None, fundamentals=None, sentiment_store=None, news_store=None):
+        # Defaults to the process-wide provider (yfinance, or the offline replay)
+        self.provider = provider or get_provider()
+        # Disk cache: statements until the next expected filing, info for a few hours
+        self.fundamentals = fundamentals or FundamentalsCache()
+        # Headline polarities, shared by every ticker and instance. Scored by the
+        # configured backend ("sentiment_backend": "textblob" | "lexicon", experimental)
+        self.sentiment_store = sentiment_store or get_sentiment_store()
+        # Per-ticker daily sentiment series, ingested incrementally. Shared by every
+        # instance (a private one only when scoring with a custom sentiment store)
+        if news_store is None:
+            news_store = get_news_store() if sentiment_store is None else NewsStore(sentiment_store=self.sentiment_store)
+        self.news_store = news_store
+
+    def get_market_intel(self, ticker: str) -> dict:
+        """
+        Fetches fundamental data (Balance Sheet, Cash Flow) from the data provider and summarizes findings.
+        Concurrent calls for the same ticker share a single fetch.
+        """
+        result, shared = _flights.do(("intel", ticker), self._get_market_intel, ticker)
+        # Callers merge extra keys into the result, so followers get their own copy
+        return copy.deepcopy(result) if shared else result
 
-    def get_market_intel(self, ticker: str) -> str:
+    def research(self, ticker: str, timeout: float = FETCH_TIMEOUT) -> dict:
         """
-        Fetches fundamental data (Balance Sheet, Cash Flow) from yfinance and summarizes findings.
+        Fundamentals and news sentiment together. The info, balance sheet,
+        cash flow and news requests (minus whatever the fundamentals cache
+        already holds) are issued concurrently on the provider's shared
+        ticker handle, each bounded by `timeout` seconds, so the wall-clock
+        time is that of the slowest call. A call that fails or times out is
+        treated like missing upstream data.
+
+        Returns: {'intel': get_market_intel() result, 'sentiment': get_sentiment() result}
         """
+        result, shared = _flights.do(("research", ticker), self._research, ticker, timeout)
+        return copy.deepcopy(result) if shared else result
+
+    def _research(self, ticker: str, timeout: float) -> dict:
+        calls = {"news": self.provider.news}
+        if self.fundamentals.get_info(ticker) is None:
+            calls["info"] = self.provider.info
+        if self.fundamentals.get_statements(ticker) is None:
+            calls["balance_sheet"] = self.provider.balance_sheet
+            calls["cashflow"] = self.provider.cashflow
+
+        fetched = self._fetch_concurrently(ticker, calls, timeout)
+        return {
+            "intel": self._get_market_intel(ticker, fetched),
+            "sentiment": self._get_sentiment(ticker, fetched.get("news") or []),
+        }
+
+    def _fetch_concurrently(self, ticker: str, calls: dict, timeout: float) -> dict:
+        deadline = time.monotonic() + timeout
+        futures = {name: _pool.submit(_call_until, deadline, fn, ticker) for name, fn in calls.items()}
+        fetched = {}
+        for name, future in futures.items():
+            try:
+                fetched[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except TimeoutError:
+                print(f"[WARN] {self.provider.name} {name} for {ticker} timed out after {timeout}s")
+            except Exception as e:
+                print(f"[WARN] {self.provider.name} {name} for {ticker} failed: {e}")
+        return fetched
+
+    def _get_market_intel(self, ticker: str, fetched: dict = None) -> dict:
         try:
-            import time
-            stock = yf.Ticker(ticker)
-            
-            # Robust Fetching with retries
-            info = {}
-            bs = pd.DataFrame()
-            cf = pd.DataFrame()
-            
-            for attempt in range(3):
-                try:
-                    if not info: info = stock.info
-                    if bs.empty: bs = stock.balance_sheet
-                    if cf.empty: cf = stock.cashflow
-                    
-                    # If we got at least something, break
-                    if info and (not bs.empty or not cf.empty):
-                        break
-                except Exception as e:
-                    print(f"[WARN] yfinance attempt {attempt+1} fail: {e}")
-                
-                if attempt < 2:
-                    time.sleep(1.5) # Wait before retry
+            provider = self.provider
+
+            # Cached fundamentals first: only expired parts are fetched
+            info = self.fundamentals.get_info(ticker) or {}
+            statements = self.fundamentals.get_statements(ticker)
+            need_info, need_statements = not has_info(info), statements is None
+            bs, cf = statements if statements else (pd.DataFrame(), pd.DataFrame())
+
+            if fetched is None:
+                # Only the expired parts, concurrently. The provider's rate
+                # limiter already retries each call; no second retry loop here
+                calls = {}
+                if need_info:
+                    calls["info"] = provider.info
+                if need_statements:
+                    calls["balance_sheet"] = provider.balance_sheet
+                    calls["cashflow"] = provider.cashflow
+                fetched = self._fetch_concurrently(ticker, calls, FETCH_TIMEOUT) if calls else {}
+
+            if need_info:
+                info = fetched.get("info") or {}
+            if need_statements:
+                bs = fetched.get("balance_sheet")
+                cf = fetched.get("cashflow")
+                bs = pd.DataFrame() if bs is None else bs
+                cf = pd.DataFrame() if cf is None else cf
+
+            # Placeholder answers ({"marketCap": None}) are not cached
+            if need_info and has_info(info):
+                self.fundamentals.put_info(ticker, info)
+            if need_statements and (not bs.empty or not cf.empty):
+                self.fundamentals.put_statements(ticker, bs, cf)
+
+            # Upstream failed: expired cache beats nothing
+            if not has_info(info) or (bs.empty and cf.empty):
+                stale_info, stale_bs, stale_cf = self.fundamentals.stale(ticker)
+                info = info if has_info(info) else (stale_info or info)
+                if bs.empty and cf.empty:
+                    bs, cf = stale_bs, stale_cf
 
             report = f"### Fundamental Analysis for {ticker}\n\n"
             
             # Company Profile
             sector = info.get('sector', 'N/A')
             industry = info.get('industry', 'N/A')
-            market_cap = info.get('marketCap', 0)
-            
-            # Fallback for Market Cap (Fast Info)
-            if market_cap == 0:
-                try:
-                    market_cap = stock.fast_info['market_cap']
-                except:
-                    pass
+            # (The provider already falls back to fast_info when marketCap is missing)
+            market_cap = info.get('marketCap', 0) or 0
 
             report += f"**Sector**: {sector} | **Industry**: {industry}\n"
             report += f"**Market Cap**: ${market_cap:,.0f}\n\n"
@@ -150,15 +241,27 @@ class Researcher:
     def get_sentiment(self, ticker: str) -> dict:
         """
         Analyzes news headlines to determine market sentiment.
-        Returns: {'polarity': float, 'sentiment': str, 'headlines': list}
+        Concurrent calls for the same ticker share a single fetch.
+        Returns: {'polarity': float, 'sentiment': str, 'headlines': list, 'trend': dict}
         """
+        result, shared = _flights.do(("sentiment", ticker), self._get_sentiment, ticker)
+        return copy.deepcopy(result) if shared else result
+
+    def _get_sentiment(self, ticker: str, news: list = None) -> dict:
         try:
-            from textblob import TextBlob
-            stock = yf.Ticker(ticker)
-            news = stock.news
+            if news is None:
+                news = self.provider.news(ticker)
+
+            # Only articles not seen before are scored and added to the daily series
+            trend = {}
+            try:
+                self.news_store.ingest(ticker, news)
+                trend = self.news_store.trend(ticker)
+            except Exception as e:
+                print(f"[WARN] News store update for {ticker} failed: {e}")
             
             if not news:
-                return {"polarity": 0, "sentiment": "Neutral", "headlines": []}
+                return {"polarity": 0, "sentiment": "Neutral", "headlines": [], "trend": trend}
 
             titles = []
             for n in news:
@@ -168,11 +271,8 @@ class Researcher:
                 elif 'title' in n:
                     titles.append(n['title'])
             
-            scores = []
-            
-            for title in titles:
-                blob = TextBlob(title)
-                scores.append(blob.sentiment.polarity)
+            # Memoized per headline: only headlines never seen (under any ticker) are scored
+            scores = self.sentiment_store.score(titles)
 
             avg_polarity = sum(scores) / len(scores) if scores else 0
             
@@ -186,7 +286,8 @@ class Researcher:
             return {
                 "polarity": round(avg_polarity, 2),
                 "sentiment": sentiment,
-                "headlines": titles[:3] # Return top 3 for context
+                "headlines": titles[:3], # Return top 3 for context
+                "trend": trend # 7d/30d polarity and momentum from the stored series
             }
             
         except Exception as e:
@@ -1,6 +1,7 @@
 import google.generativeai as genai
 import logging
 from utils.config_loader import load_config
+from utils.rate_limiter import get_limiter, is_rate_limited
 
 logger = logging.getLogger("Synthesizer")
 
@@ -68,6 +69,13 @@ class Synthesizer:
             signals.append(f"🔴 **Sentiment**: Pessimistic (Score: {polarity}).")
             score -= 0.5
 
+        # Sentiment trend from the stored daily series (context only, not scored)
+        trend = researcher_data.get("sentiment", {}).get("trend") or {}
+        if trend.get("Trend") == "Improving":
+            signals.append(f"🟢 **Sentiment Trend**: News tone improving (7d vs 30d momentum {trend['Momentum']:+.2f}).")
+        elif trend.get("Trend") == "Deteriorating":
+            signals.append(f"🔴 **Sentiment Trend**: News tone deteriorating (7d vs 30d momentum {trend['Momentum']:+.2f}).")
+
         # Final Verdict
         if score >= 1.5:
             verdict = "STRONG BUY"
@@ -117,6 +125,7 @@ class Synthesizer:
             return self._rule_based_analysis(ticker, quant_data, researcher_data)
             
         # Construct the Prompt
+        trend = researcher_data.get('sentiment', {}).get('trend') or {}
         prompt = f"""
 Act as a Senior Wall Street Analyst. Analyze the following data for {ticker} and write a professional, concise executive summary.
 
@@ -135,6 +144,8 @@ Act as a Senior Wall Street Analyst. Analyze the following data for {ticker} and
 ### Market Sentiment (NLP Agent)
 - Sentiment: {researcher_data.get('sentiment', {}).get('sentiment', 'Neutral')}
 - Polarity Score: {researcher_data.get('sentiment', {}).get('polarity', 0)}
+- Polarity 7d / 30d: {trend.get('Polarity 7d', 'N/A')} / {trend.get('Polarity 30d', 'N/A')} ({trend.get('Articles 30d', 0)} articles in 30d)
+- Sentiment Trend: {trend.get('Trend', 'N/A')} (Momentum: {trend.get('Momentum', 'N/A')})
 
 ### Instructions
 1. **Verdict**: Start with a clear BUY, SELL, or HOLD recommendation based on the data.
@@ -142,34 +153,18 @@ Act as a Senior Wall Street Analyst. Analyze the following data for {ticker} and
 3. **Tone**: Professional, objective, and institutional. No emojis, just facts.
 4. **Format**: Use Markdown. Keep it under 200 words.
 """
-        # Retry logic for API limits
-        import time
-        max_retries = 3
-        backoff = 4 # seconds (increased)
-        
-        for attempt in range(max_retries):
-            try:
-                response = self.model.generate_content(prompt)
-                return response.text
-                
-            except Exception as e:
-                err_str = str(e)
-                logger.warning(f"Gemini API attempt {attempt+1} failed: {err_str}")
-                
-                # Check for 429 (Rate Limit)
-                if "429" in err_str:
-                    if attempt < max_retries - 1:
-                        time.sleep(backoff * (attempt + 2)) # 8s, 12s...
-                        continue
-                    else:
-                        return self._rule_based_analysis(ticker, quant_data, researcher_data, 
-                                                         error_msg="Gemini Quota Exceeded (429). Please wait a few seconds.")
-
-                if attempt < max_retries - 1:
-                    time.sleep(backoff * (2 ** attempt)) # 4s, 8s
-                else:
-                    # Clean up the error message for the UI
-                    clean_err = err_str.split('\n')[0] # Get only first line
-                    return self._rule_based_analysis(ticker, quant_data, researcher_data, error_msg=clean_err)
-        
-        return self._rule_based_analysis(ticker, quant_data, researcher_data, error_msg="Unknown AI failure.")
+        # Paced by the shared Gemini token bucket; retries use jittered backoff
+        # and 429s slow down every caller in the process, not just this one.
+        limiter = get_limiter("gemini")
+        try:
+            response = limiter.call(self.model.generate_content, prompt, retries=3, base_delay=4)
+            return response.text
+        except Exception as e:
+            err_str = str(e)
+            logger.warning(f"Gemini API failed: {err_str}")
+            if is_rate_limited(e):
+                return self._rule_based_analysis(ticker, quant_data, researcher_data, 
+                                                 error_msg="Gemini Quota Exceeded (429). Please wait a few seconds.")
+            # Clean up the error message for the UI
+            clean_err = err_str.split('\n')[0] # Get only first line
+            return self._rule_based_analysis(ticker, quant_data, researcher_data, error_msg=clean_err)
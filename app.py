@@ -46,6 +46,7 @@ st.markdown("""
 CONFIG_PATH = "config.json"
 
 from agents.coordinator import analyze_ticker
+from utils.news_store import get_news_store
 
 def run_analysis_ui(ticker):
     """Wrapper for analyze_ticker to handle Streamlit UI updates."""
@@ -98,71 +99,91 @@ if page == "📊 Market Analyzer":
         with c_ex:
             st.caption("**Popular:** `AAPL` `TSLA` `NVDA` `MELI` `GGAL.BA` `YPFD.BA` `VIST` `SPY` `BTC-USD`")
         
+        # Chart zoom (longer ranges are decimated server-side)
+        chart_range = st.selectbox("Chart Range", ["3mo", "6mo", "1y", "2y"], index=3)
+
         # Analyze Button
         analyze_btn = st.button("🔍 Analyze Asset", use_container_width=True)
         
     if analyze_btn:
+        # Kept in the session so a chart-range change only redraws the chart
         res = run_analysis_ui(ticker)
+        st.session_state["analysis"] = (ticker, res) if res else None
+
+    ticker, res = st.session_state.get("analysis") or (ticker, None)
+    if res:
+        # Verdict Section
+        verdict = res['synthesis']['verdict']
+        color = res['synthesis']['color']
+        score = res['synthesis']['score']
         
-        if res:
-            # Verdict Section
-            verdict = res['synthesis']['verdict']
-            color = res['synthesis']['color']
-            score = res['synthesis']['score']
+        st.header(f"{color} Verdict: {verdict}")
+        st.metric("Confidence Score", f"{score:.1f} / 3.0")
+        
+        # Key Signals
+        st.subheader("🧠 Rationale")
+        for signal in res['synthesis']['signals']:
+            st.write(f"- {signal}")
             
-            st.header(f"{color} Verdict: {verdict}")
-            st.metric("Confidence Score", f"{score:.1f} / 3.0")
+        st.divider()
+        
+        # 3 Columns for Data
+        c1, c2, c3 = st.columns(3)
+        
+        with c1:
+            st.subheader("📈 Technicals")
+            st.metric("Last Price", f"${res['quant'].get('Last Price',0):.2f}")
+            st.metric("RSI (14)", f"{res['quant'].get('RSI (14)',0):.2f}")
+            st.metric("Volatility", f"{res['quant'].get('Annualized Volatility',0):.1%}")
             
-            # Key Signals
-            st.subheader("🧠 Rationale")
-            for signal in res['synthesis']['signals']:
-                st.write(f"- {signal}")
-                
-            st.divider()
+        with c2:
+            st.subheader("🏢 Fundamentals")
+            mc = res['research'].get('Market Cap', 0)
+            fcf = res['research'].get('Free Cash Flow', 0)
+            cash = res['research'].get('Cash', 0)
+            debt = res['research'].get('Total Debt', 0)
+            net_cash = cash - debt
             
-            # 3 Columns for Data
-            c1, c2, c3 = st.columns(3)
+            st.metric("Market Cap", f"${mc:,.0f}" if mc > 0 else "N/A")
+            st.metric("Free Cash Flow", f"${fcf:,.0f}" if fcf != 0 else "N/A")
+            st.metric("Net Cash", f"${net_cash:,.0f}" if (cash or debt) else "N/A")
             
-            with c1:
-                st.subheader("📈 Technicals")
-                st.metric("Last Price", f"${res['quant'].get('Last Price',0):.2f}")
-                st.metric("RSI (14)", f"{res['quant'].get('RSI (14)',0):.2f}")
-                st.metric("Volatility", f"{res['quant'].get('Annualized Volatility',0):.1%}")
-                
-            with c2:
-                st.subheader("🏢 Fundamentals")
-                mc = res['research'].get('Market Cap', 0)
-                fcf = res['research'].get('Free Cash Flow', 0)
-                cash = res['research'].get('Cash', 0)
-                debt = res['research'].get('Total Debt', 0)
-                net_cash = cash - debt
-                
-                st.metric("Market Cap", f"${mc:,.0f}" if mc > 0 else "N/A")
-                st.metric("Free Cash Flow", f"${fcf:,.0f}" if fcf != 0 else "N/A")
-                st.metric("Net Cash", f"${net_cash:,.0f}" if (cash or debt) else "N/A")
-                
-            with c3:
-                st.subheader("📰 Sentiment (NLP)")
-                sent = res['research'].get('sentiment', {})
-                st.metric("Polarity Score", f"{sent.get('polarity', 0):.2f}")
-                st.caption(f"Mood: {sent.get('sentiment', 'N/A')}")
-                
-                st.write("**latest Headlines:**")
-                for h in sent.get('headlines', []):
-                    st.write(f"- *{h}*")
+        with c3:
+            st.subheader("📰 Sentiment (NLP)")
+            sent = res['research'].get('sentiment', {})
+            trend = sent.get('trend') or {}
+            st.metric("Polarity Score", f"{sent.get('polarity', 0):.2f}",
+                      delta=f"{trend['Momentum']:+.2f} (7d vs 30d)" if trend.get('Articles 30d') else None)
+            st.caption(f"Mood: {sent.get('sentiment', 'N/A')} | Trend: {trend.get('Trend', 'N/A')}")
 
-            # AI Analysis Section
-            st.divider()
-            with st.expander("🧠 **Read Full AI Analysis (Gemini 1.5)**", expanded=True):
-                st.markdown(res['report_text'])
-            st.divider()
+            # Daily series precomputed by the news store (no re-scoring)
+            series = get_news_store().daily_series(ticker, start=pd.Timestamp.now() - pd.Timedelta(days=90))
+            if len(series) > 1:
+                st.line_chart(series['Polarity'], height=120)
+            
+            st.write("**latest Headlines:**")
+            for h in sent.get('headlines', []):
+                st.write(f"- *{h}*")
 
-            # Chart (Interactive preferred)
-            st.subheader("📈 Technical Analysis")
-            if 'Interactive Chart' in res['quant']:
-                st.plotly_chart(res['quant']['Interactive Chart'], use_container_width=True)
-            elif 'Plot Path' in res['quant'] and res['quant']['Plot Path']:
-                st.image(res['quant']['Plot Path'], caption=f"{ticker} Technical Analysis", use_column_width=True)
+        # Multi-Timeframe (resampled locally from the daily history)
+        timeframes = res['quant'].get('Timeframes')
+        if timeframes:
+            st.subheader("🕒 Multi-Timeframe")
+            tf_df = pd.DataFrame(timeframes).T[["RSI (14)", "SMA 10", "SMA 20", "Annualized Volatility"]]
+            st.dataframe(tf_df.style.format({
+                "RSI (14)": "{:.1f}", "SMA 10": "{:.2f}", "SMA 20": "{:.2f}", "Annualized Volatility": "{:.1%}"
+            }, na_rep="N/A"), use_container_width=True)
+
+        # AI Analysis Section
+        st.divider()
+        with st.expander("🧠 **Read Full AI Analysis (Gemini 1.5)**", expanded=True):
+            st.markdown(res['report_text'])
+        st.divider()
+
+        # Chart (Interactive preferred)
+        st.subheader("📈 Technical Analysis")
+        if 'quant_engine' in res:
+            st.plotly_chart(res['quant_engine'].get_interactive_chart(period=chart_range), use_container_width=True)
 
 # --- PAGE: BOT MANAGER ---
 elif page == "⚙️ Bot Manager":
@@ -254,6 +275,7 @@ def start_background_services():
     import schedule
     from telegram_bot import run_bot_service
     from daily_briefing import MorningBriefing
+    from utils.retention import RetentionManager
     
     # 1. Telegram Bot Thread
     # Check if already running to prevent duplicates (Conflict error)
@@ -275,6 +297,11 @@ def start_background_services():
         # Schedule at 09:00 AM everyday
         schedule.every().day.at("09:00").do(mb.generate)
         
+        # Keep data caches, charts and reports within their disk budgets
+        # (incremental: each run stops after a few seconds and resumes next hour)
+        retention = RetentionManager()
+        schedule.every().hour.do(retention.run, max_seconds=5.0)
+        
         # Also run market scan at close? (Optional)
         # schedule.every().day.at("16:30").do(scan_markets...)
         
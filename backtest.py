@@ -21,7 +21,8 @@ class BacktestEngine:
         
         # Load Data (Defaults to 2y for backtest speed)
         # Using save_dir="data/raw" to leverage existing cache
-        self.data = get_market_data(ticker, period="5y", save_dir=os.path.join("data", "raw"))
+        # Read-only: QuantEngine does not modify it, so no private copy is needed
+        self.data = get_market_data(ticker, period="5y", save_dir=os.path.join("data", "raw"), copy=False)
         
         # Pre-calc indicators
         # We instantiate a dummy Researcher to get static data for the simulation (Limitation of MVP)
@@ -34,10 +35,8 @@ class BacktestEngine:
             logger.error(f"Failed to fetch fundamental data: {e}")
             self.research_data = {}
         
-        # Run Quant analysis to populate indicators in DataFrame
+        # Indicators are computed once, next to the price data (self.quant.derived)
         self.quant = QuantEngine(ticker, self.data)
-        self.quant.analyze() 
-        # Now self.data has columns like 'RSI_14'
         
         self.synthesizer = Synthesizer()
 
@@ -48,13 +47,11 @@ class BacktestEngine:
 
         logger.info(f"Starting Backtest for {self.ticker} over {len(self.data)} days...")
         
-        # Iterate row by row to simulate time passing
-        for date, row in self.data.iterrows():
-            price = row['Close']
-            
+        # Iterate day by day to simulate time passing
+        rsi_series = self.quant.derived['RSI_14']
+        for date, price, rsi in zip(self.data.index, self.data['Close'], rsi_series):
             # Construct mock quant result for this day
             # We only extract what the Synthesizer needs for decision making
-            rsi = row.get('RSI_14', 50)
             if pd.isna(rsi): rsi = 50
             
             quant_data = {
@@ -0,0 +1,63 @@
+"""
+Memory benchmark: CompactPanel vs per-ticker pandas frames.
+
+Builds a synthetic universe (default 1,000 tickers x 5y of daily bars) and
+measures the bytes held by:
+  1. one float64/int64 OHLCV DataFrame per ticker (what get_market_data returns),
+  2. the same frames after QuantEngine-style derived columns are added in place,
+  3. a CompactPanel (float32 prices, uint32 volume, int32 day index).
+
+Usage: python bench_compact.py [n_tickers] [years]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from utils.compact_panel import CompactPanel
+
+MB = 1024 * 1024
+
+def make_universe(n_tickers, years, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2026-02-13", periods=252 * years, name="Date")
+    frames = {}
+    for i in range(n_tickers):
+        close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+        frames[f"T{i:04d}"] = pd.DataFrame({
+            "Close": close,
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Open": close,
+            "Volume": rng.integers(100_000, 50_000_000, len(dates)),
+        }, index=dates)
+    return frames
+
+def frames_bytes(frames):
+    return sum(int(df.memory_usage(deep=True).sum()) for df in frames.values())
+
+def run(n_tickers=1000, years=5):
+    print(f"Universe: {n_tickers} tickers x {years}y daily bars\n")
+    frames = make_universe(n_tickers, years)
+    plain = frames_bytes(frames)
+
+    start = time.perf_counter()
+    panel = CompactPanel.from_frames(frames)
+    build = time.perf_counter() - start
+
+    for df in frames.values():
+        df["Log Returns"] = np.log(df["Close"] / df["Close"].shift(1))
+        df["RSI_14"] = 0.0
+        df["SMA_10"] = df["Close"].rolling(10).mean()
+        df["SMA_20"] = df["Close"].rolling(20).mean()
+    derived = frames_bytes(frames)
+
+    print(f"pandas frames (OHLCV)        : {plain / MB:8.1f} MB")
+    print(f"pandas frames (+derived cols): {derived / MB:8.1f} MB")
+    print(f"CompactPanel                 : {panel.nbytes / MB:8.1f} MB  "
+          f"({plain / panel.nbytes:.1f}x smaller, built in {build:.2f} s)")
+    print(f"Volume dtype: {panel.volume.dtype}, read-only: {not panel.prices.flags.writeable}")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    y = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    run(n, y)
@@ -0,0 +1,78 @@
+"""
+Benchmark: columnar price store (.npz) vs the legacy date-stamped CSV cache.
+
+Measures cold (first read of a freshly written file) and warm (repeated reads)
+load times for the same OHLCV history in both formats.
+
+Usage: python bench_data_loader.py [n_tickers] [years]
+"""
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from utils.price_store import PriceStore
+
+def make_history(years=5, seed=0):
+    """Synthetic daily OHLCV frame shaped like yf.download output."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=252 * years, name="Date")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+    spread = np.abs(rng.normal(0, 0.01, len(dates))) * close
+    return pd.DataFrame({
+        "Close": close,
+        "High": close + spread,
+        "Low": close - spread,
+        "Open": close + rng.normal(0, 0.005, len(dates)) * close,
+        "Volume": rng.integers(1_000_000, 90_000_000, len(dates)),
+    }, index=dates)
+
+def load_csv(path):
+    # Same call as the previous get_market_data cache path
+    return pd.read_csv(path, index_col=0, parse_dates=True)
+
+def time_loads(label, paths, loader, repeats):
+    start = time.perf_counter()
+    for p in paths:
+        loader(p)
+    cold = time.perf_counter() - start
+
+    runs = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for p in paths:
+            loader(p)
+        runs.append(time.perf_counter() - start)
+    warm = float(np.median(runs))
+
+    print(f"{label:<8} cold: {cold * 1000:8.1f} ms   warm (median of {repeats}): {warm * 1000:8.1f} ms")
+    return cold, warm
+
+def run(n_tickers=20, years=5, repeats=5):
+    print(f"Benchmark: {n_tickers} tickers x {years}y daily bars\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PriceStore(os.path.join(tmp, "store"))
+        csv_paths, tickers = [], []
+        for i in range(n_tickers):
+            ticker = f"T{i:03d}"
+            df = make_history(years, seed=i)
+            csv_path = os.path.join(tmp, f"{ticker}_{years}y_2026-01-01.csv")
+            df.to_csv(csv_path)
+            store.save(ticker, df, period=f"{years}y")
+            csv_paths.append(csv_path)
+            tickers.append(ticker)
+
+        csv_cold, csv_warm = time_loads("CSV", csv_paths, load_csv, repeats)
+        npz_cold, npz_warm = time_loads("Store", tickers, store.load, repeats)
+
+        csv_size = sum(os.path.getsize(p) for p in csv_paths)
+        npz_size = sum(os.path.getsize(store.path_for(t)) for t in tickers)
+
+    print(f"\nSpeedup  cold: {csv_cold / npz_cold:5.1f}x   warm: {csv_warm / npz_warm:5.1f}x")
+    print(f"On disk  CSV: {csv_size / 1024:.0f} KiB   Store: {npz_size / 1024:.0f} KiB")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    y = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    run(n, y)
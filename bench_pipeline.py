@@ -0,0 +1,59 @@
+"""
+Offline throughput / load test of the full A.R.E.S. pipeline.
+
+Runs analyze_ticker (data -> researcher -> quant -> synthesizer) against the
+LocalFileProvider, which replays the CSVs under data/fixtures/prices/ and the
+recorded JSON in data/fixtures/, so results are reproducible and need no
+network. Runs inside a temporary working directory so the real caches are not
+touched.
+
+Usage: python bench_pipeline.py [workers] [rounds]
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def run(workers=4, rounds=3):
+    from utils.providers import LocalFileProvider, set_provider
+    from agents.coordinator import analyze_ticker
+    from utils.data_loader import get_cache_stats
+
+    provider = LocalFileProvider(data_dir=os.path.join(REPO_DIR, "data", "fixtures", "prices"),
+                                 fixtures_dir=os.path.join(REPO_DIR, "data", "fixtures"))
+    set_provider(provider)
+    tickers = [t for t in sorted(provider._index()) if "," not in t]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        print(f"Pipeline benchmark: {len(tickers)} tickers, {workers} workers, {rounds} rounds\n")
+
+        # 1. Sequential, cold caches
+        start = time.perf_counter()
+        for ticker in tickers:
+            res = analyze_ticker(ticker)
+            if "error" in res:
+                print(f"  {ticker}: {res['error']}")
+        cold = time.perf_counter() - start
+
+        # 2. Concurrent load (warm caches), each ticker requested `rounds` times
+        jobs = tickers * rounds
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(analyze_ticker, jobs))
+        warm = time.perf_counter() - start
+
+        os.chdir(REPO_DIR)
+
+    print(f"\nSequential (cold): {cold:6.2f} s  -> {len(tickers) / cold:6.2f} analyses/s")
+    print(f"Concurrent (warm): {warm:6.2f} s  -> {len(jobs) / warm:6.2f} analyses/s")
+    print(f"Price cache: {get_cache_stats()}")
+
+if __name__ == "__main__":
+    sys.path.insert(0, REPO_DIR)
+    w = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    r = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    run(w, r)
@@ -0,0 +1,107 @@
+"""
+Speed and agreement benchmark: lexicon sentiment backend vs TextBlob.
+
+Two headline sets, reported separately:
+  - News fixtures: data/fixtures/{ticker}_news.json for the watchlist, in
+    yfinance's news format (as replayed by LocalFileProvider). Agreement
+    (correlation of polarities, share of headlines with the same Bullish /
+    Neutral / Bearish label at ±0.05 as in Researcher, mean |diff|) is
+    computed on this set only. The committed fixtures were compiled by hand,
+    without reference to the lexicon's word list; `--record` replaces them
+    with the live Yahoo feed.
+  - SYNTHETIC: `n_synthetic` headlines built from templates. They share the
+    lexicon's vocabulary, so they are used for throughput only.
+
+Reports cold start (first call, including imports and corpus loads) and
+warm throughput on both sets.
+
+Usage: python bench_sentiment.py [n_synthetic]
+       python bench_sentiment.py --record
+"""
+import json
+import os
+import sys
+import time
+import numpy as np
+from utils.providers import LocalFileProvider, YFinanceProvider
+from utils.sentiment_backends import TextBlobBackend, LexiconBackend
+
+WATCHLIST = ["AAPL", "TSLA", "MSFT", "GOOGL", "NVDA", "AMZN", "META", "YPFD.BA"]
+
+SUBJECTS = ["Apple", "Tesla", "Microsoft", "Alphabet", "Nvidia", "Amazon", "Meta", "YPF", "Oil prices", "Stocks"]
+TEMPLATES = [
+    "{s} beats expectations as profits surge", "{s} shares plunge after weak guidance",
+    "{s} stock rallies to record high", "{s} misses revenue estimates", "Analysts upgrade {s} on strong growth",
+    "{s} faces lawsuit over data practices", "{s} holds annual shareholder meeting", "{s} announces layoffs amid slowdown",
+    "{s} gains on optimism over new product", "{s} falls as inflation fears return", "Is {s} a good buy right now?",
+    "{s} is not expected to cut its dividend", "{s} shares slightly lower in quiet trading",
+]
+
+def recorded_headlines():
+    provider = LocalFileProvider()
+    titles = []
+    for ticker in WATCHLIST:
+        for n in provider.news(ticker):
+            title = n.get('content', {}).get('title') or n.get('title')
+            if title:
+                titles.append(title)
+    return titles
+
+def record(fixtures_dir="data/fixtures"):
+    """Saves the live Yahoo news of the watchlist as fixtures (tickers without news are left alone)."""
+    provider = YFinanceProvider()
+    for ticker in WATCHLIST:
+        news = provider.news(ticker)
+        if not news:
+            print(f"{ticker}: no news, fixture kept")
+            continue
+        with open(os.path.join(fixtures_dir, f"{ticker}_news.json"), "w", encoding="utf-8") as f:
+            json.dump(news, f, indent=1)
+        print(f"{ticker}: {len(news)} articles recorded")
+
+def synthetic_headlines(n, seed=3):
+    rng = np.random.default_rng(seed)
+    return [TEMPLATES[rng.integers(len(TEMPLATES))].format(s=SUBJECTS[rng.integers(len(SUBJECTS))]) + f" ({i})"
+            for i in range(n)]
+
+def label(polarity):
+    return np.where(polarity > 0.05, 1, np.where(polarity < -0.05, -1, 0))
+
+def timed(backend, titles):
+    start = time.perf_counter()
+    scores = backend.score(titles)
+    return np.asarray(scores), time.perf_counter() - start
+
+def throughput(name, titles):
+    """Cold start and warm throughput of each backend; returns their polarities."""
+    results = {}
+    for backend in (TextBlobBackend(), LexiconBackend()):
+        _, cold = timed(backend, titles[:1])
+        scores, warm = timed(backend, titles)
+        results[backend.name] = scores
+        print(f"{name:9s} {backend.name:9s}: cold start {cold * 1000:8.1f} ms | "
+              f"{len(titles) / warm:12,.0f} headlines/s ({warm * 1000:.1f} ms)")
+    return results
+
+def run(n_synthetic):
+    recorded = recorded_headlines()
+    print(f"Headlines: {len(recorded):,} from news fixtures, {n_synthetic:,} SYNTHETIC")
+    if recorded:
+        results = throughput("fixtures", recorded)
+    if n_synthetic:
+        # Template headlines use the lexicon's own words: speed only, no agreement
+        throughput("SYNTHETIC", synthetic_headlines(n_synthetic))
+
+    if not recorded:
+        print("Agreement: no news fixtures (run with --record)")
+        return
+    tb, lx = results["textblob"], results["lexicon"]
+    corr = np.corrcoef(tb, lx)[0, 1] if tb.std() and lx.std() else float("nan")
+    print(f"Agreement ({len(recorded)} fixture headlines): correlation {corr:.2f} | "
+          f"same label {np.mean(label(tb) == label(lx)):.0%} | mean |diff| {np.mean(np.abs(tb - lx)):.3f}")
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--record"]:
+        record()
+    else:
+        run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
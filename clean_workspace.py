@@ -42,6 +42,14 @@ def clean_workspace():
         except:
             print("'output' directory not empty, left in place.")
 
+    # 3. Apply retention budgets to data caches, temp charts and reports
+    try:
+        from utils.retention import RetentionManager
+        result = RetentionManager().run(max_seconds=None)
+        print(f"Retention: removed {result['files_removed']} files, compacted {result['compacted']} histories.")
+    except Exception as e:
+        print(f"Error applying retention: {e}")
+
     print("\nCleanup Complete! 🧹")
     print("Files moved to 'archive/' folder.")
 
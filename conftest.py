@@ -0,0 +1,38 @@
+"""
+Shared test fixtures: recorded price histories under data/fixtures/prices
+(tracked, never touched by retention), and a Researcher whose caches live in
+a temporary directory. Test modules import the helpers directly, so they
+also work when run as scripts.
+"""
+import os
+import tempfile
+import pandas as pd
+
+# Loggers are set up at import: keep test runs out of the repo's logs/
+os.environ.setdefault("ARES_LOG_DIR", os.path.join(tempfile.gettempdir(), "ares-test-logs"))
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+PRICES_DIR = os.path.join(REPO_DIR, "data", "fixtures", "prices")
+# Recording date of each fixture period
+FIXTURE_DATES = {"1y": "2026-02-13", "6mo": "2026-02-12"}
+
+def fixture_path(ticker: str, period: str = "1y") -> str:
+    return os.path.join(PRICES_DIR, f"{ticker}_{period}_{FIXTURE_DATES[period]}.csv")
+
+def load(ticker: str, period: str = "1y") -> pd.DataFrame:
+    """Recorded OHLCV history of `ticker`."""
+    return pd.read_csv(fixture_path(ticker, period), index_col=0, parse_dates=True)
+
+def load_close(tickers, period: str = "1y") -> pd.DataFrame:
+    """Close prices of several tickers, aligned on the union of their dates."""
+    return pd.concat({t: load(t, period)["Close"] for t in tickers}, axis=1, sort=True)
+
+def tmp_researcher(tmp: str, provider=None, fundamentals=None, sentiment_store=None):
+    """Researcher whose fundamentals cache, headline store and news store all live under `tmp`."""
+    from agents.researcher import Researcher
+    from utils.fundamentals_cache import FundamentalsCache
+    from utils.news_store import NewsStore
+    from utils.sentiment_store import SentimentStore
+    sentiment_store = sentiment_store or SentimentStore(os.path.join(tmp, "sentiment.jsonl"))
+    return Researcher(provider, fundamentals or FundamentalsCache(os.path.join(tmp, "fundamentals")),
+                      sentiment_store, NewsStore(os.path.join(tmp, "news"), sentiment_store))
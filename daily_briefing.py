@@ -1,7 +1,8 @@
 import pandas as pd
 from datetime import datetime
-from utils.data_loader import get_market_data
+from utils.data_loader import get_market_data, get_market_data_many
 from utils.notifier import Notifier
+from utils import indicators
 from utils.logger import setup_logger
 
 logger = setup_logger("BRIEFING", "logs")
@@ -15,17 +16,10 @@ class MorningBriefing:
         self.user_manager = UserManager()
         self.global_watchlist = self.config.get("watchlist", ["AAPL", "TSLA", "MSFT"])
         
-    def _calculate_rsi(self, series, period=14):
-        delta = series.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
-
     def _get_market_context(self):
         """Fetches SPY data once for all reports."""
         try:
-            spy_df = get_market_data("SPY", period="6mo", save_dir="data/briefing")
+            spy_df = get_market_data("SPY", period="6mo")
             # Force numeric
             spy_df['Close'] = pd.to_numeric(spy_df['Close'], errors='coerce')
             
@@ -43,29 +37,30 @@ class MorningBriefing:
         message = f"☀️ *A.R.E.S. Briefing ({today_str})* {title_suffix}\n\n"
         message += context_str
         
+        # Fetch the whole watchlist in one grouped request
+        frames = get_market_data_many(watchlist, period="6mo")
+        
         # Split Watchlist
         us_tickers = [t for t in watchlist if ".BA" not in t]
         arg_tickers = [t for t in watchlist if ".BA" in t]
         
-        message += self._build_table("🇺🇸 *Wall Street*", us_tickers)
-        message += self._build_table("🇦🇷 *Merval*", arg_tickers)
+        message += self._build_table("🇺🇸 *Wall Street*", us_tickers, frames)
+        message += self._build_table("🇦🇷 *Merval*", arg_tickers, frames)
         
         return message
 
-    def _build_table(self, title, tickers):
+    def _build_table(self, title, tickers, frames):
         if not tickers: return ""
         t_msg = f"\n{title}\n"
         t_msg += "`| Ticker | Precio  | Var % | RSI |`\n"
         t_msg += "`| :--- | :--- | :--- | :--- |`\n"
         
-        import time
         for ticker in tickers:
             try:
                 # Debug log
                 logger.info(f"Processing {ticker} for table...")
-                time.sleep(2) # Be gentle with Yahoo to avoid rate limits/blocks
                 
-                df = get_market_data(ticker, period="6mo", save_dir="data/briefing")
+                df = frames.get(ticker, pd.DataFrame())
                 if df.empty: 
                     logger.warning(f"Skipping {ticker}: No data")
                     continue
@@ -84,7 +79,7 @@ class MorningBriefing:
                 change_pct = ((close - prev) / prev) * 100
                 
                 # RSI Calculation
-                rsi_series = self._calculate_rsi(df['Close'])
+                rsi_series = indicators.rsi(df['Close'], 14)
                 rsi = rsi_series.iloc[-1]
                 
                 # Formatting
@@ -1,12 +1,12 @@
-import yfinance as yf
 import json
+from utils.providers import get_provider
 
 def debug_news():
     ticker = "AAPL"
     print(f"Fetching news for {ticker}...")
     try:
-        stock = yf.Ticker(ticker)
-        news = stock.news
+        # ARES_DATA_PROVIDER=local replays data/fixtures/{ticker}_news.json
+        news = get_provider().news(ticker)
         print(f"Type of news: {type(news)}")
         print(f"Length of news: {len(news)}")
         if news:
@@ -35,7 +35,7 @@ def main():
     # 1. Fetch Data (Quant Dependency)
     try:
         # Saving raw data in data/raw/{ticker}_{period}_{date}.csv
-        df = get_market_data(ticker, period="5y", save_dir=os.path.join("data", "raw"))
+        df = get_market_data(ticker, period="5y", save_dir=os.path.join("data", "raw"), copy=False)
     except Exception as e:
         logger.critical(f"Critical Error: {e}")
         return
@@ -52,25 +52,33 @@ def main():
     def run_quant():
         logger.info("Quant Agent: Crunching numbers...")
         results['quant'] = quant_agent.analyze()
+        if "error" not in results['quant']:
+            # Static chart for the Markdown and HTML reports
+            results['quant']['Plot Path'] = quant_agent.get_static_chart()
         logger.info("Quant Agent: Done.")
 
     def run_researcher():
         logger.info("Researcher Agent: Gathering intel...")
-        # Get Fundamentals
-        res = researcher_agent.get_market_intel(ticker)
-        # Get Sentiment
-        sent = researcher_agent.get_sentiment(ticker)
+        # Fundamentals and Sentiment (upstream calls run concurrently)
+        research = researcher_agent.research(ticker)
+        res, sent = research['intel'], research['sentiment']
         
         # Merge
         res['data']['sentiment'] = sent
         res['report'] += f"\n\n### 📰 News Sentiment Analysis\n"
         res['report'] += f"**Mood**: {sent['sentiment']} (Score: {sent['polarity']})\n"
+        trend = sent.get('trend') or {}
+        if trend.get('Articles 30d'):
+            res['report'] += (f"**Trend**: {trend['Trend']} (7d: {trend['Polarity 7d']}, 30d: {trend['Polarity 30d']}, "
+                              f"momentum {trend['Momentum']:+.2f}, {trend['Articles 30d']} articles)\n")
         res['report'] += "**Top Headlines:**\n"
         for h in sent['headlines']:
             res['report'] += f"- {h}\n"
             
         results['researcher'] = res
-        logger.info("Researcher Agent: Done.")
+        store = researcher_agent.sentiment_store.stats()
+        logger.info(f"Researcher Agent: Done. Headline cache hit rate {store['hit_rate']:.0%} "
+                    f"({store['entries']} headlines stored)")
 
     # 3. Parallel Execution
     t1 = threading.Thread(target=run_quant)
@@ -136,13 +144,22 @@ def generate_quant_report(ticker: str, quant_res: dict) -> str:
     report += "## 📐 Advanced Risk & Trend Metrics\n"
     report += f"- **Sharpe Ratio**: {quant_res.get('Sharpe Ratio', 0):.2f} (Risk-Free assumed 4%)\n"
     report += f"- **Value at Risk (95%)**: {quant_res.get('VaR (95%)', 0):.2%}\n"
-    report += f"- **Beta (vs SPY)**: {quant_res.get('Beta', 0):.2f}\n"
+    report += f"- **Beta (vs {quant_res.get('Benchmark', 'SPY')})**: {quant_res.get('Beta', 0):.2f}\n"
+    report += f"- **Correlation**: {quant_res.get('Correlation', 0):.2f}\n"
     
     slope = quant_res.get('Trend Slope', 0)
     direction = "📈 Up" if slope > 0 else "📉 Down"
     report += f"- **Linear Regression Trend**: {direction} (Slope: {slope:.4f})\n"
     report += f"- **R-Squared (Trend Strength)**: {quant_res.get('R-Squared', 0):.4f}\n\n"
     
+    timeframes = quant_res.get('Timeframes', {})
+    if timeframes:
+        report += "## 🕒 Multi-Timeframe\n"
+        report += "| Timeframe | RSI (14) | SMA 20 | Volatility |\n| :--- | :--- | :--- | :--- |\n"
+        for name, tf in timeframes.items():
+            report += f"| {name} | {tf['RSI (14)']:.1f} | {tf['SMA 20']:.2f} | {tf['Annualized Volatility']:.1%} |\n"
+        report += "\n"
+
     plot_path = quant_res.get('Plot Path')
     if plot_path:
         plot_basename = os.path.basename(plot_path)
@@ -43,6 +43,12 @@ def run():
         if not res: continue
         print(f"\n{label}")
         print(f"  Return: {res['return']*100:.2f}% | Risk: {res['volatility']*100:.2f}% | Sharpe: {res['sharpe']:.2f}")
+
+        # Monte Carlo tail risk of the allocation
+        risk = pm.risk_report(res['allocation'])
+        mc = risk[(risk['Method'] == "Monte Carlo") & (risk['Confidence'] == 0.95)]
+        for _, row in mc.iterrows():
+            print(f"  VaR 95% ({row['Horizon']}d): {row['VaR']*100:.2f}% | CVaR: {row['CVaR']*100:.2f}%")
         
         # Show top 5 allocations
         alloc = res['allocation']
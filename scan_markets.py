@@ -1,9 +1,8 @@
-import time
 import os
-from agents.quant import QuantEngine
+from agents.quant import BatchQuantEngine
 from agents.researcher import Researcher
 from agents.synthesizer import Synthesizer
-from utils.data_loader import get_market_data
+from utils.data_loader import get_price_panel
 from utils.logger import setup_logger
 from utils.notifier import Notifier
 
@@ -21,48 +20,45 @@ class MarketScanner:
     def scan(self):
         logger.info(f"Starting Market Scan for {len(self.watchlist)} assets...")
         
+        # Prices for the whole watchlist in one grouped request
+        close = get_price_panel(self.watchlist, period="1y", field="Close")
+        
+        # Technicals for every ticker in one vectorized pass
+        metrics = BatchQuantEngine(close).analyze()
+        
+        # No fixed sleeps: upstream calls are paced by the shared Yahoo rate limiter
         for ticker in self.watchlist:
+            if ticker not in metrics.index:
+                logger.warning(f"Quant error for {ticker}: No data available")
+                continue
             try:
-                self._analyze_ticker(ticker)
+                self._analyze_ticker(ticker, metrics.loc[ticker].to_dict())
             except Exception as e:
                 logger.error(f"Failed to analyze {ticker}: {e}")
             
-            # Be nice to the API
-            time.sleep(1) 
-            
         logger.info("Scan complete.")
 
-    def _analyze_ticker(self, ticker):
+    def _analyze_ticker(self, ticker, quant_res):
         logger.info(f"Scanning {ticker}...")
         
-        # 1. Get Data
-        # We don't save raw CSVs during recurring scans to save space, or we could overwrite
-        df = get_market_data(ticker, period="1y", save_dir="data/scanner")
+        # 1. Data and technicals are batch-computed in scan()
         
         # 2. Researcher (Fast check)
         # In a real scanner, we might cache fundamental data since it doesn't change daily
         intel = self.researcher.get_market_intel(ticker)
         research_data = intel.get("data", {})
         
-        # 3. Quant
-        quant = QuantEngine(ticker, df, output_dir=f"reports/scanner/{ticker}")
-        quant_res = quant.analyze()
-        
-        if "error" in quant_res:
-            logger.warning(f"Quant error for {ticker}: {quant_res['error']}")
-            return
-
-        # 4. Synthesize
+        # 3. Synthesize
         signal = self.synthesizer.get_signal(quant_res, research_data)
         verdict = signal['verdict']
         score = signal['score']
         
         logger.info(f"{ticker} -> Verdict: {verdict} (Score: {score})")
         
-        # 5. Alert Logic
+        # 4. Alert Logic
         # Alert only on STRONG signals
         if "STRONG" in verdict:
-            self._send_alert(ticker, verdict, score, signals)
+            self._send_alert(ticker, verdict, score, signal['signals'])
 
     def _send_alert(self, ticker, verdict, score, reasons):
         icon = "🚀" if "BUY" in verdict else "🔻"
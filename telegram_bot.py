@@ -157,6 +157,9 @@ async def analyze(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await status_msg.edit_text(f"❌ Error: {results['error']}")
             return
 
+        # Render the static chart embedded in the HTML report
+        results['quant']['Plot Path'] = await asyncio.to_thread(results['quant_engine'].get_static_chart)
+
         # Generate HTML logic
         report_dir = "temp_dashboard"
         os.makedirs(report_dir, exist_ok=True)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from utils import benchmarks, data_loader
+from utils.benchmarks import benchmark_for, beta_matrix, panel_returns, universe_betas
+from conftest import load, load_close
+
+def test_benchmark_for():
+    assert benchmark_for("AAPL") == "SPY"
+    assert benchmark_for("GGAL.BA") == "^MERV"
+    print("✅ Benchmarks resolved by suffix.")
+
+def test_beta_matrix_matches_pairwise_cov():
+    print("Testing matrix beta against the per-ticker 2x2 covariance...")
+    close = load_close(["AAPL", "NVDA", "TSLA", "PAMP.BA"])
+    market_close = load("MSFT")["Close"]
+    market = np.log(market_close / market_close.shift(1)).dropna()
+
+    returns = panel_returns(close)
+    result = beta_matrix(returns, market)
+    for ticker in close.columns:
+        series = close[ticker].dropna()
+        stock = np.log(series / series.shift(1))
+        assert np.allclose(returns[ticker].dropna(), stock.dropna())
+
+        # Original QuantEngine._calculate_beta
+        combined = pd.concat([stock, market], axis=1, sort=True).dropna()
+        combined.columns = ['Stock', 'Market']
+        beta = combined.cov().iloc[0, 1] / combined['Market'].var()
+        assert np.isclose(result.loc[ticker, "Beta"], beta)
+        assert np.isclose(result.loc[ticker, "Correlation"], combined.corr().iloc[0, 1])
+    print("✅ Matrix beta equals the per-ticker computation.")
+
+def test_returns_loaded_once():
+    print("Testing the shared benchmark returns cache...")
+    calls = []
+    frames = {"SPY": load("MSFT"), "^MERV": load("PAMP.BA")}
+    def fake_get_market_data(ticker, period="2y", save_dir="data/raw"):
+        calls.append(ticker)
+        return frames[ticker].copy()
+
+    original = data_loader.get_market_data
+    data_loader.get_market_data = fake_get_market_data
+    benchmarks.refresh()
+    try:
+        close = load_close(["AAPL", "NVDA", "PAMP.BA"])
+        betas = universe_betas(close)
+        universe_betas(close)
+        benchmarks.get_benchmark_returns("SPY")
+        assert sorted(calls) == ["SPY", "^MERV"]
+        assert betas.loc["PAMP.BA", "Benchmark"] == "^MERV"
+        assert betas.loc["AAPL", "Benchmark"] == "SPY"
+        # PAMP.BA against itself
+        assert np.isclose(betas.loc["PAMP.BA", "Beta"], 1.0)
+        assert np.isclose(betas.loc["PAMP.BA", "Correlation"], 1.0)
+
+        benchmarks.refresh()
+        benchmarks.get_benchmark_returns("SPY")
+        assert len(calls) == 3
+    finally:
+        data_loader.get_market_data = original
+        benchmarks.refresh()
+    print("✅ Benchmark returns are loaded once per process.")
+
+if __name__ == "__main__":
+    test_benchmark_for()
+    test_beta_matrix_matches_pairwise_cov()
+    test_returns_loaded_once()
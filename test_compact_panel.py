@@ -0,0 +1,28 @@
+from utils.compact_panel import CompactPanel
+import numpy as np
+from conftest import load
+
+def test_compact_panel():
+    print("Testing CompactPanel...")
+    aapl = load("AAPL")
+    pamp = load("PAMP.BA")
+    panel = CompactPanel.from_frames({"AAPL": aapl, "PAMP.BA": pamp})
+
+    assert panel.prices.dtype == np.float32 and panel.days.dtype == np.int32
+    assert panel.volume.dtype == np.uint32
+    assert not panel.prices.flags.writeable
+
+    # Union of both markets' trading days; each ticker round-trips its own bars
+    assert len(panel.dates) >= max(len(aapl), len(pamp))
+    back = panel.ticker_frame("AAPL")
+    assert back.index.equals(aapl.index)
+    assert np.allclose(back["Close"], aapl["Close"], rtol=1e-6)
+    assert (back["Volume"].to_numpy() == aapl["Volume"].to_numpy()).all()
+
+    close = panel.to_frame("Close")
+    assert list(close.columns) == ["AAPL", "PAMP.BA"]
+
+    print(f"✅ CompactPanel is valid ({panel.nbytes} bytes).")
+
+if __name__ == "__main__":
+    test_compact_panel()
@@ -0,0 +1,117 @@
+import shutil
+import tempfile
+import time
+from utils.providers import LocalFileProvider
+from utils.fundamentals_cache import FundamentalsCache
+from utils.sentiment_store import SentimentStore
+from utils.sentiment_backends import TextBlobBackend
+from utils.news_store import NewsStore
+from utils.rate_limiter import RateLimiter
+from agents.researcher import Researcher
+
+class SlowProvider(LocalFileProvider):
+    """Offline provider where every fundamentals/news call takes `delay` seconds."""
+    def __init__(self, delay=0.3, slow_call=None, slow_delay=None):
+        super().__init__()
+        self.delay = delay
+        self.slow_call = slow_call
+        self.slow_delay = slow_delay
+        self.calls = []
+
+    def _wait(self, name):
+        self.calls.append(name)
+        time.sleep(self.slow_delay if name == self.slow_call else self.delay)
+
+    def info(self, ticker):
+        self._wait("info")
+        return super().info(ticker)
+
+    def balance_sheet(self, ticker):
+        self._wait("balance_sheet")
+        return super().balance_sheet(ticker)
+
+    def cashflow(self, ticker):
+        self._wait("cashflow")
+        return super().cashflow(ticker)
+
+    def news(self, ticker):
+        self._wait("news")
+        return [{"title": "Apple beats expectations with strong record growth"}]
+
+def test_research_runs_calls_concurrently():
+    print("Testing concurrent research fetch...")
+    tmp = tempfile.mkdtemp()
+    try:
+        provider = SlowProvider(delay=0.3)
+        sentiment = SentimentStore(f"{tmp}/headlines.jsonl", backend=TextBlobBackend())
+        researcher = Researcher(provider, FundamentalsCache(tmp), sentiment, NewsStore(f"{tmp}/news", sentiment))
+        TextBlobBackend().score(["warm up"])  # TextBlob import/corpus load
+        start = time.perf_counter()
+        result = researcher.research("AAPL")
+        elapsed = time.perf_counter() - start
+
+        assert sorted(provider.calls) == ["balance_sheet", "cashflow", "info", "news"]
+        assert elapsed < 0.9, elapsed  # slowest call, not the 1.2s sum
+        assert result["intel"]["data"]["Free Cash Flow"] > 0
+        assert result["sentiment"]["headlines"]
+
+        # Warm fundamentals cache: only news goes upstream
+        provider.calls.clear()
+        researcher.research("AAPL")
+        assert provider.calls == ["news"]
+    finally:
+        shutil.rmtree(tmp)
+    print(f"✅ Research took {elapsed:.2f}s for four 0.3s calls.")
+
+def test_per_call_timeout():
+    print("Testing per-call timeouts...")
+    tmp = tempfile.mkdtemp()
+    try:
+        provider = SlowProvider(delay=0.05, slow_call="news", slow_delay=2.0)
+        start = time.perf_counter()
+        sentiment = SentimentStore(f"{tmp}/headlines.jsonl", backend=TextBlobBackend())
+        researcher = Researcher(provider, FundamentalsCache(tmp), sentiment, NewsStore(f"{tmp}/news", sentiment))
+        result = researcher.research("AAPL", timeout=0.5)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.5, elapsed
+        assert result["sentiment"]["sentiment"] == "Neutral"
+        assert result["intel"]["data"]["Market Cap"] > 0
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ A hung call does not block the research.")
+
+class FlakyNewsProvider(SlowProvider):
+    """News goes through a rate limiter to an upstream that hangs, then fails."""
+    def __init__(self):
+        super().__init__(delay=0.0)
+        self.limiter = RateLimiter("test", rate=100.0, burst=10)
+        self.attempts = 0
+
+    def _hang_then_fail(self):
+        self.attempts += 1
+        time.sleep(0.4)
+        raise ConnectionError("upstream down")
+
+    def news(self, ticker):
+        return self.limiter.call(self._hang_then_fail, retries=3, base_delay=0.05)
+
+def test_abandoned_call_stops_retrying():
+    print("Testing retries after the research deadline...")
+    tmp = tempfile.mkdtemp()
+    try:
+        provider = FlakyNewsProvider()
+        sentiment = SentimentStore(f"{tmp}/headlines.jsonl", backend=TextBlobBackend())
+        researcher = Researcher(provider, FundamentalsCache(tmp), sentiment, NewsStore(f"{tmp}/news", sentiment))
+        researcher.research("AAPL", timeout=0.2)
+        # Without the deadline the worker would keep retrying for ~1.2s
+        time.sleep(1.0)
+        assert provider.attempts == 1
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ The timed-out worker gave up instead of retrying.")
+
+if __name__ == "__main__":
+    test_research_runs_calls_concurrently()
+    test_per_call_timeout()
+    test_abandoned_call_stops_retrying()
@@ -0,0 +1,200 @@
+import utils.data_loader as data_loader
+from utils.data_loader import get_market_data, get_market_data_many, get_price_panel
+from utils.price_store import PriceStore
+import pandas as pd
+import tempfile
+import threading
+import time
+from datetime import datetime
+from conftest import load
+
+HISTORY = load("AAPL")
+
+def fake_download(calls, source):
+    """Replaces yf.download with a replay of `source`, recording each request."""
+    def _download(ticker, period=None, start=None, **kwargs):
+        calls.append({"ticker": ticker, "period": period, "start": start})
+        if start:
+            return source[source.index >= pd.Timestamp(start)]
+        return source
+    return _download
+
+def test_incremental_fetch():
+    print("Testing incremental delta fetch...")
+    original = data_loader._download
+    calls = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Yesterday's cache is missing the last 3 bars
+            store = PriceStore(tmp)
+            store.save("AAPL", HISTORY.iloc[:-3], period="1y", fetched="2000-01-01")
+
+            data_loader._download = fake_download(calls, HISTORY)
+            df = get_market_data("AAPL", period="1y", save_dir=tmp)
+
+            assert len(calls) == 1 and calls[0]["start"] is not None, calls
+            assert df.index[-1] == HISTORY.index[-1]
+            assert df["Close"].iloc[-3:].equals(HISTORY["Close"].iloc[-3:])
+            assert not df.index.duplicated().any()
+    finally:
+        data_loader._download = original
+    print("✅ Delta fetch appends only the new bars.")
+
+def test_restatement_triggers_full_refresh():
+    print("Testing restatement detection...")
+    original = data_loader._download
+    calls = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Upstream history was split-adjusted after we cached it
+            store = PriceStore(tmp)
+            store.save("AAPL", HISTORY.iloc[:-3], period="1y", fetched="2000-01-01")
+            restated = HISTORY.copy()
+            restated[["Open", "High", "Low", "Close"]] /= 4
+
+            data_loader._download = fake_download(calls, restated)
+            df = get_market_data("AAPL", period="1y", save_dir=tmp)
+
+            assert len(calls) == 2 and calls[1]["period"] == "1y", calls
+            assert df["Close"].equals(restated["Close"])
+    finally:
+        data_loader._download = original
+    print("✅ Restated history is re-downloaded in full.")
+
+def test_shorter_period_served_from_longer_history():
+    print("Testing period-superset reuse...")
+    original = data_loader._download
+    calls = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            today = datetime.now().strftime("%Y-%m-%d")
+            PriceStore(tmp).save("AAPL", HISTORY, period="1y", fetched=today)
+
+            data_loader._download = fake_download(calls, HISTORY)
+            df = get_market_data("AAPL", period="6mo", save_dir=tmp)
+
+            assert calls == []
+            assert df.index[-1] == HISTORY.index[-1]
+            assert df.index[0] >= HISTORY.index[-1] - pd.DateOffset(months=6)
+            assert len(df) < len(HISTORY)
+    finally:
+        data_loader._download = original
+    print("✅ 6mo request sliced from the cached 1y history.")
+
+def test_batched_download():
+    print("Testing get_market_data_many...")
+    original = data_loader._download_many
+    calls = []
+    msft = load("MSFT")
+    sources = {"AAPL": HISTORY, "MSFT": msft}
+
+    def fake_download_many(tickers, period=None, start=None, **kwargs):
+        calls.append({"tickers": list(tickers), "period": period, "start": start})
+        return {t: sources[t] for t in tickers}
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_loader._download_many = fake_download_many
+            frames = get_market_data_many(["AAPL", "MSFT"], period="1y", save_dir=tmp)
+
+            # One grouped request, results fanned back into the per-ticker store
+            assert len(calls) == 1 and calls[0]["tickers"] == ["AAPL", "MSFT"], calls
+            assert frames["MSFT"]["Close"].equals(msft["Close"])
+            assert PriceStore(tmp).exists("AAPL") and PriceStore(tmp).exists("MSFT")
+
+            panel = get_price_panel(["AAPL", "MSFT"], period="1y", save_dir=tmp)
+            assert len(calls) == 1
+            assert list(panel.columns) == ["AAPL", "MSFT"]
+    finally:
+        data_loader._download_many = original
+    print("✅ Batched download hits upstream once.")
+
+def test_shared_frames_are_read_only():
+    print("Testing read-only shared histories...")
+    original = data_loader._download
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_loader._download = fake_download([], HISTORY)
+            shared = get_market_data("AAPL", period="1y", save_dir=tmp, copy=False)
+            # What the memory cache holds: in-place writes raise on any pandas version
+            frozen = data_loader._freeze(HISTORY)
+            try:
+                frozen.loc[frozen.index[-1], "Close"] = -1.0
+                assert False, "write to a frozen history succeeded"
+            except ValueError:
+                pass
+            try:
+                # Raises on the read-only arrays (or, with copy-on-write, writes a private copy)
+                shared.loc[shared.index[-1], "Close"] = -1.0
+            except ValueError:
+                pass
+            # The cached history is intact; private copies stay writable
+            own = get_market_data("AAPL", period="1y", save_dir=tmp)
+            assert own["Close"].iloc[-1] == HISTORY["Close"].iloc[-1]
+            own.loc[own.index[-1], "Close"] = -1.0
+            again = get_market_data("AAPL", period="1y", save_dir=tmp, copy=False)
+            assert again["Close"].iloc[-1] == HISTORY["Close"].iloc[-1]
+    finally:
+        data_loader._download = original
+        data_loader._memory_cache.invalidate()
+    print("✅ copy=False callers cannot modify the cached history.")
+
+def slow_download(calls, source, delay=0.2):
+    replay = fake_download(calls, source)
+    def _download(ticker, **kwargs):
+        time.sleep(delay)
+        return replay(ticker, **kwargs)
+    return _download
+
+def fetch_together(tmp, first, second):
+    """get_market_data for period `first`, then `second` while the first is in flight."""
+    results = {}
+    def fetch(period):
+        results[period] = get_market_data("AAPL", period=period, save_dir=tmp)
+    threads = [threading.Thread(target=fetch, args=(first,)), threading.Thread(target=fetch, args=(second,))]
+    threads[0].start()
+    time.sleep(0.05)
+    threads[1].start()
+    for t in threads:
+        t.join()
+    return results
+
+def test_concurrent_periods_share_one_history():
+    print("Testing concurrent requests for different periods...")
+    original = data_loader._download
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Wide request in flight: the shorter one joins it, no second download
+            calls = []
+            data_loader._download = slow_download(calls, HISTORY)
+            results = fetch_together(tmp, "5y", "6mo")
+            assert [c["period"] for c in calls] == ["5y"], calls
+            assert results["5y"].equals(HISTORY)
+            assert results["6mo"].index[0] >= HISTORY.index[-1] - pd.DateOffset(months=6)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # Short request in flight: the wider caller fetches its own period after it
+            calls = []
+            data_loader._download = slow_download(calls, HISTORY)
+            data_loader._memory_cache.invalidate()
+            results = fetch_together(tmp, "6mo", "5y")
+            assert [c["period"] for c in calls] == ["6mo", "5y"], calls
+            assert results["5y"].equals(HISTORY)
+            assert PriceStore(tmp).read_meta("AAPL")["period"] == "5y"
+
+            # A narrower history never replaces a wider stored one
+            today = datetime.now().strftime("%Y-%m-%d")
+            assert data_loader._save_history(PriceStore(tmp), "AAPL", HISTORY.iloc[-20:], "1mo", today) is None
+            assert PriceStore(tmp).load("AAPL").equals(HISTORY)
+    finally:
+        data_loader._download = original
+        data_loader._memory_cache.invalidate()
+    print("✅ One download per ticker; the stored history only grows.")
+
+if __name__ == "__main__":
+    test_incremental_fetch()
+    test_restatement_triggers_full_refresh()
+    test_shorter_period_served_from_longer_history()
+    test_batched_download()
+    test_shared_frames_are_read_only()
+    test_concurrent_periods_share_one_history()
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from utils.downsample import lttb, ohlc_buckets, decimate_line, volume_colors
+from conftest import load
+
+def test_lttb():
+    print("Testing LTTB decimation...")
+    y = np.sin(np.linspace(0, 20, 5000)) + np.linspace(0, 1, 5000)
+    idx = lttb(y, 200)
+    assert len(idx) == 200
+    assert idx[0] == 0 and idx[-1] == 4999
+    assert np.all(np.diff(idx) > 0)
+    # Peaks survive decimation
+    assert np.isclose(y[idx].max(), y.max(), atol=1e-2)
+    assert np.isclose(y[idx].min(), y.min(), atol=1e-2)
+
+    # Short or NaN-padded series
+    assert list(lttb([1.0, 2.0, 3.0], 10)) == [0, 1, 2]
+    padded = np.concatenate([np.full(20, np.nan), y])
+    assert lttb(padded, 50)[0] == 20
+    print("✅ LTTB keeps the shape with fewer points.")
+
+def test_ohlc_buckets():
+    print("Testing OHLC bucket aggregation...")
+    df = load("AAPL")
+    buckets = ohlc_buckets(df, 50)
+    assert len(buckets) <= 50
+    assert buckets['High'].max() == df['High'].max()
+    assert buckets['Low'].min() == df['Low'].min()
+    assert np.isclose(buckets['Volume'].sum(), df['Volume'].sum())
+    assert buckets['Open'].iloc[0] == df['Open'].iloc[0]
+    assert buckets['Close'].iloc[-1] == df['Close'].iloc[-1]
+    assert buckets.index[0] == df.index[0]
+    assert ohlc_buckets(df, 1000) is df
+    print("✅ Buckets preserve extremes and totals.")
+
+def test_decimate_line_and_colors():
+    df = load("MSFT")
+    sma = df['Close'].rolling(20).mean()
+    line = decimate_line(sma, 60)
+    assert len(line) == 60 and not line.isna().any()
+    assert line.index[-1] == sma.index[-1]
+
+    colors = volume_colors(df)
+    expected = ['green' if row['Close'] >= row['Open'] else 'red' for _, row in df.iterrows()]
+    assert list(colors) == expected
+    print("✅ Lines decimated, colors vectorized.")
+
+def test_chart_payload_is_bounded():
+    import tempfile, shutil
+    from agents import quant
+    tmp = tempfile.mkdtemp()
+    original = quant.get_benchmark_returns
+    quant.get_benchmark_returns = lambda benchmark: pd.Series(dtype=float)
+    try:
+        engine = quant.QuantEngine("NVDA", load("NVDA"), output_dir=tmp)
+        fig = engine.get_interactive_chart(max_points=80)
+        assert all(len(trace.x) <= 80 for trace in fig.data)
+
+        zoomed = engine.get_interactive_chart(period="3mo")
+        assert pd.Timestamp(zoomed.data[0].x[0]) >= engine.data.index[-1] - pd.DateOffset(months=3)
+    finally:
+        quant.get_benchmark_returns = original
+        shutil.rmtree(tmp)
+    print("✅ Interactive chart payload is bounded.")
+
+if __name__ == "__main__":
+    test_lttb()
+    test_ohlc_buckets()
+    test_decimate_line_and_colors()
+    test_chart_payload_is_bounded()
@@ -0,0 +1,127 @@
+import shutil
+import tempfile
+import time
+import pandas as pd
+from utils.providers import LocalFileProvider
+from utils.fundamentals_cache import FundamentalsCache, INFO_TTL, has_info
+from conftest import tmp_researcher
+
+class CountingProvider(LocalFileProvider):
+    """Offline provider that records every fundamentals call."""
+    def __init__(self, fail=False):
+        super().__init__()
+        self.calls = []
+        self.fail = fail
+
+    def _record(self, name, ticker):
+        self.calls.append(name)
+        if self.fail:
+            raise ConnectionError("upstream down")
+
+    def info(self, ticker):
+        self._record("info", ticker)
+        return super().info(ticker)
+
+    def balance_sheet(self, ticker):
+        self._record("balance_sheet", ticker)
+        return super().balance_sheet(ticker)
+
+    def cashflow(self, ticker):
+        self._record("cashflow", ticker)
+        return super().cashflow(ticker)
+
+def test_researcher_uses_cache():
+    print("Testing the fundamentals cache in Researcher...")
+    tmp = tempfile.mkdtemp()
+    try:
+        cache = FundamentalsCache(tmp)
+        provider = CountingProvider()
+        first = tmp_researcher(tmp, provider, cache).get_market_intel("AAPL")
+        assert sorted(provider.calls) == ["balance_sheet", "cashflow", "info"]
+
+        provider.calls.clear()
+        second = tmp_researcher(tmp, provider, cache).get_market_intel("AAPL")
+        assert provider.calls == []
+        assert second["data"] == first["data"]
+
+        # Statements round-trip through JSON unchanged
+        bs, cf = cache.get_statements("AAPL")
+        pd.testing.assert_frame_equal(bs, provider.balance_sheet("AAPL"), check_freq=False)
+
+        # Expired info alone is re-fetched
+        assert cache.get_info("AAPL", now=time.time() + INFO_TTL + 1) is None
+        assert cache.get_statements("AAPL", now=time.time() + INFO_TTL + 1) is not None
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ Repeat analyses skip the upstream calls.")
+
+class PlaceholderInfoProvider(CountingProvider):
+    """Answers info with yfinance's empty placeholder once, then with real data."""
+    def info(self, ticker):
+        if "info" not in self.calls:
+            self._record("info", ticker)
+            return {"marketCap": None}
+        return super().info(ticker)
+
+def test_placeholder_info_not_cached():
+    print("Testing placeholder info...")
+    assert not has_info({"marketCap": None}) and not has_info({"marketCap": 1e12, "sector": None})
+    assert has_info({"marketCap": None, "sector": "Technology"})
+    tmp = tempfile.mkdtemp()
+    try:
+        cache = FundamentalsCache(tmp)
+        cache.put_info("AAPL", {"marketCap": None})
+        assert cache.get_info("AAPL") is None and not cache._load("AAPL").get("info")
+
+        # A placeholder written by an older version is not served either
+        cache._update("AAPL", info={"marketCap": None}, info_fetched=time.time())
+        assert cache.get_info("AAPL") is None and cache.stale("AAPL")[0] == {}
+
+        # The Researcher does not cache the placeholder, so the next analysis asks again
+        provider = PlaceholderInfoProvider()
+        researcher = tmp_researcher(tmp, provider, cache)
+        researcher.get_market_intel("AAPL")
+        assert cache.get_info("AAPL") is None
+        researcher.get_market_intel("AAPL")
+        assert provider.calls.count("info") == 2
+        assert cache.get_info("AAPL") == LocalFileProvider().info("AAPL")
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ {'marketCap': None} is never cached.")
+
+def test_filing_aware_expiry():
+    day = 86400
+    fetched = pd.Timestamp("2026-01-15").timestamp()
+    annual = {"balance_sheet": {"2024-09-30": {}, "2025-09-30": {}}, "statements_fetched": fetched}
+    # Next annual statement due ~2026-09-30 + 90d lag; capped at 90 days of age
+    assert FundamentalsCache.statements_expire_at(annual) == fetched + 90 * day
+
+    quarterly = {"cashflow": {"2025-06-30": {}, "2025-09-30": {}, "2025-12-31": {}}, "statements_fetched": fetched}
+    due = (pd.Timestamp("2025-12-31") + pd.Timedelta(days=92 + 90)).timestamp()
+    assert FundamentalsCache.statements_expire_at(quarterly) == min(due, fetched + 90 * day)
+
+    # Filing overdue: re-check daily
+    overdue = dict(annual, statements_fetched=pd.Timestamp("2027-02-01").timestamp())
+    assert FundamentalsCache.statements_expire_at(overdue) == overdue["statements_fetched"] + day
+    print("✅ Statement TTL follows the filing calendar.")
+
+def test_stale_fallback():
+    tmp = tempfile.mkdtemp()
+    try:
+        cache = FundamentalsCache(tmp)
+        good = tmp_researcher(tmp, CountingProvider(), cache).get_market_intel("TSLA")
+        # Expire everything, then fail upstream
+        cache._update("TSLA", info_fetched=0, statements_fetched=0)
+        down = CountingProvider(fail=True)
+        intel = tmp_researcher(tmp, down, cache).get_market_intel("TSLA")
+        assert down.calls
+        assert intel["data"] == good["data"]
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ Expired fundamentals used when upstream fails.")
+
+if __name__ == "__main__":
+    test_researcher_uses_cache()
+    test_placeholder_info_not_cached()
+    test_filing_aware_expiry()
+    test_stale_fallback()
@@ -0,0 +1,87 @@
+from utils.indicators import batch_metrics, rsi, log_returns, compute, INDICATORS
+import numpy as np
+from conftest import load, load_close
+
+def test_batch_matches_single_ticker():
+    print("Testing batch_metrics against per-ticker pipeline...")
+    close = load_close(["AAPL", "MSFT", "NVDA", "PAMP.BA"])
+    metrics = batch_metrics(close)
+
+    for ticker in close.columns:
+        series = close[ticker].dropna()
+        returns = np.log(series / series.shift(1))
+
+        # Original QuantEngine formulas, one ticker at a time
+        delta = series.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        expected_rsi = (100 - (100 / (1 + gain / loss))).iloc[-1]
+        cumulative = (1 + returns).cumprod()
+        drawdown = (cumulative / cumulative.expanding(min_periods=1).max() - 1).min()
+
+        row = metrics.loc[ticker]
+        assert np.isclose(row["RSI (14)"], expected_rsi)
+        assert np.isclose(row["Annualized Volatility"], returns.std() * np.sqrt(252))
+        assert np.isclose(row["Max Drawdown"], drawdown)
+        assert np.isclose(row["VaR (95%)"], np.percentile(returns.dropna(), 5))
+        assert np.isclose(row["Last Price"], series.iloc[-1])
+
+    print("✅ Batch metrics match the single-ticker pipeline.")
+
+def test_rsi_on_panel():
+    close = load_close(["AAPL", "MSFT"])
+    panel = rsi(close)
+    assert np.allclose(panel["MSFT"].dropna(), rsi(close["MSFT"]).dropna())
+    assert log_returns(close).shape == close.shape
+
+def test_registry_values():
+    print("Testing registry indicators against direct formulas...")
+    df = load("AAPL")
+    names = [n for n in INDICATORS]
+    out = compute(df, names)
+    assert list(out.columns) == names
+
+    close = df["Close"]
+    mid, std = close.rolling(20).mean(), close.rolling(20).std()
+    assert np.allclose(out["BB_Upper"].dropna(), (mid + 2 * std).dropna())
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    assert np.allclose(out["MACD"], macd)
+    assert np.allclose(out["MACD_Hist"], macd - macd.ewm(span=9, adjust=False).mean())
+    tr = np.maximum.reduce([df["High"] - df["Low"], (df["High"] - close.shift()).abs(), (df["Low"] - close.shift()).abs()])
+    assert np.allclose(out["True Range"].iloc[1:], tr[1:])
+    assert out["ATR_14"].iloc[:13].isna().all() and out["ATR_14"].notna().iloc[13:].all()
+    direction = np.sign(close.diff()).fillna(0)
+    assert np.allclose(out["OBV"], (direction * df["Volume"]).cumsum())
+    k = out["Stoch_K"].dropna()
+    assert ((k >= 0) & (k <= 100)).all()
+    assert np.allclose(out["RSI_14"].dropna(), rsi(close).dropna())
+    print("✅ Registry indicators match the direct formulas.")
+
+def test_registry_computes_only_needed_nodes():
+    print("Testing dependency resolution...")
+    df = load("MSFT")
+    calls = []
+    original = dict(INDICATORS)
+    try:
+        for name, (deps, fn) in original.items():
+            INDICATORS[name] = (deps, lambda *args, _fn=fn, _name=name: calls.append(_name) or _fn(*args))
+        out = compute(df, ["BB_Upper", "BB_Lower", "RSI_14", "OBV"])
+        # SMA_20/STD_20 and Delta are shared, each computed once; MACD/ATR untouched
+        assert sorted(calls) == sorted(["SMA_20", "STD_20", "BB_Upper", "BB_Lower", "Delta", "RSI_14", "OBV"])
+        assert list(out.columns) == ["BB_Upper", "BB_Lower", "RSI_14", "OBV"]
+    finally:
+        INDICATORS.clear()
+        INDICATORS.update(original)
+
+    try:
+        compute(df, ["Nope"])
+        assert False
+    except KeyError:
+        pass
+    print("✅ Only the requested nodes are computed, once.")
+
+if __name__ == "__main__":
+    test_batch_matches_single_ticker()
+    test_rsi_on_panel()
+    test_registry_values()
+    test_registry_computes_only_needed_nodes()
@@ -0,0 +1,32 @@
+from utils.memory_cache import MemoryCache
+import pandas as pd
+import time
+
+def test_memory_cache():
+    print("Testing MemoryCache...")
+    frame = pd.DataFrame({"Close": range(1000)}, dtype="float64")
+    size = int(frame.memory_usage(deep=True).sum())
+
+    # Room for two frames: the least recently used one is evicted
+    cache = MemoryCache(max_bytes=size * 2, ttl=60)
+    cache.set("AAPL", frame)
+    cache.set("MSFT", frame)
+    assert cache.get("AAPL") is frame
+    cache.set("TSLA", frame)
+    assert cache.get("MSFT") is None
+    assert cache.get("AAPL") is frame
+
+    # Expired entries are dropped on read
+    cache.set("SPY", frame, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("SPY") is None
+
+    stats = cache.stats()
+    print(f"Stats: {stats}")
+    assert stats["hits"] == 2 and stats["misses"] == 2 and stats["evictions"] >= 1
+    assert stats["bytes"] <= size * 2
+
+    print("✅ MemoryCache LRU/TTL logic is valid.")
+
+if __name__ == "__main__":
+    test_memory_cache()
@@ -0,0 +1,119 @@
+import datetime
+import multiprocessing
+import shutil
+import tempfile
+from utils.news_store import NewsStore, article_id, get_news_store
+from utils.sentiment_store import SentimentStore
+from utils.sentiment_backends import LexiconBackend
+from agents.synthesizer import Synthesizer
+
+NOW = datetime.datetime(2024, 3, 31, 12, tzinfo=datetime.timezone.utc)
+
+def article(uid, title, day, nested=True):
+    if nested:
+        return {"id": uid, "content": {"id": uid, "title": title, "pubDate": f"{day}T14:30:00Z",
+                                       "canonicalUrl": {"url": f"https://news.example.com/{uid}"}}}
+    return {"uuid": uid, "title": title, "link": f"https://news.example.com/{uid}",
+            "providerPublishTime": int(datetime.datetime.fromisoformat(f"{day}T14:30:00+00:00").timestamp())}
+
+def make_store(tmp):
+    sentiment = SentimentStore(f"{tmp}/headlines.jsonl", backend=LexiconBackend())
+    return NewsStore(f"{tmp}/news", sentiment)
+
+def test_incremental_ingest():
+    print("Testing incremental ingestion...")
+    tmp = tempfile.mkdtemp()
+    try:
+        store = make_store(tmp)
+        batch = [article("a1", "Apple beats expectations", "2024-03-01"),
+                 article("a2", "Apple shares plunge", "2024-03-01", nested=False),
+                 article("a3", "Apple holds event", "2024-03-02")]
+        assert store.ingest("AAPL", batch, now=NOW) == 3
+
+        # Same articles again (plus one new): only the new one counts
+        assert store.ingest("AAPL", batch + [article("a4", "Apple stock soars", "2024-03-02")], now=NOW) == 1
+        assert store.ingest("AAPL", batch, now=NOW) == 0
+
+        series = store.daily_series("AAPL")
+        assert list(series.index.strftime("%Y-%m-%d")) == ["2024-03-01", "2024-03-02"]
+        assert series["Articles"].tolist() == [2, 2]
+        assert series.loc["2024-03-01", "Bullish"] == 1 and series.loc["2024-03-01", "Bearish"] == 1
+        assert series.loc["2024-03-02", "Polarity"] > 0
+        assert [a["id"] for a in store.recent("AAPL")][-1] == "a4"
+
+        # Articles are per ticker: the same story under MSFT is counted there
+        assert store.ingest("MSFT", batch[:1], now=NOW) == 1
+        assert store.sentiment_store.stats()["misses"] == 4  # but scored only once
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ Re-ingesting the same feed adds nothing.")
+
+def test_article_identity():
+    print("Testing article ids...")
+    assert article_id({"content": {"id": "x1", "title": "t"}}) == "x1"
+    assert article_id({"uuid": "u1", "title": "t"}) == "u1"
+    assert article_id({"content": {"title": "t", "canonicalUrl": {"url": "https://a/b"}}}) == "https://a/b"
+    assert article_id({"title": "Same words"}) == article_id({"title": "Same  words"})
+    print("✅ Provider id, then URL, then headline hash.")
+
+def test_trend_and_momentum():
+    print("Testing trend and momentum...")
+    tmp = tempfile.mkdtemp()
+    try:
+        store = make_store(tmp)
+        news = []
+        # Three weeks of bad news, then a good week
+        for i in range(21):
+            day = (NOW - datetime.timedelta(days=29 - i)).strftime("%Y-%m-%d")
+            news.append(article(f"bad{i}", f"Shares plunge on weak outlook {i}", day))
+        for i in range(7):
+            day = (NOW - datetime.timedelta(days=6 - i)).strftime("%Y-%m-%d")
+            news.append(article(f"good{i}", f"Stock soars to record high {i}", day))
+        # Older than the 30-day window: ignored by trend()
+        news.append(article("old", "Stock soars", "2023-06-01"))
+        store.ingest("TSLA", news, now=NOW)
+
+        trend = store.trend("TSLA", now=NOW)
+        assert trend["Articles 30d"] == 28
+        assert trend["Polarity 7d"] > 0 > trend["Polarity 30d"]
+        assert trend["Momentum"] > 0.05 and trend["Trend"] == "Improving"
+        assert len(store.daily_series("TSLA", start="2024-01-01")) == 28
+        assert store.trend("NONE", now=NOW) == {"Polarity 7d": None, "Polarity 30d": None, "Momentum": 0.0,
+                                                "Trend": "Stable", "Articles 30d": 0}
+
+        # The Synthesizer surfaces the trend in its signals
+        signals = Synthesizer().get_signal({"RSI (14)": 50}, {"sentiment": {"trend": trend}})["signals"]
+        assert any("Sentiment Trend" in s for s in signals)
+    finally:
+        shutil.rmtree(tmp)
+    print(f"✅ 7d {trend['Polarity 7d']} vs 30d {trend['Polarity 30d']}: {trend['Trend']}.")
+
+def ingest_worker(tmp, worker, n):
+    # A separate process with its own store instance (like the bot next to the dashboard)
+    store = make_store(tmp)
+    for i in range(n):
+        store.ingest("AAPL", [article(f"w{worker}-{i}", f"Apple headline {worker}-{i}", "2024-03-01")], now=NOW)
+
+def test_concurrent_processes():
+    print("Testing ingestion from several processes...")
+    tmp = tempfile.mkdtemp()
+    try:
+        workers = [multiprocessing.Process(target=ingest_worker, args=(tmp, w, 25)) for w in range(4)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join()
+        assert all(p.exitcode == 0 for p in workers)
+        # Every process's articles survived the others' writes
+        assert make_store(tmp).daily_series("AAPL")["Articles"].tolist() == [100]
+
+        assert get_news_store(f"{tmp}/shared") is get_news_store(f"{tmp}/shared")
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ 4 processes x 25 ingests: no article lost.")
+
+if __name__ == "__main__":
+    test_incremental_ingest()
+    test_article_identity()
+    test_trend_and_momentum()
+    test_concurrent_processes()
@@ -1,7 +1,15 @@
-from agents.researcher import Researcher
+import shutil
+import tempfile
+from conftest import tmp_researcher
 
 def test_sentiment():
-    r = Researcher()
+    tmp = tempfile.mkdtemp()
+    try:
+        analyze(tmp_researcher(tmp))
+    finally:
+        shutil.rmtree(tmp)
+
+def analyze(r):
     tickers = ["AAPL", "TSLA", "YPF"]
     
     print("ANALYZING NEWS SENTIMENT\n")
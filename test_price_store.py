@@ -0,0 +1,52 @@
+from utils.price_store import PriceStore
+import tempfile
+import threading
+from conftest import load
+
+def test_price_store():
+    print("Testing PriceStore...")
+    df = load("AAPL")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PriceStore(tmp)
+        assert store.load("AAPL") is None
+        assert store.read_meta("AAPL") == {}
+
+        store.save("AAPL", df, period="1y", fetched="2026-02-13")
+        loaded = store.load("AAPL")
+
+        # Same values, same dtypes, no parsing needed
+        assert loaded.equals(df)
+        assert loaded["Volume"].dtype == df["Volume"].dtype
+        assert store.read_meta("AAPL")["period"] == "1y"
+
+    print("✅ PriceStore round-trip is valid.")
+
+def test_concurrent_saves():
+    print("Testing concurrent saves of one ticker...")
+    df = load("AAPL")
+    errors = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PriceStore(tmp)
+
+        def save_many():
+            try:
+                for _ in range(100):
+                    store.save("AAPL", df, period="1y", fetched="2026-02-13")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=save_many) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == [], errors[:1]
+        assert store.load("AAPL").equals(df)
+
+    print("✅ Threads saving the same ticker never clash on the temp file.")
+
+if __name__ == "__main__":
+    test_price_store()
+    test_concurrent_saves()
@@ -0,0 +1,84 @@
+import shutil
+import tempfile
+import logging
+import pandas as pd
+from utils.providers import LocalFileProvider, YFinanceProvider
+from utils.rate_limiter import RateLimiter
+from conftest import load
+from conftest import tmp_researcher
+
+def test_local_provider():
+    print("Testing LocalFileProvider...")
+    provider = LocalFileProvider()
+
+    # Periods are measured from the last recorded bar, so replays are deterministic
+    df = provider.history("AAPL", period="1mo")
+    assert not df.empty
+    assert df.equals(provider.history("AAPL", period="1mo"))
+    assert list(df.columns) == ["Close", "High", "Low", "Open", "Volume"]
+
+    frames = provider.history_many(["AAPL", "MSFT", "NOPE"])
+    assert not frames["MSFT"].empty and frames["NOPE"].empty
+
+    # Recorded fundamentals feed the Researcher without network
+    tmp = tempfile.mkdtemp()
+    try:
+        intel = tmp_researcher(tmp, provider).get_market_intel("AAPL")
+    finally:
+        shutil.rmtree(tmp)
+    assert intel["data"]["Free Cash Flow"] > 0
+    news = provider.news("AAPL")
+    assert news and all(item["content"]["title"] for item in news)
+    assert provider.news("NOPE") == []
+
+    print("✅ Offline provider replay is valid.")
+
+def test_ticker_handles_are_bounded():
+    print("Testing the yf.Ticker handle LRU...")
+    provider = YFinanceProvider(max_handles=3)
+    aapl = provider._ticker("AAPL")
+    for ticker in ["MSFT", "TSLA", "AAPL", "NVDA"]:
+        provider._ticker(ticker)
+    # MSFT was least recently used; AAPL's handle is reused
+    assert list(provider._tickers) == ["TSLA", "AAPL", "NVDA"]
+    assert provider._ticker("AAPL") is aapl
+    print("✅ At most max_handles handles are kept.")
+
+def test_swallowed_download_errors():
+    print("Testing yf.download failures reaching the rate limiter...")
+    import yfinance as yf
+    original = yf.download
+    answers = []
+    def fake_download(tickers, **kwargs):
+        # yf.download logs its HTTP errors and returns an empty frame
+        answer = answers.pop(0)
+        if isinstance(answer, str):
+            logging.getLogger("yfinance").error(answer)
+            return pd.DataFrame()
+        return answer
+
+    provider = YFinanceProvider()
+    provider._limiter = RateLimiter("test", rate=100.0, burst=10)
+    try:
+        yf.download = fake_download
+        # Throttled, then served: backed off and retried
+        answers[:] = ["['AAPL']: YFRateLimitError('Too Many Requests. Rate limited. Try after a while.')", load("AAPL")]
+        assert not provider.history("AAPL", period="1y").empty
+        assert provider._limiter.throttled == 1 and not answers
+
+        # Unknown ticker: raised at once, not retried
+        answers[:] = ["['NOPE']: possibly delisted; no price data found", load("AAPL")]
+        try:
+            provider.history("NOPE", period="1y")
+            assert False, "empty download accepted"
+        except Exception as e:
+            assert "delisted" in str(e)
+        assert len(answers) == 1
+    finally:
+        yf.download = original
+    print("✅ Throttled downloads are retried, bad tickers fail fast.")
+
+if __name__ == "__main__":
+    test_local_provider()
+    test_ticker_handles_are_bounded()
+    test_swallowed_download_errors()
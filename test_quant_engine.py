@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from agents import quant
+from agents.quant import QuantEngine
+from conftest import load
+
+def fake_benchmark_returns(benchmark):
+    close = load("MSFT")["Close"]
+    return np.log(close / close.shift(1)).dropna()
+
+def test_charts_are_lazy():
+    print("Testing on-demand chart rendering...")
+    tmp = tempfile.mkdtemp()
+    original = quant.get_benchmark_returns
+    quant.get_benchmark_returns = fake_benchmark_returns
+    try:
+        engine = QuantEngine("AAPL", load("AAPL"), output_dir=tmp)
+        columns = list(engine.data.columns)
+        extra = engine.indicators(["MACD", "ATR_14", "Stoch_D"])
+        assert list(extra.columns) == ["MACD", "ATR_14", "Stoch_D"]
+        assert list(engine.data.columns) == columns
+
+        metrics = engine.analyze()
+        assert "Plot Path" not in metrics and "Interactive Chart" not in metrics
+        assert os.listdir(tmp) == []
+
+        path = engine.get_static_chart()
+        assert os.path.exists(path)
+        assert engine.get_static_chart() == path
+
+        fig = engine.get_interactive_chart()
+        assert engine.get_interactive_chart() is fig
+
+        # Charts work without an explicit analyze() call
+        fresh = QuantEngine("NVDA", load("NVDA"), output_dir=tmp)
+        assert len(fresh.get_interactive_chart().data) == 5
+
+        # A new engine over the same data reuses the cached renders
+        again = QuantEngine("AAPL", load("AAPL"), output_dir=tmp)
+        assert again.get_static_chart() == path
+        again.get_interactive_chart()
+        assert again.render_cache.stats()["hits"] == 2
+    finally:
+        quant.get_benchmark_returns = original
+        shutil.rmtree(tmp)
+    print("✅ Charts are only rendered when requested.")
+
+def test_input_is_not_modified():
+    print("Testing that QuantEngine only reads its input...")
+    import threading
+    tmp = tempfile.mkdtemp()
+    original = quant.get_benchmark_returns
+    quant.get_benchmark_returns = fake_benchmark_returns
+    try:
+        df = load("TSLA")
+        snapshot = df.copy()
+
+        results = []
+        def run():
+            engine = QuantEngine("TSLA", df, output_dir=tmp)
+            results.append(engine.analyze())
+            engine.indicators(["MACD", "OBV"])
+            engine.risk(n_paths=1000, seed=0)
+            engine.get_interactive_chart(max_points=50)
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+
+        assert len(results) == 4
+        assert all(r["RSI (14)"] == results[0]["RSI (14)"] for r in results)
+        pd.testing.assert_frame_equal(df, snapshot)
+
+        # Derived series come back separately
+        engine = QuantEngine("TSLA", df, output_dir=tmp)
+        assert list(engine.derived.columns) == ["Log Returns", "RSI_14", "SMA_20", "SMA_10"]
+        assert engine.derived.index.equals(df.index)
+
+        # MultiIndex columns are flattened without touching the caller's frame
+        multi = df.copy()
+        multi.columns = pd.MultiIndex.from_product([df.columns, ["TSLA"]])
+        QuantEngine("TSLA", multi, output_dir=tmp).analyze()
+        assert isinstance(multi.columns, pd.MultiIndex)
+    finally:
+        quant.get_benchmark_returns = original
+        shutil.rmtree(tmp)
+    print("✅ Input frame left untouched.")
+
+if __name__ == "__main__":
+    test_charts_are_lazy()
+    test_input_is_not_modified()
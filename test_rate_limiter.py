@@ -0,0 +1,80 @@
+from utils.rate_limiter import RateLimiter, deadline
+import time
+
+def test_rate_limiter():
+    print("Testing RateLimiter...")
+    limiter = RateLimiter("test", rate=20.0, burst=5)
+
+    # Burst is served immediately, then calls are paced at `rate`
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.05
+    for _ in range(4):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.15
+
+    # A 429 halves the rate; successes bring it back
+    limiter.on_throttle()
+    assert limiter.rate == 10.0 and limiter.throttled == 1
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.rate == 20.0
+
+    # call() retries transient failures
+    attempts = []
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("429 Too Many Requests")
+        return "ok"
+    assert limiter.call(flaky, retries=3, base_delay=0.01) == "ok"
+    assert len(attempts) == 3 and limiter.throttled == 3
+
+    # Bad input is not retried: no tokens or backoff spent on it
+    calls = []
+    def bad_ticker():
+        calls.append(1)
+        raise KeyError("NOPE")
+    try:
+        limiter.call(bad_ticker, retries=3, base_delay=0.01)
+        assert False, "error not raised"
+    except KeyError:
+        pass
+    assert len(calls) == 1
+
+    print("✅ RateLimiter pacing and AIMD logic is valid.")
+
+def test_deadline():
+    print("Testing call deadlines...")
+    limiter = RateLimiter("test", rate=20.0, burst=1)
+    attempts = []
+    def down():
+        attempts.append(1)
+        raise ConnectionError("upstream down")
+
+    # The backoff before the next retry would end past the deadline: give up now
+    start = time.monotonic()
+    try:
+        limiter.call(down, retries=3, base_delay=5.0, until=start + 0.5)
+        assert False, "error not raised"
+    except ConnectionError:
+        pass
+    assert len(attempts) == 1 and time.monotonic() - start < 0.5
+
+    # Inside a deadline() block (e.g. a worker its caller stopped waiting for)
+    # no token is waited for past it either
+    slow = RateLimiter("test", rate=0.1, burst=1)
+    slow.acquire()
+    with deadline(time.monotonic() + 1.0):
+        try:
+            slow.call(down, retries=3)
+            assert False, "token wait not bounded"
+        except TimeoutError:
+            pass
+    assert len(attempts) == 1
+    print("✅ Abandoned calls stop retrying at the deadline.")
+
+if __name__ == "__main__":
+    test_rate_limiter()
+    test_deadline()
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import threading
+from utils.render_cache import RenderCache
+from conftest import load
+
+def test_key_tracks_content():
+    df = load("AAPL")
+    key = RenderCache.key("AAPL", df, {"kind": "static"})
+    assert key == RenderCache.key("AAPL", df.copy(), {"kind": "static"})
+    assert key != RenderCache.key("MSFT", df, {"kind": "static"})
+    assert key != RenderCache.key("AAPL", df, {"kind": "interactive"})
+    assert key != RenderCache.key("AAPL", df.iloc[:-1], {"kind": "static"})
+    assert key != RenderCache.key("AAPL", df.iloc[1:], {"kind": "static"})
+
+    # Intraday revision of the last bar
+    revised = df.copy()
+    revised.iloc[-1, revised.columns.get_loc("Close")] += 1
+    assert key != RenderCache.key("AAPL", revised, {"kind": "static"})
+
+    # Restatement of an old bar that leaves the last close unchanged
+    restated = df.copy()
+    restated.iloc[:100, restated.columns.get_loc("Close")] *= 0.5
+    assert key != RenderCache.key("AAPL", restated, {"kind": "static"})
+    assert RenderCache.key("AAPL", df.iloc[:0], {"kind": "static"}) == RenderCache.key("AAPL", df.iloc[:0], {"kind": "static"})
+    print("✅ Render keys follow the data and the spec.")
+
+def test_png_rendered_once():
+    print("Testing PNG reuse and concurrent renders...")
+    tmp = tempfile.mkdtemp()
+    try:
+        cache = RenderCache(tmp)
+        key = RenderCache.key("AAPL", load("AAPL"))
+        renders = []
+        def render(path):
+            renders.append(path)
+            with open(path, "wb") as f:
+                f.write(b"png")
+
+        paths = []
+        threads = [threading.Thread(target=lambda: paths.append(cache.get_png("AAPL", key, render)))
+                   for _ in range(4)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        assert len(set(paths)) == 1
+        assert len(set(renders)) == len(renders)  # each render wrote its own temp file
+
+        before = len(renders)
+        assert cache.get_png("AAPL", key, render) == paths[0]
+        assert len(renders) == before
+        assert sorted(os.listdir(tmp)) == [os.path.basename(paths[0])]
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ Cached PNG reused, no temp files left behind.")
+
+def test_figure_round_trip():
+    import plotly.graph_objects as go
+    tmp = tempfile.mkdtemp()
+    try:
+        cache = RenderCache(tmp)
+        df = load("MSFT")
+        key = RenderCache.key("MSFT", df)
+        builds = []
+        def build():
+            builds.append(1)
+            return go.Figure(go.Scatter(x=df.index, y=df["Close"]))
+
+        first = cache.get_figure("MSFT", key, build)
+        second = cache.get_figure("MSFT", key, build)
+        assert len(builds) == 1
+        assert len(second.data) == len(first.data) and second.data[0].type == "scatter"
+        assert cache.stats()["hits"] == 1
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ Plotly figures served from JSON.")
+
+if __name__ == "__main__":
+    test_key_tracks_content()
+    test_png_rendered_once()
+    test_figure_round_trip()
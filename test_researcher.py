@@ -1,4 +1,14 @@
-from agents.researcher import Researcher
-print("Testing Researcher...")
-r = Researcher()
-print(r.get_market_intel("AAPL"))
+import shutil
+import tempfile
+from conftest import tmp_researcher
+
+def test_researcher():
+    print("Testing Researcher...")
+    tmp = tempfile.mkdtemp()
+    try:
+        print(tmp_researcher(tmp).get_market_intel("AAPL"))
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == "__main__":
+    test_researcher()
@@ -0,0 +1,96 @@
+from utils.retention import RetentionManager, DEFAULT_POLICIES
+from utils.price_store import PriceStore
+import os
+import shutil
+import tempfile
+import time
+from utils.news_store import NewsStore
+from utils.sentiment_store import SentimentStore
+from utils.sentiment_backends import LexiconBackend
+from conftest import fixture_path, PRICES_DIR
+
+def test_retention():
+    print("Testing RetentionManager...")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_dir = os.path.join(tmp, "briefing")
+        store_dir = os.path.join(tmp, "raw")
+        charts_dir = os.path.join(tmp, "temp_dashboard")
+        os.makedirs(csv_dir)
+        os.makedirs(os.path.join(charts_dir, "old"))
+
+        # Two daily copies of the same ticker history
+        shutil.copy(fixture_path("AAPL", "1y"), os.path.join(csv_dir, "AAPL_1y_2026-02-13.csv"))
+        shutil.copy(fixture_path("AAPL", "6mo"), os.path.join(csv_dir, "AAPL_6mo_2026-02-12.csv"))
+
+        # One stale chart, one recent chart
+        old_chart = os.path.join(charts_dir, "old", "TSLA_analysis.png")
+        new_chart = os.path.join(charts_dir, "AAPL_analysis.png")
+        for path in (old_chart, new_chart):
+            with open(path, "wb") as f:
+                f.write(b"0" * 1024)
+        week_ago = time.time() - 7 * 86400
+        os.utime(old_chart, (week_ago, week_ago))
+
+        manager = RetentionManager(policies=[
+            {"path": csv_dir, "max_age_days": None, "max_bytes": None, "compact": True},
+            {"path": charts_dir, "max_age_days": 2, "max_bytes": 10 * 1024 * 1024},
+        ], store_dir=store_dir)
+        result = manager.run(max_seconds=None)
+
+        # CSV copies folded into one store file holding the newest history
+        assert os.listdir(csv_dir) == []
+        assert result["compacted"] == 1
+        meta = PriceStore(store_dir).read_meta("AAPL")
+        assert meta["fetched"] == "2026-02-13" and meta["period"] == "1y"
+
+        # Age budget removes the stale chart and its now-empty folder
+        assert not os.path.exists(os.path.dirname(old_chart))
+        assert os.path.exists(new_chart)
+
+    print("✅ Retention budgets and compaction are valid.")
+
+def test_fixtures_survive_full_pass():
+    print("Testing that retention leaves tracked fixtures alone...")
+    repo_fixtures = os.path.dirname(PRICES_DIR)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # Copy of the repo layout: fixtures plus a policy that (wrongly) covers them
+        shutil.copytree(repo_fixtures, os.path.join(tmp, "data", "fixtures"))
+        before = sorted(os.listdir(os.path.join(tmp, "data", "fixtures", "prices")))
+        old = time.time() - 365 * 86400
+        for name in before:
+            path = os.path.join(tmp, "data", "fixtures", "prices", name)
+            os.utime(path, (old, old))
+        try:
+            os.chdir(tmp)
+            policies = DEFAULT_POLICIES + [{"path": "data", "max_age_days": 1, "max_bytes": 0, "compact": True}]
+            result = RetentionManager(policies=policies).run(max_seconds=None)
+            after = sorted(os.listdir(os.path.join("data", "fixtures", "prices")))
+        finally:
+            os.chdir(cwd)
+
+        assert after == before
+        assert result["files_removed"] == 0 and result["compacted"] == 0
+        assert not any(p["path"].startswith("data/fixtures") for p in DEFAULT_POLICIES)
+    print(f"✅ {len(before)} fixture histories kept after a full pass.")
+
+def test_lock_files_survive():
+    print("Testing that retention leaves lock files alone...")
+    with tempfile.TemporaryDirectory() as tmp:
+        news_dir = os.path.join(tmp, "news")
+        store = NewsStore(news_dir, SentimentStore(os.path.join(tmp, "headlines.jsonl"), backend=LexiconBackend()))
+        store.ingest("AAPL", [{"uuid": "a1", "title": "Apple beats expectations"}])
+        # The lock file is never written, so it looks as old as it gets
+        old = time.time() - 2 * 365 * 86400
+        for name in os.listdir(news_dir):
+            os.utime(os.path.join(news_dir, name), (old, old))
+
+        result = RetentionManager(policies=[{"path": news_dir, "max_age_days": 400, "max_bytes": 0}]).run(max_seconds=None)
+        assert os.listdir(news_dir) == [os.path.basename(store.lock_path)]
+        assert result["files_removed"] == 1
+    print("✅ Aged-out news is removed, its lock file is kept.")
+
+if __name__ == "__main__":
+    test_retention()
+    test_fixtures_survive_full_pass()
+    test_lock_files_survive()
@@ -0,0 +1,55 @@
+import numpy as np
+from scipy.stats import norm
+from utils.risk import historical_var, parametric_var, monte_carlo_var, simulate_returns, risk_report
+from conftest import load_close
+
+def load_returns(tickers):
+    close = load_close(tickers).dropna()
+    return np.log(close / close.shift(1)).dropna()
+
+def test_single_ticker():
+    print("Testing single-ticker VaR/CVaR...")
+    returns = load_returns(["AAPL"])["AAPL"]
+    var, cvar = historical_var(returns, 0.95)
+    assert np.isclose(var, np.percentile(returns, 5))  # QuantEngine's VaR (95%)
+    assert cvar <= var
+
+    var, cvar = parametric_var(returns, 0.99, horizon=10)
+    mu, sigma = returns.mean() * 10, returns.std() * np.sqrt(10)
+    assert np.isclose(var, mu + norm.ppf(0.01) * sigma)
+    assert cvar < var
+    print("✅ Historical and parametric estimates correct.")
+
+def test_monte_carlo_matches_parametric():
+    print("Testing Monte Carlo convergence and chunking...")
+    returns = load_returns(["AAPL", "MSFT", "NVDA", "TSLA"])
+    weights = {"AAPL": 0.4, "MSFT": 0.3, "NVDA": 0.2, "TSLA": 0.1}
+
+    # Normal simulation of a portfolio: close to the parametric estimate
+    mc_var, mc_cvar = monte_carlo_var(returns, 0.95, horizon=1, weights=weights, n_paths=200_000, seed=3)
+    p_var, p_cvar = parametric_var(returns, 0.95, horizon=1, weights=weights)
+    assert abs(mc_var - p_var) < 0.1 * abs(p_var)
+    assert abs(mc_cvar - p_cvar) < 0.1 * abs(p_cvar)
+
+    # Chunk size changes memory, not results
+    a = simulate_returns(returns, horizon=5, n_paths=10_000, chunk_size=10_000, seed=11)
+    b = simulate_returns(returns, horizon=5, n_paths=10_000, chunk_size=777, seed=11)
+    assert np.allclose(a, b)
+    print("✅ Monte Carlo agrees with the normal approximation.")
+
+def test_report_layout():
+    returns = load_returns(["AAPL", "MSFT"])
+    report = risk_report(returns, n_paths=5_000, seed=0)
+    assert len(report) == 3 * 2 * 2
+    assert set(report["Method"]) == {"Historical", "Parametric", "Monte Carlo"}
+    assert (report["CVaR"] <= report["VaR"]).all()
+    # Longer horizon, bigger loss
+    ten_day = report[report["Horizon"] == 10].set_index(["Method", "Confidence"])["VaR"]
+    one_day = report[report["Horizon"] == 1].set_index(["Method", "Confidence"])["VaR"]
+    assert (ten_day < one_day).all()
+    print("✅ Risk report covers every method, level and horizon.")
+
+if __name__ == "__main__":
+    test_single_ticker()
+    test_monte_carlo_matches_parametric()
+    test_report_layout()
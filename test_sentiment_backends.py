@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+from utils.sentiment_backends import LexiconBackend, TextBlobBackend, get_backend
+from utils.sentiment_store import SentimentStore
+from agents.researcher import Researcher
+
+def test_lexicon_polarity():
+    print("Testing the lexicon backend...")
+    lexicon = LexiconBackend()
+    bull, bear, flat, negated, plain, intensified = lexicon.score([
+        "Apple beats expectations as profits surge",
+        "Tesla shares plunge after weak guidance",
+        "Fed holds annual meeting",
+        "Stocks not rising",
+        "Strong quarter for Apple",
+        "Very strong quarter for Apple",
+    ])
+    assert bull > 0.05 and bear < -0.05 and flat == 0.0
+    assert negated < 0  # "not" flips the next word, as in TextBlob
+    assert intensified > plain > 0
+    assert bull <= 1.0 and bear >= -1.0
+    assert lexicon.score([]) == [] and lexicon.score(["", "?"]) == [0.0, 0.0]
+    print(f"✅ Bullish {bull:.2f}, bearish {bear:.2f}, negated {negated:.2f}.")
+
+def test_batch_matches_single():
+    print("Testing batch scoring...")
+    lexicon = LexiconBackend()
+    titles = ["Oil prices fall", "Very strong growth", "Not bad", "Nvidia stock soars", "Quiet day"]
+    batch = lexicon.score(titles)
+    single = [lexicon.score([t])[0] for t in titles]
+    assert batch == single
+    # A modifier at the end of one title does not leak into the next
+    assert lexicon.score(["Shares are not", "rising"]) == [0.0, lexicon.score(["rising"])[0]]
+    print("✅ One batch pass gives the same polarities as scoring one by one.")
+
+def test_backend_selection():
+    print("Testing backend selection...")
+    assert isinstance(get_backend("lexicon"), LexiconBackend)
+    assert isinstance(get_backend("textblob"), TextBlobBackend)
+    try:
+        get_backend("vader")
+        assert False, "unknown backend accepted"
+    except KeyError:
+        pass
+
+    tmp = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(tmp)
+        # One store file per backend: polarities never mix
+        store = SentimentStore(backend=LexiconBackend())
+        assert store.path == os.path.join("data", "sentiment", "lexicon.jsonl")
+        result = Researcher(sentiment_store=store)._get_sentiment("AAPL", news=[{"title": "Apple stock soars to record high"}])
+        assert result["sentiment"] == "Bullish"
+        assert os.path.exists(store.path)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp)
+    print("✅ Researcher scores through the chosen backend.")
+
+if __name__ == "__main__":
+    test_lexicon_polarity()
+    test_batch_matches_single()
+    test_backend_selection()
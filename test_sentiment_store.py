@@ -0,0 +1,158 @@
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+from utils.sentiment_store import SentimentStore, headline_key
+from utils.sentiment_backends import TextBlobBackend
+from conftest import tmp_researcher
+
+class CountingBackend(TextBlobBackend):
+    """Records every batch it is asked to score."""
+    def __init__(self):
+        self.batches = []
+
+    def score(self, titles):
+        self.batches.append(list(titles))
+        return super().score(titles)
+
+def textblob_polarity(titles):
+    return TextBlobBackend().score(titles)
+
+def read_log(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return dict(json.loads(line) for line in f)
+
+def test_batch_scoring_and_hits():
+    print("Testing headline memoization...")
+    tmp = tempfile.mkdtemp()
+    try:
+        backend = CountingBackend()
+        store = SentimentStore(f"{tmp}/headlines.jsonl", backend=backend)
+        titles = ["Stocks rally on strong earnings", "Fed holds rates", "Stocks  rally on strong earnings"]
+        first = store.score(titles)
+
+        # One batch, duplicates (whitespace aside) scored once
+        assert backend.batches == [["Stocks rally on strong earnings", "Fed holds rates"]]
+        assert first[0] == first[2] == textblob_polarity(["Stocks rally on strong earnings"])[0]
+
+        # Same headline under another ticker: only the new one is scored
+        second = store.score(["Fed holds rates", "Oil prices fall sharply"])
+        assert backend.batches[-1] == ["Oil prices fall sharply"]
+        assert second[0] == first[1]
+
+        stats = store.stats()
+        assert stats["hits"] == 2 and stats["misses"] == 3 and stats["entries"] == 3
+    finally:
+        shutil.rmtree(tmp)
+    print(f"✅ Scored 3 unique headlines for 5 lookups (hit rate {stats['hit_rate']:.0%}).")
+
+def test_persists_across_restarts():
+    print("Testing persistence...")
+    tmp = tempfile.mkdtemp()
+    try:
+        path = f"{tmp}/headlines.jsonl"
+        SentimentStore(path, backend=TextBlobBackend()).score(["Apple beats expectations"])
+        assert headline_key("Apple beats expectations") in read_log(path)
+
+        backend = CountingBackend()
+        restarted = SentimentStore(path, backend=backend)
+        restarted.score(["Apple beats expectations"])
+        assert backend.batches == []
+        assert restarted.stats()["hit_rate"] == 1.0
+
+        # Two stores on the same file keep each other's entries; new ones are appended
+        other = SentimentStore(path, backend=TextBlobBackend())
+        other.score(["Tesla recalls vehicles"])
+        with open(path, "rb") as f:
+            before = f.read()
+        restarted.score(["Nvidia unveils new chip"])
+        with open(path, "rb") as f:
+            after = f.read()
+        assert after.startswith(before) and after.count(b"\n") == 3
+        assert len(read_log(path)) == 3
+
+        # Entries another store appended are picked up without scoring them again
+        backend.batches.clear()
+        restarted.score(["Tesla recalls vehicles"])
+        assert backend.batches == []
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ Polarities survive restarts and concurrent writers.")
+
+def test_max_entries():
+    print("Testing the size bound...")
+    tmp = tempfile.mkdtemp()
+    try:
+        store = SentimentStore(f"{tmp}/headlines.jsonl", backend=TextBlobBackend(), max_entries=2)
+        store.score(["first headline"])
+        store.score(["second headline", "third headline"])
+        # Compacted once the log outgrew max_entries (with slack)
+        assert store.stats()["entries"] == 2 and len(read_log(store.path)) == 2
+        reloaded = SentimentStore(f"{tmp}/headlines.jsonl", backend=CountingBackend())
+        reloaded.score(["third headline"])
+        assert reloaded.backend.batches == []
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ Oldest headlines are dropped beyond max_entries.")
+
+def test_legacy_file_imported():
+    print("Testing the old single-file store...")
+    tmp = tempfile.mkdtemp()
+    try:
+        with open(f"{tmp}/textblob.json", "w", encoding="utf-8") as f:
+            json.dump({headline_key("Apple beats expectations"): 0.5}, f)
+        backend = CountingBackend()
+        store = SentimentStore(f"{tmp}/textblob.jsonl", backend=backend)
+        assert store.score(["Apple beats expectations"]) == [0.5] and backend.batches == []
+        store.score(["Tesla recalls vehicles"])
+        assert len(read_log(store.path)) == 2
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ Polarities from the old JSON store are carried over.")
+
+def score_worker(path, worker, n):
+    store = SentimentStore(path, backend=TextBlobBackend())
+    for i in range(n):
+        store.score([f"Headline {worker}-{i}"])
+
+def test_concurrent_processes():
+    print("Testing writes from several processes...")
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, "headlines.jsonl")
+        workers = [multiprocessing.Process(target=score_worker, args=(path, w, 25)) for w in range(4)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join()
+        assert all(p.exitcode == 0 for p in workers)
+        assert len(read_log(path)) == 100
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ 4 processes x 25 headlines: no polarity lost.")
+
+def test_researcher_uses_store():
+    print("Testing Researcher sentiment through the store...")
+    tmp = tempfile.mkdtemp()
+    try:
+        backend = CountingBackend()
+        store = SentimentStore(f"{tmp}/headlines.jsonl", backend=backend)
+        researcher = tmp_researcher(tmp, sentiment_store=store)
+        news = [{"title": "Market soars to record high"}, {"content": {"title": "Shares plunge after weak guidance"}}]
+        first = researcher._get_sentiment("AAPL", news=news)
+        second = researcher._get_sentiment("MSFT", news=news[:1])
+        assert len(backend.batches) == 1
+        assert first["headlines"] == ["Market soars to record high", "Shares plunge after weak guidance"]
+        assert second["sentiment"] == "Bullish"
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ Shared headlines are scored once across tickers.")
+
+if __name__ == "__main__":
+    test_batch_scoring_and_hits()
+    test_persists_across_restarts()
+    test_max_entries()
+    test_legacy_file_imported()
+    test_concurrent_processes()
+    test_researcher_uses_store()
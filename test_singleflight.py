@@ -0,0 +1,36 @@
+from utils.singleflight import SingleFlight
+import threading
+import time
+
+def test_singleflight():
+    print("Testing SingleFlight...")
+    flights = SingleFlight()
+    upstream_calls = []
+
+    def slow_fetch(ticker):
+        upstream_calls.append(ticker)
+        time.sleep(0.2)
+        return {"ticker": ticker}
+
+    results = []
+    def worker():
+        results.append(flights.do(("intel", "TSLA"), slow_fetch, "TSLA"))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+
+    # Five concurrent callers, one upstream call
+    assert upstream_calls == ["TSLA"], upstream_calls
+    assert all(r[0] == {"ticker": "TSLA"} for r in results)
+    assert sum(1 for _, shared in results if shared) == 4
+    assert flights.in_flight() == 0
+
+    # Once finished, the next call fetches again
+    flights.do(("intel", "TSLA"), slow_fetch, "TSLA")
+    assert len(upstream_calls) == 2
+
+    print("✅ SingleFlight coalescing is valid.")
+
+if __name__ == "__main__":
+    test_singleflight()
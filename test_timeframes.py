@@ -0,0 +1,46 @@
+import numpy as np
+from utils import timeframes
+from utils.timeframes import resample_ohlcv, multi_timeframe
+from utils.indicators import rsi
+from conftest import load
+
+def test_resample_ohlcv():
+    print("Testing weekly resampling...")
+    df = load("AAPL")
+    weekly = resample_ohlcv(df, "W-FRI")
+    first_week = df[df.index <= weekly.index[0]]
+    assert weekly["Open"].iloc[0] == first_week["Open"].iloc[0]
+    assert weekly["High"].iloc[0] == first_week["High"].max()
+    assert weekly["Low"].iloc[0] == first_week["Low"].min()
+    assert weekly["Close"].iloc[0] == first_week["Close"].iloc[-1]
+    assert weekly["Volume"].sum() == df["Volume"].sum()
+    assert weekly["Close"].iloc[-1] == df["Close"].iloc[-1]
+    print("✅ Weekly bars aggregate the daily bars.")
+
+def test_multi_timeframe_metrics_and_cache():
+    print("Testing multi-timeframe metrics and caching...")
+    df = load("MSFT")
+    result = multi_timeframe("MSFT", df)
+    assert list(result) == ["Daily", "Weekly", "Monthly"]
+    assert np.isclose(result["Daily"]["RSI (14)"], rsi(df["Close"]).iloc[-1])
+    weekly_close = resample_ohlcv(df, "W-FRI")["Close"]
+    assert np.isclose(result["Weekly"]["RSI (14)"], rsi(weekly_close).iloc[-1])
+    returns = np.log(weekly_close / weekly_close.shift(1))
+    assert np.isclose(result["Weekly"]["Annualized Volatility"], returns.std() * np.sqrt(52))
+    # One year of history: 13 monthly bars, not enough for SMA 20
+    assert np.isnan(result["Monthly"]["SMA 20"])
+
+    hits = timeframes._cache.hits
+    result["Daily"]["RSI (14)"] = -1  # callers get their own copy
+    again = multi_timeframe("MSFT", df)
+    assert timeframes._cache.hits == hits + 1
+    assert again["Daily"]["RSI (14)"] != -1
+
+    # A new bar is a new key
+    multi_timeframe("MSFT", df.iloc[:-1])
+    assert timeframes._cache.hits == hits + 1
+    print("✅ Timeframes computed once per last bar.")
+
+if __name__ == "__main__":
+    test_resample_ohlcv()
+    test_multi_timeframe_metrics_and_cache()
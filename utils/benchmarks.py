@@ -0,0 +1,132 @@
+import threading
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+# Benchmark per ticker suffix; everything else uses DEFAULT_BENCHMARK. Override
+# with a "benchmarks" section in config.json, e.g.
+# {"default": "SPY", "suffixes": {".BA": "^MERV", ".SA": "^BVSP"}}
+DEFAULT_BENCHMARK = "SPY"
+DEFAULT_SUFFIXES = {".BA": "^MERV"}
+BENCHMARK_PERIOD = "5y"
+
+_config = None
+_returns = {}  # {benchmark: (log returns Series, day loaded)}
+_lock = threading.Lock()
+
+def _benchmark_config():
+    global _config
+    if _config is None:
+        config = {"default": DEFAULT_BENCHMARK, "suffixes": dict(DEFAULT_SUFFIXES)}
+        try:
+            from utils.config_loader import load_config
+            overrides = load_config().get("benchmarks", {})
+            config["default"] = overrides.get("default", config["default"])
+            config["suffixes"].update(overrides.get("suffixes", {}))
+        except Exception:
+            pass
+        _config = config
+    return _config
+
+def benchmark_for(ticker: str) -> str:
+    """Returns the benchmark index a ticker's beta is measured against."""
+    config = _benchmark_config()
+    for suffix, benchmark in config["suffixes"].items():
+        if ticker.upper().endswith(suffix.upper()):
+            return benchmark
+    return config["default"]
+
+def get_benchmark_returns(benchmark: str, save_dir: str = "data/raw") -> pd.Series:
+    """
+    Log returns of a benchmark, loaded once per process and reloaded when the
+    day changes (the underlying history is refreshed daily by the data loader).
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    with _lock:
+        entry = _returns.get(benchmark)
+        if entry is not None and entry[1] == today:
+            return entry[0]
+
+    from utils.data_loader import get_market_data
+    data = get_market_data(benchmark, period=BENCHMARK_PERIOD, save_dir=save_dir)
+    if data.empty:
+        return pd.Series(dtype=float)
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    close = pd.to_numeric(data['Close'], errors='coerce')
+    returns = np.log(close / close.shift(1)).dropna()
+
+    with _lock:
+        _returns[benchmark] = (returns, today)
+    return returns
+
+def refresh():
+    """Drops the cached benchmark returns (and config) so the next call reloads them."""
+    global _config
+    with _lock:
+        _returns.clear()
+        _config = None
+
+def panel_returns(close: pd.DataFrame) -> pd.DataFrame:
+    """
+    Date-indexed log returns of a (dates x tickers) close panel, each ticker
+    measured against its own previous bar, so gaps from other markets'
+    trading days do not drop returns.
+    """
+    previous = close.ffill().shift(1)
+    return np.log(close / previous).where(close.notna())
+
+def beta_matrix(returns: pd.DataFrame, market: pd.Series) -> pd.DataFrame:
+    """
+    Beta and correlation of every column of `returns` against one market
+    return series, in a single vectorized covariance pass. Each ticker uses
+    the dates it shares with the market (pairwise complete, like
+    pd.concat([stock, market]).dropna().cov()).
+
+    Returns:
+        pd.DataFrame: One row per ticker with "Beta" and "Correlation".
+    """
+    market = market.reindex(returns.index)
+    r = returns.to_numpy(dtype="float64")
+    m = np.broadcast_to(market.to_numpy(dtype="float64")[:, None], r.shape)
+    valid = ~np.isnan(r) & ~np.isnan(m)
+    n = valid.sum(axis=0)
+
+    r = np.where(valid, r, 0.0)
+    m = np.where(valid, m, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r_dev = np.where(valid, r - r.sum(axis=0) / n, 0.0)
+        m_dev = np.where(valid, m - m.sum(axis=0) / n, 0.0)
+        cov = (r_dev * m_dev).sum(axis=0) / (n - 1)
+        var_m = (m_dev ** 2).sum(axis=0) / (n - 1)
+        var_r = (r_dev ** 2).sum(axis=0) / (n - 1)
+        beta = np.where(n > 1, cov / var_m, np.nan)
+        corr = np.where(n > 1, cov / np.sqrt(var_m * var_r), np.nan)
+
+    return pd.DataFrame({"Beta": beta, "Correlation": corr}, index=returns.columns)
+
+def universe_betas(close: pd.DataFrame, save_dir: str = "data/raw") -> pd.DataFrame:
+    """
+    Beta and correlation for a (dates x tickers) close panel, one covariance
+    pass per benchmark (e.g. SPY for US tickers, ^MERV for .BA tickers).
+
+    Returns:
+        pd.DataFrame: One row per ticker with "Beta", "Correlation" and "Benchmark".
+    """
+    returns = panel_returns(close)
+    groups = {}
+    for ticker in close.columns:
+        groups.setdefault(benchmark_for(ticker), []).append(ticker)
+
+    frames = []
+    for benchmark, tickers in groups.items():
+        market = get_benchmark_returns(benchmark, save_dir=save_dir)
+        if market.empty:
+            betas = pd.DataFrame({"Beta": np.nan, "Correlation": np.nan}, index=tickers)
+        else:
+            betas = beta_matrix(returns[tickers], market)
+        betas["Benchmark"] = benchmark
+        frames.append(betas)
+    if not frames:
+        return pd.DataFrame(columns=["Beta", "Correlation", "Benchmark"])
+    return pd.concat(frames).reindex(close.columns)
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+PRICE_FIELDS = ("Open", "High", "Low", "Close")
+EPOCH = pd.Timestamp("1970-01-01")
+
+class CompactPanel:
+    """
+    Memory-compact, read-only OHLCV panel for universe-scale scans.
+
+    Layout (T dates x N tickers):
+        prices  float32  (4, T, N)  Open/High/Low/Close, NaN where a ticker has no bar
+        volume  uint32   (T, N)     upgraded to uint64 only if a value does not fit
+        days    int32    (T,)       day offset from 1970-01-01 instead of datetime64[ns]
+
+    Less than half the size of the same data held as float64/int64 DataFrames
+    per ticker (see bench_compact.py). All arrays are flagged read-only, so
+    one panel can be shared by every thread and session without copies.
+    """
+    def __init__(self, tickers, days, prices, volume):
+        self.tickers = list(tickers)
+        self._columns = {t: i for i, t in enumerate(self.tickers)}
+        self.days = days
+        self.prices = prices
+        self.volume = volume
+        for arr in (self.days, self.prices, self.volume):
+            arr.setflags(write=False)
+
+    @classmethod
+    def from_frames(cls, frames: dict):
+        """Builds a panel from {ticker: OHLCV DataFrame} (e.g. get_market_data_many output)."""
+        frames = {t: df for t, df in frames.items() if not df.empty}
+        tickers = list(frames)
+        index = pd.DatetimeIndex([])
+        for df in frames.values():
+            index = index.union(pd.DatetimeIndex(df.index))
+        index = index.tz_localize(None) if index.tz is not None else index
+
+        prices = np.full((len(PRICE_FIELDS), len(index), len(tickers)), np.nan, dtype=np.float32)
+        volume = np.zeros((len(index), len(tickers)), dtype=np.uint64)
+        for j, ticker in enumerate(tickers):
+            df = frames[ticker]
+            rows = index.get_indexer(pd.DatetimeIndex(df.index).tz_localize(None)
+                                     if getattr(df.index, "tz", None) is not None else df.index)
+            for k, field in enumerate(PRICE_FIELDS):
+                if field in df.columns:
+                    prices[k, rows, j] = df[field].to_numpy(dtype=np.float32)
+            if "Volume" in df.columns:
+                volume[rows, j] = np.nan_to_num(df["Volume"].to_numpy(dtype=np.float64)).astype(np.uint64)
+
+        if volume.size == 0 or volume.max() <= np.iinfo(np.uint32).max:
+            volume = volume.astype(np.uint32)
+        days = ((index - EPOCH) // pd.Timedelta(days=1)).to_numpy().astype(np.int32)
+        return cls(tickers, days, prices, volume)
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(EPOCH + pd.to_timedelta(self.days, unit="D"), name="Date")
+
+    @property
+    def nbytes(self) -> int:
+        return self.days.nbytes + self.prices.nbytes + self.volume.nbytes
+
+    def field(self, name: str) -> np.ndarray:
+        """Read-only (dates x tickers) array for one field, without copying."""
+        if name == "Volume":
+            return self.volume
+        return self.prices[PRICE_FIELDS.index(name)]
+
+    def to_frame(self, name: str = "Close") -> pd.DataFrame:
+        """Wide (dates x tickers) DataFrame of one field, e.g. for indicator engines."""
+        return pd.DataFrame(self.field(name), index=self.dates, columns=self.tickers)
+
+    def ticker_frame(self, ticker: str) -> pd.DataFrame:
+        """OHLCV DataFrame for one ticker (float32 prices), dropping dates it did not trade."""
+        j = self._columns[ticker]
+        data = {field: self.prices[k, :, j] for k, field in enumerate(PRICE_FIELDS)}
+        data["Volume"] = self.volume[:, j]
+        df = pd.DataFrame(data, index=self.dates)
+        return df[~np.isnan(self.prices[3, :, j])]
@@ -1,57 +1,380 @@
-import yfinance as yf
+import re
+import numpy as np
 import pandas as pd
-import os
 from datetime import datetime
+from utils.price_store import PriceStore
+from utils.memory_cache import MemoryCache
+from utils.singleflight import SingleFlight
+from utils.providers import get_provider
+from utils.streaming_indicators import IndicatorState
 
-def get_market_data(ticker: str, period: str = "2y", save_dir: str = "data/raw") -> pd.DataFrame:
+# Bars re-downloaded before the last cached bar to detect split/dividend restatements
+OVERLAP_BARS = 5
+RESTATEMENT_RTOL = 1e-4
+
+# Process-wide RAM layer in front of the store: {(save_dir, ticker): (history, period, fetched)}
+_memory_cache = MemoryCache(max_bytes=256 * 1024 * 1024, ttl=15 * 60)
+
+# Coalesces concurrent fetches of the same (save_dir, ticker), whatever the period
+_flights = SingleFlight()
+
+def get_cache_stats() -> dict:
+    """Hit/miss counters and size of the in-memory OHLCV cache."""
+    return _memory_cache.stats()
+
+def _period_start(period: str, end: pd.Timestamp):
+    """
+    Converts a yfinance period string ("6mo", "2y", "ytd", ...) into the first
+    date it covers, counting back from `end`. Returns None for "max".
+    """
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=end.year, month=1, day=1)
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    n, unit = int(match.group(1)), match.group(2)
+    offsets = {
+        "d": pd.DateOffset(days=n),
+        "wk": pd.DateOffset(weeks=n),
+        "mo": pd.DateOffset(months=n),
+        "y": pd.DateOffset(years=n),
+    }
+    return end.normalize() - offsets[unit]
+
+def _covers(stored_period: str, period: str) -> bool:
+    """True if a history downloaded for `stored_period` contains all of `period`."""
+    try:
+        ref = pd.Timestamp.today()
+        stored_start = _period_start(stored_period, ref)
+        requested_start = _period_start(period, ref)
+    except ValueError:
+        return stored_period == period
+    if stored_start is None:
+        return True
+    if requested_start is None:
+        return False
+    return stored_start <= requested_start
+
+def _slice_period(data: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Returns the trailing `period` of a (longer) history."""
+    if data.empty:
+        return data
+    start = _period_start(period, data.index[-1])
+    if start is None:
+        return data
+    return data[data.index >= start]
+
+def _download(ticker: str, **kwargs) -> pd.DataFrame:
+    """Single-ticker download through the configured MarketDataProvider."""
+    return get_provider().history(ticker, **kwargs)
+
+def _download_many(tickers: list, **kwargs) -> dict:
+    """
+    Grouped download for several tickers in one request.
+    Returns {ticker: DataFrame}, dropping the dates a ticker did not trade.
+    """
+    return get_provider().history_many(tickers, **kwargs)
+
+def _overlap_start(cached: pd.DataFrame) -> pd.Timestamp:
+    return cached.index[max(len(cached) - OVERLAP_BARS, 0)]
+
+def _apply_delta(ticker: str, cached: pd.DataFrame, fresh: pd.DataFrame):
+    """
+    Appends the bars of `fresh` (downloaded from the overlap start) to `cached`.
+
+    A few bars before the last one are re-fetched and compared against the cache;
+    if they differ (split or dividend adjustment upstream) the cached history is
+    stale as a whole and None is returned so the caller re-downloads everything.
+    The last cached bar itself is always replaced, since it may have been an
+    intraday snapshot.
+    """
+    if fresh.empty:
+        return cached
+
+    last_bar = cached.index[-1]
+    overlap = cached.index[(cached.index >= _overlap_start(cached)) & (cached.index < last_bar)]
+    overlap = overlap.intersection(fresh.index)
+    if len(overlap) and not np.allclose(cached.loc[overlap, "Close"], fresh.loc[overlap, "Close"],
+                                        rtol=RESTATEMENT_RTOL, equal_nan=True):
+        print(f"History for {ticker} was restated upstream (split/dividend). Full refresh required.")
+        return None
+
+    new_bars = fresh[fresh.index >= last_bar][cached.columns.intersection(fresh.columns)]
+    return pd.concat([cached[cached.index < last_bar], new_bars])
+
+def _fetch_delta(ticker: str, cached: pd.DataFrame):
+    """Downloads only the bars missing since the last cached bar and appends them."""
+    fresh = _download(ticker, start=_overlap_start(cached).strftime("%Y-%m-%d"))
+    return _apply_delta(ticker, cached, fresh)
+
+def _freeze(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Copy of `data` backed by read-only arrays. Frames shared through the
+    memory cache (copy=False callers) then raise on in-place writes instead of
+    silently changing the history every other caller sees, with or without
+    pandas copy-on-write.
+    """
+    arrays = {}
+    for col in data.columns:
+        values = data[col].to_numpy(copy=True)
+        values.flags.writeable = False
+        arrays[col] = values
+    return pd.DataFrame(arrays, index=data.index.copy(), columns=data.columns, copy=False)
+
+def _remember(save_dir, ticker: str, data: pd.DataFrame, history_period: str, today: str) -> pd.DataFrame:
+    """Caches a read-only copy of `data` and returns it."""
+    data = _freeze(data)
+    _memory_cache.set((save_dir, ticker), (data, history_period, today))
+    return data
+
+def get_indicator_state(ticker: str, save_dir: str = "data/raw"):
+    """
+    Returns the incremental IndicatorState (RSI, SMAs, drawdown,
+    volatility) for the stored history, or None if the ticker was never
+    fetched. Built lazily: the saved state is brought up to date with only the
+    bars added since the last call, and rebuilt when the history no longer
+    matches it (restatement, or the state's last bar was dropped).
+    """
+    store = PriceStore(save_dir)
+    data = store.load(ticker)
+    if data is None or data.empty:
+        return None
+
+    path = store.state_path_for(ticker)
+    state = IndicatorState.load(path)
+    if state is not None and state.last_timestamp is not None:
+        last = state.last_timestamp
+        if last not in data.index or not np.isclose(data.at[last, "Close"], state.last_close, rtol=RESTATEMENT_RTOL):
+            state = None
+    if state is None:
+        state = IndicatorState()
+    state.sync(data).save(path)
+    return state
+
+def _read_cache(store, ticker: str, period: str, today: str):
+    """
+    Looks up a ticker in the in-memory cache, then in the store.
+
+    Returns:
+        tuple: (cached DataFrame or None, period of the stored history, fetched today?)
+    """
+    entry = _memory_cache.get((store.store_dir if store else None, ticker))
+    if entry is not None:
+        data, stored_period, fetched = entry
+        if fetched == today and _covers(stored_period, period):
+            return data, stored_period, True
+
+    if not store:
+        return None, period, False
+    meta = store.read_meta(ticker)
+    stored_period = meta.get("period")
+    if not stored_period or not _covers(stored_period, period):
+        return None, period, False
+    cached = store.load(ticker)
+    if cached is None:
+        return None, period, False
+    if meta.get("fetched") == today:
+        cached = _remember(store.store_dir, ticker, cached, stored_period, today)
+        return cached, stored_period, True
+    return cached, stored_period, False
+
+def get_market_data(ticker: str, period: str = "2y", save_dir: str = "data/raw", copy: bool = True) -> pd.DataFrame:
     """
-    Fetches OHLCV data for a given ticker from yfinance.
-    Implements persistence: Checks for local CSV first before downloading.
-    
+    Fetches OHLCV data for a given ticker from the market data provider (yfinance).
+    Implements persistence: Checks the local columnar store (one .npz per ticker)
+    before downloading. A stale cached history is brought up to date by fetching
+    only the bars since its last date (incremental delta fetch).
+
+    The store keeps the longest period requested for each ticker; shorter
+    periods are served by slicing it, so a ticker is downloaded once per day
+    whether callers ask for 6mo, 1y, 2y or 5y. Fresh histories are also kept
+    in a process-wide memory cache, so repeated calls skip the disk too.
+    Concurrent calls for the same ticker share one fetch; a caller that joined
+    a fetch of a shorter period fetches again for its own.
+    By default callers receive their own copy and may modify it; read-only
+    callers (e.g. QuantEngine) can pass copy=False to share the cached frame.
+
     Args:
         ticker (str): The stock ticker symbol.
         period (str): The data period to download (default: "2y").
-        save_dir (str): Directory to save raw CSVs.
-        
+        save_dir (str): Directory of the price store (None disables persistence).
+        copy (bool): Return a private copy (default). False returns a view of the
+            cached history, backed by read-only arrays (in-place writes raise).
+
     Returns:
         pd.DataFrame: DataFrame containing OHLCV data.
     """
-    if save_dir:
-        os.makedirs(save_dir, exist_ok=True)
-        today = datetime.now().strftime("%Y-%m-%d")
-        file_path = os.path.join(save_dir, f"{ticker}_{period}_{today}.csv")
-        
-        # 1. Check if we already downloaded it today
-        if os.path.exists(file_path):
-            print(f"Loading data from local cache: {file_path}")
-            try:
-                data = pd.read_csv(file_path, index_col=0, parse_dates=True)
-                # If MultiIndex (Attribute, Ticker), drop the Ticker level
-                if isinstance(data.columns, pd.MultiIndex): 
-                     data.columns = data.columns.get_level_values(0)
-                return data
-            except Exception as e:
-                print(f"Cache read error: {e}")
-
-    # 2. Download from Yahoo Finance
-    print(f"Downloading data for {ticker} from yfinance...")
+    key = (save_dir, ticker)
+    (history, history_period), shared = _flights.do(key, _get_market_data, ticker, period, save_dir)
+    if shared and not history.empty and not _covers(history_period, period):
+        # Joined a fetch for a shorter period: the widest one is fetched now
+        (history, history_period), _ = _flights.do(key, _get_market_data, ticker, period, save_dir)
+    data = _slice_period(history, period)
+    return data.copy() if copy else data
+
+def _save_history(store, ticker: str, data: pd.DataFrame, history_period: str, today: str):
+    """
+    Saves `data` unless the store already holds a longer history (saved by a
+    concurrent fetch of a wider period), which would otherwise be truncated.
+    Returns the path, or None when skipped.
+    """
+    stored_period = store.read_meta(ticker).get("period")
+    if stored_period and not _covers(history_period, stored_period):
+        return None
+    return store.save(ticker, data, period=history_period, fetched=today)
+
+def _get_market_data(ticker: str, period: str, save_dir: str):
+    """Returns (history, its period): the stored history, widened to `period` if needed."""
+    store = PriceStore(save_dir) if save_dir else None
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    # 1. Check if we already downloaded it today
+    cached, history_period, is_fresh = _read_cache(store, ticker, period, today)
+    if is_fresh:
+        return cached, history_period
+
     try:
-        data = yf.download(ticker, period=period, progress=False)
-        
+        data = None
+
+        # 2. Incremental update: append only the new bars to the cached history
+        if cached is not None and not cached.empty:
+            print(f"Updating {ticker} from {cached.index[-1].date()} (delta fetch)...")
+            data = _fetch_delta(ticker, cached)
+            if data is not None:
+                data = _slice_period(data, history_period)
+
+        # 3. Full download from Yahoo Finance
+        if data is None:
+            print(f"Downloading data for {ticker} from yfinance...")
+            data = _download(ticker, period=history_period)
+
         if data.empty:
             raise ValueError(f"No data found for ticker: {ticker}")
 
-        # Flatten columns if MultiIndex (Attribute, Ticker)
-        if isinstance(data.columns, pd.MultiIndex):
-            data.columns = data.columns.get_level_values(0)
+        # 4. Save to the store (only if save_dir is provided)
+        if store:
+            path = _save_history(store, ticker, data, history_period, today)
+            if path:
+                print(f"Data saved to {path}")
+        data = _remember(save_dir, ticker, data, history_period, today)
+
+        return data, history_period
 
-        # 3. Save to CSV (only if save_dir is provided)
-        if save_dir:
-            data.to_csv(file_path)
-            print(f"Data saved to {file_path}")
-        
-        return data
-        
     except Exception as e:
         print(f"Error fetching data for {ticker}: {e}")
+        if cached is not None:
+            # Stale history beats no history
+            return _freeze(cached), history_period
+        return pd.DataFrame(), period
+
+def get_market_data_many(tickers: list, period: str = "2y", save_dir: str = "data/raw",
+                         copy: bool = True) -> dict:
+    """
+    Batched version of get_market_data for a list of tickers.
+
+    Tickers already fresh in the store are served locally; stale ones are
+    brought up to date with a single grouped delta request, and the rest are
+    downloaded with one grouped request per history period. Every result is
+    written back to the per-ticker store.
+
+    Args:
+        tickers (list): Ticker symbols.
+        period (str): The data period to return (default: "2y").
+        save_dir (str): Directory of the price store (None disables persistence).
+        copy (bool): Return private copies (default). False returns read-only views.
+
+    Returns:
+        dict: {ticker: OHLCV DataFrame} in input order (empty frame if unavailable).
+    """
+    tickers = list(dict.fromkeys(tickers))
+    store = PriceStore(save_dir) if save_dir else None
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    results = {}
+    stale = {}      # ticker -> (cached history, stored period)
+    missing = {}    # ticker -> period to download
+
+    # 1. Serve what the store already has for today
+    for ticker in tickers:
+        cached, history_period, is_fresh = _read_cache(store, ticker, period, today)
+        if is_fresh:
+            results[ticker] = _slice_period(cached, period)
+        elif cached is not None and not cached.empty:
+            stale[ticker] = (cached, history_period)
+        else:
+            missing[ticker] = history_period
+
+    updated = {}
+
+    # 2. One grouped delta request for every stale history
+    if stale:
+        start = min(_overlap_start(cached) for cached, _ in stale.values())
+        print(f"Updating {len(stale)} tickers from {start.date()} (grouped delta fetch)...")
+        try:
+            fresh = _download_many(list(stale), start=start.strftime("%Y-%m-%d"))
+        except Exception as e:
+            print(f"Grouped delta fetch failed: {e}")
+            fresh = None
+
+        for ticker, (cached, history_period) in stale.items():
+            data = None
+            if fresh is not None:
+                data = _apply_delta(ticker, cached, fresh.get(ticker, pd.DataFrame()))
+            if data is None:
+                missing[ticker] = history_period
+            else:
+                updated[ticker] = (_slice_period(data, history_period), history_period)
+
+    # 3. One grouped full download per history period
+    by_period = {}
+    for ticker, history_period in missing.items():
+        by_period.setdefault(history_period, []).append(ticker)
+
+    for history_period, group in by_period.items():
+        print(f"Downloading {len(group)} tickers ({history_period}) from yfinance...")
+        try:
+            frames = _download_many(group, period=history_period)
+        except Exception as e:
+            print(f"Grouped download failed: {e}")
+            frames = {}
+        for ticker in group:
+            data = frames.get(ticker, pd.DataFrame())
+            if not data.empty:
+                updated[ticker] = (data, history_period)
+            elif ticker in stale:
+                # Stale history beats no history
+                results[ticker] = _slice_period(_freeze(stale[ticker][0]), period)
+            else:
+                print(f"No data found for ticker: {ticker}")
+
+    # 4. Fan results back into the per-ticker store
+    for ticker, (data, history_period) in updated.items():
+        if store:
+            _save_history(store, ticker, data, history_period, today)
+        data = _remember(save_dir, ticker, data, history_period, today)
+        results[ticker] = _slice_period(data, period)
+
+    frames = {ticker: results.get(ticker, pd.DataFrame()) for ticker in tickers}
+    return {ticker: df.copy() for ticker, df in frames.items()} if copy else frames
+
+def get_price_panel(tickers: list, period: str = "2y", field: str = "Close",
+                    save_dir: str = "data/raw") -> pd.DataFrame:
+    """
+    Returns a wide (dates x tickers) panel of one OHLCV field, aligned on the
+    union of trading dates. Tickers without data are left out.
+    """
+    frames = get_market_data_many(tickers, period=period, save_dir=save_dir, copy=False)
+    columns = {t: df[field] for t, df in frames.items() if not df.empty and field in df.columns}
+    if not columns:
         return pd.DataFrame()
+    return pd.concat(columns, axis=1).sort_index()
+
+def get_compact_panel(tickers: list, period: str = "2y", save_dir: str = "data/raw"):
+    """
+    Returns the tickers' OHLCV as a read-only CompactPanel (float32 prices,
+    uint32 volume, int32 day index) for universe-scale scans.
+    """
+    from utils.compact_panel import CompactPanel
+    return CompactPanel.from_frames(get_market_data_many(tickers, period=period, save_dir=save_dir, copy=False))
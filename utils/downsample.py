@@ -0,0 +1,80 @@
+"""
+Server-side decimation for interactive charts.
+
+A chart a few hundred pixels wide cannot show more points than it has
+pixels, so long histories are reduced before they are sent to the browser:
+lines keep their visual shape with Largest-Triangle-Three-Buckets (LTTB),
+candles are merged into OHLC buckets.
+"""
+import numpy as np
+import pandas as pd
+
+# Roughly the plot width in pixels of the dashboard chart
+MAX_CHART_POINTS = 600
+
+def lttb(y, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets. Returns the sorted positions of the
+    `threshold` points of `y` that best preserve the line's shape (first and
+    last points always kept). NaN points are skipped.
+    """
+    y = np.asarray(y, dtype="float64")
+    valid = np.flatnonzero(~np.isnan(y))
+    n = len(valid)
+    if threshold >= n or threshold < 3:
+        return valid
+
+    x = valid.astype("float64")
+    values = y[valid]
+    # Bucket edges for the n - 2 interior points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = values[next_start:next_end].mean()
+
+        area = np.abs((x[a] - avg_x) * (values[start:end] - values[a])
+                      - (x[a] - x[start:end]) * (avg_y - values[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return valid[selected]
+
+def ohlc_buckets(data: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """
+    Merges consecutive bars into at most `max_points` buckets: first Open,
+    highest High, lowest Low, last Close, summed Volume, stamped with the
+    bucket's first date.
+    """
+    n = len(data)
+    if n <= max_points:
+        return data
+    starts = np.unique(np.linspace(0, n, max_points, endpoint=False).astype(int))
+    ends = np.append(starts[1:], n) - 1
+
+    result = {}
+    if 'Open' in data.columns:
+        result['Open'] = data['Open'].to_numpy()[starts]
+    if 'High' in data.columns:
+        result['High'] = np.fmax.reduceat(data['High'].to_numpy(dtype="float64"), starts)
+    if 'Low' in data.columns:
+        result['Low'] = np.fmin.reduceat(data['Low'].to_numpy(dtype="float64"), starts)
+    if 'Close' in data.columns:
+        result['Close'] = data['Close'].to_numpy()[ends]
+    if 'Volume' in data.columns:
+        result['Volume'] = np.add.reduceat(np.nan_to_num(data['Volume'].to_numpy(dtype="float64")), starts)
+    return pd.DataFrame(result, index=data.index[starts])
+
+def decimate_line(series: pd.Series, max_points: int) -> pd.Series:
+    """LTTB-reduced copy of a line series (NaN points dropped)."""
+    return series.iloc[lttb(series.to_numpy(dtype="float64"), max_points)]
+
+def volume_colors(data: pd.DataFrame, up="green", down="red") -> np.ndarray:
+    """Per-bar volume colors, computed without iterating rows."""
+    return np.where(data['Close'].to_numpy() >= data['Open'].to_numpy(), up, down)
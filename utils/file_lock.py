@@ -0,0 +1,39 @@
+import contextlib
+import os
+
+# Lock files never change (their mtime is frozen), so age-based retention
+# must skip them: deleting a held lock lets the next process lock a new file
+LOCK_SUFFIX = ".lock"
+
+def lock_path_for(directory: str, name: str) -> str:
+    return os.path.join(directory, f"{name}{LOCK_SUFFIX}")
+
+def is_lock_file(path: str) -> bool:
+    return path.endswith(LOCK_SUFFIX)
+
+@contextlib.contextmanager
+def file_lock(path):
+    """Exclusive lock on `path` shared with other processes (app, bot, scheduler)."""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    # Retries for ~10s before raising: keep waiting
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
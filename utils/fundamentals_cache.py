@@ -0,0 +1,112 @@
+import json
+import os
+import re
+import threading
+import time
+import pandas as pd
+from utils.providers import statement_to_dict, statement_from_dict
+
+# Company info (market cap, sector...) moves with the price: short TTL
+INFO_TTL = 6 * 3600
+# Statements only change when the company files. A new statement is expected
+# one reporting interval after the latest one plus the filing lag; until then
+# the cached copy is kept (re-checked at most every MAX_STATEMENT_AGE for
+# restatements). Once a filing is due, re-check daily until it shows up.
+FILING_LAG_DAYS = 90
+DEFAULT_INTERVAL_DAYS = 365
+MAX_STATEMENT_AGE = 90 * 86400
+RECHECK_DUE_FILING = 86400
+
+def has_info(info) -> bool:
+    """
+    True if `info` carries real company data. yfinance can answer with a
+    placeholder like {"marketCap": None} (the provider adds the fast_info
+    market cap), which must not be cached as a valid answer.
+    """
+    return isinstance(info, dict) and any(v is not None for k, v in info.items() if k != "marketCap")
+
+class FundamentalsCache:
+    """
+    Disk-backed cache of fundamentals, one JSON file per ticker:
+        {"info": {...}, "info_fetched": epoch,
+         "balance_sheet": {date: {item: value}}, "cashflow": {...}, "statements_fetched": epoch}
+
+    Reads return None when an entry is missing or expired; stale() returns
+    whatever is stored regardless of age, as a fallback when upstream fails.
+    """
+    def __init__(self, cache_dir="data/fundamentals"):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def path_for(self, ticker: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9._^=-]", "_", ticker)
+        return os.path.join(self.cache_dir, f"{safe}.json")
+
+    def _load(self, ticker) -> dict:
+        path = self.path_for(ticker)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Fundamentals cache read error ({path}): {e}")
+            return {}
+
+    def _update(self, ticker, **fields):
+        with self._lock:
+            entry = self._load(ticker)
+            entry.update(fields)
+            path = self.path_for(ticker)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, default=str)
+            os.replace(tmp_path, path)
+
+    @staticmethod
+    def statements_expire_at(entry: dict) -> float:
+        """Epoch after which cached statements should be re-fetched."""
+        fetched = entry.get("statements_fetched", 0)
+        dates = sorted(pd.Timestamp(d) for d in {**entry.get("balance_sheet", {}), **entry.get("cashflow", {})})
+        if not dates:
+            return fetched + RECHECK_DUE_FILING
+
+        interval = DEFAULT_INTERVAL_DAYS
+        if len(dates) > 1:
+            interval = int(pd.Series(dates).diff().dt.days.dropna().median())
+        filing_due = (dates[-1] + pd.Timedelta(days=interval + FILING_LAG_DAYS)).timestamp()
+        if fetched < filing_due:
+            return min(filing_due, fetched + MAX_STATEMENT_AGE)
+        return fetched + RECHECK_DUE_FILING
+
+    def get_info(self, ticker: str, now=None):
+        entry = self._load(ticker)
+        now = time.time() if now is None else now
+        if has_info(entry.get("info")) and now - entry.get("info_fetched", 0) < INFO_TTL:
+            return entry["info"]
+        return None
+
+    def get_statements(self, ticker: str, now=None):
+        """Returns (balance_sheet, cashflow) frames, or None if missing/expired."""
+        entry = self._load(ticker)
+        now = time.time() if now is None else now
+        if "statements_fetched" not in entry or now >= self.statements_expire_at(entry):
+            return None
+        return statement_from_dict(entry.get("balance_sheet")), statement_from_dict(entry.get("cashflow"))
+
+    def put_info(self, ticker: str, info: dict):
+        if not has_info(info):
+            return
+        self._update(ticker, info=info, info_fetched=time.time())
+
+    def put_statements(self, ticker: str, balance_sheet: pd.DataFrame, cashflow: pd.DataFrame):
+        self._update(ticker, balance_sheet=statement_to_dict(balance_sheet),
+                     cashflow=statement_to_dict(cashflow), statements_fetched=time.time())
+
+    def stale(self, ticker: str):
+        """Returns (info, balance_sheet, cashflow) as stored, ignoring TTLs."""
+        entry = self._load(ticker)
+        info = entry.get("info")
+        return (info if has_info(info) else {}, statement_from_dict(entry.get("balance_sheet")),
+                statement_from_dict(entry.get("cashflow")))
@@ -0,0 +1,227 @@
+"""
+Vectorized indicator primitives.
+
+Every function accepts a Series (one ticker) or a wide DataFrame of prices
+(dates x tickers) and computes all columns in a single pass, so the same
+code serves QuantEngine, the briefing and universe-wide batch scans.
+"""
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+def log_returns(close):
+    return np.log(close / close.shift(1))
+
+def sma(close, window):
+    return close.rolling(window=window).mean()
+
+def rsi(close, period=14):
+    """RSI with simple moving averages of gains and losses."""
+    return _rsi_from_delta(close.diff(), period)
+
+def wilder_smoothed_rsi(close, period=14):
+    """
+    Wilder's original RSI: the first average gain/loss is the simple mean of
+    the first `period` changes, later ones are smoothed as
+    (prev * (period - 1) + x) / period.
+
+    Not interchangeable with rsi(): every "RSI (14)" the app reports
+    (QuantEngine, batch_metrics, RSI_14, timeframes, IndicatorState) uses the
+    simple-window rsi(), and the two differ on the same bars.
+    """
+    delta = close.diff()
+    averages = []
+    for moves in (delta.where(delta > 0, 0), -delta.where(delta < 0, 0)):
+        seeded = moves.copy()
+        seeded.iloc[:period + 1] = np.nan
+        if len(moves) > period:
+            seeded.iloc[period] = moves.iloc[1:period + 1].mean()
+        # adjust=False starts from the seed and applies Wilder's recursion
+        averages.append(seeded.ewm(alpha=1 / period, adjust=False).mean())
+    gain, loss = averages
+    return 100 - (100 / (1 + gain / loss))
+
+def _rsi_from_delta(delta, period):
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+def max_drawdown(returns):
+    """Worst peak-to-trough decline of the cumulative return path."""
+    cumulative = (1 + returns).cumprod()
+    peak = cumulative.cummax()
+    return ((cumulative / peak) - 1).min()
+
+def align_right(panel: pd.DataFrame) -> pd.DataFrame:
+    """
+    Packs each column's valid values at the bottom of the frame (NaN padding on
+    top), preserving order. Tickers from different markets (e.g. NYSE and BYMA)
+    have gaps on each other's holidays in a date-aligned panel; once packed,
+    rolling windows, diffs and shifts see exactly the bars of each ticker, as
+    they would on its own series. The date index is dropped.
+    """
+    values = panel.to_numpy(dtype="float64")
+    order = np.argsort(~np.isnan(values), axis=0, kind="stable")
+    return pd.DataFrame(np.take_along_axis(values, order, axis=0), columns=panel.columns)
+
+def batch_metrics(close: pd.DataFrame, risk_free_rate=0.04) -> pd.DataFrame:
+    """
+    Computes the QuantEngine metric set for every column of a (dates x tickers)
+    close-price panel at once.
+
+    Returns:
+        pd.DataFrame: One row per ticker with the same keys as QuantEngine.analyze().
+    """
+    close = align_right(close)
+    returns = log_returns(close)
+    volatility = returns.std()
+    excess = returns - risk_free_rate / TRADING_DAYS
+
+    last_price = close.iloc[-1]
+    last_rsi = rsi(close).iloc[-1]
+
+    returns_arr = returns.to_numpy()
+    all_nan = np.isnan(returns_arr).all(axis=0)
+    var_95 = np.full(returns_arr.shape[1], np.nan)
+    if (~all_nan).any():
+        var_95[~all_nan] = np.nanpercentile(returns_arr[:, ~all_nan], 5, axis=0)
+
+    return pd.DataFrame({
+        "Last Price": last_price,
+        "RSI (14)": last_rsi,
+        "SMA 10": sma(close, 10).iloc[-1],
+        "SMA 20": sma(close, 20).iloc[-1],
+        "Annualized Volatility": volatility * np.sqrt(TRADING_DAYS),
+        "Max Drawdown": max_drawdown(returns),
+        "Sharpe Ratio": (excess.mean() / volatility) * np.sqrt(TRADING_DAYS),
+        "VaR (95%)": pd.Series(var_95, index=close.columns),
+    })
+
+# --- Indicator registry ---
+# Each node declares the nodes it is computed from. Raw OHLCV columns are the
+# leaves. compute() resolves only what the requested names need, computing
+# every shared intermediate (e.g. Delta for RSI and OBV, SMA_20 for
+# Bollinger) once.
+
+INDICATORS = {}
+
+def indicator(name, deps):
+    """Registers fn(*dependency values) as the node `name`."""
+    def register(fn):
+        INDICATORS[name] = (tuple(deps), fn)
+        return fn
+    return register
+
+@indicator("Log Returns", ["Close"])
+def _log_returns(close):
+    return log_returns(close)
+
+@indicator("Delta", ["Close"])
+def _delta(close):
+    return close.diff()
+
+@indicator("Prev Close", ["Close"])
+def _prev_close(close):
+    return close.shift(1)
+
+@indicator("RSI_14", ["Delta"])
+def _rsi_14(delta):
+    return _rsi_from_delta(delta, 14)
+
+@indicator("SMA_10", ["Close"])
+def _sma_10(close):
+    return sma(close, 10)
+
+@indicator("SMA_20", ["Close"])
+def _sma_20(close):
+    return sma(close, 20)
+
+@indicator("STD_20", ["Close"])
+def _std_20(close):
+    return close.rolling(window=20).std()
+
+@indicator("BB_Upper", ["SMA_20", "STD_20"])
+def _bb_upper(mid, std):
+    return mid + 2 * std
+
+@indicator("BB_Lower", ["SMA_20", "STD_20"])
+def _bb_lower(mid, std):
+    return mid - 2 * std
+
+@indicator("EMA_12", ["Close"])
+def _ema_12(close):
+    return close.ewm(span=12, adjust=False).mean()
+
+@indicator("EMA_26", ["Close"])
+def _ema_26(close):
+    return close.ewm(span=26, adjust=False).mean()
+
+@indicator("MACD", ["EMA_12", "EMA_26"])
+def _macd(fast, slow):
+    return fast - slow
+
+@indicator("MACD_Signal", ["MACD"])
+def _macd_signal(macd):
+    return macd.ewm(span=9, adjust=False).mean()
+
+@indicator("MACD_Hist", ["MACD", "MACD_Signal"])
+def _macd_hist(macd, signal):
+    return macd - signal
+
+@indicator("True Range", ["High", "Low", "Prev Close"])
+def _true_range(high, low, prev_close):
+    ranges = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1)
+    return ranges.max(axis=1)
+
+@indicator("ATR_14", ["True Range"])
+def _atr_14(true_range):
+    # Wilder smoothing
+    return true_range.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+
+@indicator("OBV", ["Delta", "Volume"])
+def _obv(delta, volume):
+    return (np.sign(delta).fillna(0) * volume).cumsum()
+
+@indicator("Lowest Low_14", ["Low"])
+def _lowest_low_14(low):
+    return low.rolling(window=14).min()
+
+@indicator("Highest High_14", ["High"])
+def _highest_high_14(high):
+    return high.rolling(window=14).max()
+
+@indicator("Stoch_K", ["Close", "Lowest Low_14", "Highest High_14"])
+def _stoch_k(close, lowest, highest):
+    return 100 * (close - lowest) / (highest - lowest)
+
+@indicator("Stoch_D", ["Stoch_K"])
+def _stoch_d(k):
+    return k.rolling(window=3).mean()
+
+def compute(data: pd.DataFrame, names) -> pd.DataFrame:
+    """
+    Computes the requested indicators (and only their dependencies) for one
+    OHLCV frame.
+
+    Returns:
+        pd.DataFrame: One column per requested name, on the index of `data`.
+    """
+    values = {}
+
+    def resolve(name, path=()):
+        if name in values:
+            return values[name]
+        if name in INDICATORS:
+            if name in path:
+                raise ValueError(f"Indicator dependency cycle: {' -> '.join(path + (name,))}")
+            deps, fn = INDICATORS[name]
+            values[name] = fn(*(resolve(dep, path + (name,)) for dep in deps))
+        elif name in data.columns:
+            values[name] = data[name]
+        else:
+            raise KeyError(f"Unknown indicator or missing column: {name}")
+        return values[name]
+
+    return pd.DataFrame({name: resolve(name) for name in names}, index=data.index)
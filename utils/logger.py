@@ -5,7 +5,9 @@ import sys
 def setup_logger(name="ARES", log_dir="logs"):
     """
     Sets up a consolidated logger that writes to a file and the console.
+    ARES_LOG_DIR, when set, overrides `log_dir` (tests point it at a temp dir).
     """
+    log_dir = os.environ.get("ARES_LOG_DIR", log_dir)
     os.makedirs(log_dir, exist_ok=True)
     
     logger = logging.getLogger(name)
@@ -0,0 +1,214 @@
+import datetime
+import json
+import os
+import re
+import threading
+import pandas as pd
+from utils.file_lock import file_lock, lock_path_for
+from utils.sentiment_store import get_sentiment_store, headline_key
+
+# Daily aggregates and seen article ids older than this are dropped
+HISTORY_DAYS = 730
+# Latest articles kept per ticker for display
+RECENT_ARTICLES = 20
+# Windows (days) compared by trend(); the gap between them is the momentum
+SHORT_WINDOW = 7
+LONG_WINDOW = 30
+# Momentum beyond ±TREND_THRESHOLD counts as improving / deteriorating
+TREND_THRESHOLD = 0.05
+
+def _content(item: dict) -> dict:
+    # yfinance nests articles under "content"; older versions are flat
+    return item.get("content") if isinstance(item.get("content"), dict) else item
+
+def article_title(item: dict):
+    return _content(item).get("title") or item.get("title")
+
+def article_id(item: dict) -> str:
+    """Stable article identity: provider id, then URL, then the headline hash."""
+    content = _content(item)
+    for key in ("id", "uuid"):
+        if content.get(key) or item.get(key):
+            return str(content.get(key) or item.get(key))
+    for key in ("canonicalUrl", "clickThroughUrl"):
+        url = content.get(key)
+        if isinstance(url, dict) and url.get("url"):
+            return url["url"]
+    if content.get("link") or item.get("link"):
+        return content.get("link") or item.get("link")
+    return headline_key(article_title(item) or "")
+
+def article_date(item: dict, now: datetime.datetime) -> str:
+    """UTC publication day (YYYY-MM-DD); the ingestion day when unknown."""
+    content = _content(item)
+    try:
+        if content.get("pubDate"):
+            published = pd.Timestamp(content["pubDate"])
+            if published.tzinfo:
+                published = published.tz_convert("UTC")
+            return published.strftime("%Y-%m-%d")
+        publish_time = content.get("providerPublishTime") or item.get("providerPublishTime")
+        if publish_time:
+            return datetime.datetime.fromtimestamp(publish_time, datetime.timezone.utc).strftime("%Y-%m-%d")
+    except Exception:
+        pass
+    return now.strftime("%Y-%m-%d")
+
+class NewsStore:
+    """
+    Incremental per-ticker news sentiment, one JSON file per ticker:
+        {"seen": {article_id: day},
+         "daily": {day: {"articles": n, "polarity_sum": s, "bullish": b, "bearish": k}},
+         "recent": [{"id", "title", "date", "polarity"}, ...]}
+
+    ingest() adds only articles not seen before (by id/URL), scores their
+    headlines in one batch through the shared SentimentStore and folds them
+    into the daily aggregates. Series, trend and momentum are read from the
+    aggregates, so months of history are never re-scored.
+
+    The read-merge-write of ingest() holds a lock file in `store_dir`, so
+    processes sharing the directory (dashboard, Telegram bot) never drop
+    each other's articles. Use get_news_store() for the process-wide instance.
+    """
+    def __init__(self, store_dir="data/news", sentiment_store=None):
+        self.store_dir = store_dir
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.sentiment_store = sentiment_store or get_sentiment_store()
+        self._lock = threading.Lock()
+        self.lock_path = lock_path_for(self.store_dir, "news")
+
+    def path_for(self, ticker: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9._^=-]", "_", ticker)
+        return os.path.join(self.store_dir, f"{safe}.json")
+
+    def _load(self, ticker) -> dict:
+        path = self.path_for(ticker)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"News store read error ({path}): {e}")
+            return {}
+
+    def _save(self, ticker, entry):
+        path = self.path_for(ticker)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def ingest(self, ticker: str, news: list, now=None) -> int:
+        """Adds unseen articles to the ticker's series. Returns how many were new."""
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        seen = self._load(ticker).get("seen", {})
+        articles = {}
+        for item in news or []:
+            title = article_title(item)
+            key = article_id(item)
+            if title and key not in seen and key not in articles:
+                articles[key] = (title, article_date(item, now))
+        if not articles:
+            return 0
+
+        # Scored outside the lock; memoized, so re-scoring after a race is free
+        polarities = self.sentiment_store.score([title for title, _ in articles.values()])
+
+        with self._lock, file_lock(self.lock_path):
+            entry = self._load(ticker)
+            seen, daily = entry.setdefault("seen", {}), entry.setdefault("daily", {})
+            recent = entry.setdefault("recent", [])
+            added = 0
+            for (key, (title, day)), polarity in zip(articles.items(), polarities):
+                if key in seen:
+                    continue
+                seen[key] = day
+                agg = daily.setdefault(day, {"articles": 0, "polarity_sum": 0.0, "bullish": 0, "bearish": 0})
+                agg["articles"] += 1
+                agg["polarity_sum"] += polarity
+                agg["bullish"] += polarity > 0.05
+                agg["bearish"] += polarity < -0.05
+                recent.append({"id": key, "title": title, "date": day, "polarity": polarity})
+                added += 1
+
+            cutoff = (now - datetime.timedelta(days=HISTORY_DAYS)).strftime("%Y-%m-%d")
+            entry["seen"] = {k: d for k, d in seen.items() if d >= cutoff}
+            entry["daily"] = {d: agg for d, agg in daily.items() if d >= cutoff}
+            entry["recent"] = sorted(recent, key=lambda a: a["date"])[-RECENT_ARTICLES:]
+            self._save(ticker, entry)
+        return added
+
+    def daily_series(self, ticker: str, start=None, end=None) -> pd.DataFrame:
+        """
+        Daily aggregates between `start` and `end` (inclusive, any date-like).
+
+        Returns:
+            pd.DataFrame: Index Date; columns Articles, Polarity (mean), Bullish, Bearish.
+        """
+        daily = self._load(ticker).get("daily", {})
+        columns = ["Articles", "Polarity", "Bullish", "Bearish"]
+        if not daily:
+            return pd.DataFrame(columns=columns, index=pd.DatetimeIndex([], name="Date"))
+        frame = pd.DataFrame.from_dict(daily, orient="index")
+        frame.index = pd.DatetimeIndex(frame.index, name="Date")
+        frame = frame.sort_index()
+        if start is not None:
+            frame = frame[frame.index >= pd.Timestamp(start)]
+        if end is not None:
+            frame = frame[frame.index <= pd.Timestamp(end)]
+        return pd.DataFrame({
+            "Articles": frame["articles"],
+            "Polarity": frame["polarity_sum"] / frame["articles"],
+            "Bullish": frame["bullish"],
+            "Bearish": frame["bearish"],
+        }, index=frame.index)
+
+    def trend(self, ticker: str, now=None, short_window=SHORT_WINDOW, long_window=LONG_WINDOW) -> dict:
+        """
+        Article-weighted mean polarity over the last `short_window` and
+        `long_window` days; Momentum is short minus long.
+
+        Returns:
+            dict: {"Polarity 7d", "Polarity 30d", "Momentum", "Trend", "Articles 30d"}
+                  (window labels follow the arguments)
+        """
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        today = pd.Timestamp(now.strftime("%Y-%m-%d"))
+        series = self.daily_series(ticker, start=today - pd.Timedelta(days=long_window - 1), end=today)
+
+        def weighted(days):
+            window = series[series.index > today - pd.Timedelta(days=days)]
+            articles = window["Articles"].sum()
+            return (window["Polarity"] * window["Articles"]).sum() / articles if articles else None
+
+        short, long = weighted(short_window), weighted(long_window)
+        momentum = short - long if short is not None and long is not None else 0.0
+        if momentum > TREND_THRESHOLD:
+            direction = "Improving"
+        elif momentum < -TREND_THRESHOLD:
+            direction = "Deteriorating"
+        else:
+            direction = "Stable"
+        return {
+            f"Polarity {short_window}d": round(short, 3) if short is not None else None,
+            f"Polarity {long_window}d": round(long, 3) if long is not None else None,
+            "Momentum": round(momentum, 3),
+            "Trend": direction,
+            f"Articles {long_window}d": int(series["Articles"].sum()) if not series.empty else 0,
+        }
+
+    def recent(self, ticker: str, limit: int = RECENT_ARTICLES) -> list:
+        """Latest ingested articles (newest last): {"id", "title", "date", "polarity"}."""
+        return self._load(ticker).get("recent", [])[-limit:]
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_news_store(store_dir: str = "data/news") -> NewsStore:
+    """Returns the process-wide news store of `store_dir` (scored by the configured backend)."""
+    key = os.path.abspath(store_dir)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = NewsStore(store_dir)
+        return _stores[key]
@@ -3,6 +3,7 @@ import json
 import os
 from utils.logger import setup_logger
 from utils.config_loader import load_config
+from utils.rate_limiter import get_limiter
 
 logger = setup_logger("NOTIFIER")
 
@@ -29,6 +30,7 @@ class Notifier:
             
         url = f"https://api.telegram.org/bot{token}/sendMessage"
         
+        limiter = get_limiter("telegram")
         success_count = 0
         for chat_id in chat_ids:
             payload = {
@@ -38,7 +40,14 @@ class Notifier:
             }
             
             try:
+                limiter.acquire()
                 response = requests.post(url, json=payload, timeout=10)
+                if response.status_code == 429:
+                    # Telegram tells us how long to back off; pause every sender, then retry once
+                    retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+                    limiter.on_throttle(retry_after)
+                    limiter.acquire()
+                    response = requests.post(url, json=payload, timeout=10)
                 if response.status_code == 200:
                     success_count += 1
                 else:
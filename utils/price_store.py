@@ -0,0 +1,93 @@
+import json
+import os
+import re
+import threading
+import numpy as np
+import pandas as pd
+
+class PriceStore:
+    """
+    Columnar on-disk store for OHLCV history: one .npz file per ticker.
+
+    Each column is saved as its own typed NumPy array next to an int64
+    (nanosecond) date index, so a load is a straight memory copy with no
+    text parsing. A small JSON metadata blob (fetch date, period, ...) is
+    stored inside the same file and can be read without touching the data.
+    """
+    def __init__(self, store_dir="data/raw"):
+        self.store_dir = store_dir
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    def path_for(self, ticker: str) -> str:
+        """Returns the file path used for a ticker (one file per ticker)."""
+        safe = re.sub(r"[^A-Za-z0-9._^=-]", "_", ticker)
+        return os.path.join(self.store_dir, f"{safe}.npz")
+
+    def state_path_for(self, ticker: str) -> str:
+        """Returns the path of the ticker's incremental indicator state (JSON)."""
+        return self.path_for(ticker)[:-len(".npz")] + ".state.json"
+
+    def exists(self, ticker: str) -> bool:
+        return os.path.exists(self.path_for(ticker))
+
+    def save(self, ticker: str, data: pd.DataFrame, **meta) -> str:
+        """
+        Writes the full history for a ticker, replacing any previous file.
+        Extra keyword arguments are stored as metadata (must be JSON serializable).
+        """
+        index = pd.DatetimeIndex(data.index)
+        if index.tz is not None:
+            meta["tz"] = str(index.tz)
+            index = index.tz_convert("UTC").tz_localize(None)
+
+        meta["columns"] = [str(c) for c in data.columns]
+        arrays = {
+            "index": index.as_unit("ns").asi8,
+            "meta": np.array(json.dumps(meta)),
+        }
+        for i, col in enumerate(data.columns):
+            arrays[f"col_{i}"] = data[col].to_numpy()
+
+        # Write to a temp file first so readers never see a half-written store
+        path = self.path_for(ticker)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+        return path
+
+    def read_meta(self, ticker: str) -> dict:
+        """Returns the stored metadata for a ticker, or {} if nothing is cached."""
+        path = self.path_for(ticker)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                return json.loads(str(npz["meta"]))
+        except Exception as e:
+            print(f"Store meta read error ({path}): {e}")
+            return {}
+
+    def load(self, ticker: str):
+        """
+        Loads the cached history for a ticker.
+
+        Returns:
+            pd.DataFrame or None: OHLCV frame indexed by date, None if not cached.
+        """
+        path = self.path_for(ticker)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                meta = json.loads(str(npz["meta"]))
+                index = pd.DatetimeIndex(npz["index"].astype("datetime64[ns]"), name="Date")
+                if meta.get("tz"):
+                    index = index.tz_localize("UTC").tz_convert(meta["tz"])
+                columns = {
+                    name: npz[f"col_{i}"] for i, name in enumerate(meta["columns"])
+                }
+            return pd.DataFrame(columns, index=index)
+        except Exception as e:
+            print(f"Store read error ({path}): {e}")
+            return None
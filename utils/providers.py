@@ -0,0 +1,292 @@
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+import pandas as pd
+from utils.rate_limiter import get_limiter, is_rate_limited
+
+class MarketDataProvider:
+    """
+    Interface for every upstream market data call (prices, fundamentals, news).
+
+    Price frames are returned with flat OHLCV columns indexed by date.
+    Statements (balance sheet, cash flow) use the yfinance layout: line items
+    as rows, statement dates as columns.
+    """
+    name = "base"
+
+    def history(self, ticker: str, period: str = None, start: str = None) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def history_many(self, tickers: list, period: str = None, start: str = None) -> dict:
+        """Default: one history() call per ticker. Providers may batch."""
+        return {t: self.history(t, period=period, start=start) for t in tickers}
+
+    def info(self, ticker: str) -> dict:
+        raise NotImplementedError
+
+    def balance_sheet(self, ticker: str) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def cashflow(self, ticker: str) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def news(self, ticker: str) -> list:
+        raise NotImplementedError
+
+class DownloadError(Exception):
+    """yf.download came back empty or throttled; carries the errors it logged."""
+
+class _ThreadErrors(logging.Handler):
+    """Collects the error records logged by one thread (yf.download reports failures only in its log)."""
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.thread = threading.get_ident()
+        self.messages = []
+
+    def emit(self, record):
+        if record.thread == self.thread:
+            self.messages.append(record.getMessage())
+
+# yf.Ticker handles kept by YFinanceProvider (LRU)
+MAX_TICKER_HANDLES = 64
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Live provider backed by Yahoo Finance. Every request goes through the
+    shared "yahoo" rate limiter (token bucket + jittered retries).
+    """
+    name = "yfinance"
+
+    def __init__(self, max_handles=MAX_TICKER_HANDLES):
+        self._tickers = OrderedDict()
+        self.max_handles = max_handles
+        self._lock = threading.Lock()
+        self._limiter = get_limiter("yahoo")
+
+    def _ticker(self, ticker):
+        # Reuse one yf.Ticker handle (and its HTTP session) per recently used symbol
+        import yfinance as yf
+        with self._lock:
+            if ticker in self._tickers:
+                self._tickers.move_to_end(ticker)
+            else:
+                self._tickers[ticker] = yf.Ticker(ticker)
+                # Long-lived app/bot: drop the least recently used handles
+                while len(self._tickers) > self.max_handles:
+                    self._tickers.popitem(last=False)
+            return self._tickers[ticker]
+
+    @staticmethod
+    def _download(tickers, **kwargs):
+        """
+        yf.download that raises instead of returning an empty frame. Its own
+        HTTP errors (429s included) are swallowed and only logged, so they are
+        read back from the log to let the rate limiter classify them.
+        """
+        import yfinance as yf
+        errors = _ThreadErrors()
+        yf_logger = logging.getLogger("yfinance")
+        yf_logger.addHandler(errors)
+        try:
+            data = yf.download(tickers, progress=False, **kwargs)
+        finally:
+            yf_logger.removeHandler(errors)
+        reported = " | ".join(m.strip() for m in errors.messages if m.strip())
+        if data is None or data.empty or is_rate_limited(reported):
+            raise DownloadError(f"No data downloaded for {tickers}: {reported or 'no error reported'}")
+        return data
+
+    def history(self, ticker, period=None, start=None):
+        kwargs = {"start": start} if start else {"period": period}
+        data = self._limiter.call(self._download, ticker, **kwargs)
+        # Flatten columns if MultiIndex (Attribute, Ticker)
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+        return data
+
+    def history_many(self, tickers, period=None, start=None):
+        kwargs = {"start": start} if start else {"period": period}
+        data = self._limiter.call(self._download, tickers, group_by="ticker", threads=True, **kwargs)
+        frames = {}
+        for ticker in tickers:
+            if isinstance(data.columns, pd.MultiIndex):
+                if ticker not in data.columns.get_level_values(0):
+                    frames[ticker] = pd.DataFrame()
+                    continue
+                df = data[ticker]
+            else:
+                df = data
+            # Drop the dates this ticker did not trade
+            frames[ticker] = df.dropna(how="all")
+        return frames
+
+    def info(self, ticker):
+        stock = self._ticker(ticker)
+        info = dict(self._limiter.call(lambda: stock.info) or {})
+        # Fallback for Market Cap (Fast Info)
+        if not info.get("marketCap"):
+            try:
+                info["marketCap"] = self._limiter.call(lambda: stock.fast_info["market_cap"], retries=1)
+            except Exception:
+                pass
+        return info
+
+    def balance_sheet(self, ticker):
+        stock = self._ticker(ticker)
+        return self._limiter.call(lambda: stock.balance_sheet)
+
+    def cashflow(self, ticker):
+        stock = self._ticker(ticker)
+        return self._limiter.call(lambda: stock.cashflow)
+
+    def news(self, ticker):
+        stock = self._ticker(ticker)
+        return self._limiter.call(lambda: stock.news) or []
+
+# {ticker}_{period}_{YYYY-MM-DD}.csv as written by the legacy CSV cache
+_CSV_NAME = re.compile(r"^(?P<ticker>.+)_(?P<period>[^_]+)_(?P<date>\d{4}-\d{2}-\d{2})\.csv$")
+
+class LocalFileProvider(MarketDataProvider):
+    """
+    Deterministic offline provider for profiling and load tests.
+
+    Prices replay the tracked CSV histories under `data_dir` (newest, longest
+    file per ticker), which retention never touches. Periods are measured
+    back from the last recorded bar, not from today, so results never change
+    between runs. Fundamentals and news come from recorded JSON files in
+    `fixtures_dir`:
+        {ticker}_fundamentals.json -> {"info": {...}, "balance_sheet": {date: {item: value}}, "cashflow": {...}}
+        {ticker}_news.json         -> [ {yfinance news item}, ... ]
+    """
+    name = "local"
+
+    def __init__(self, data_dir="data/fixtures/prices", fixtures_dir="data/fixtures"):
+        self.data_dir = data_dir
+        self.fixtures_dir = fixtures_dir
+        self._files = None
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def _index(self):
+        if self._files is None:
+            files = {}
+            for root, _, names in os.walk(self.data_dir):
+                for name in names:
+                    match = _CSV_NAME.match(name)
+                    if not match:
+                        continue
+                    path = os.path.join(root, name)
+                    key = (match.group("date"), os.path.getsize(path))
+                    ticker = match.group("ticker")
+                    if ticker not in files or key > files[ticker][0]:
+                        files[ticker] = (key, path)
+            self._files = {t: path for t, (_, path) in files.items()}
+        return self._files
+
+    def _load(self, ticker):
+        with self._lock:
+            if ticker not in self._frames:
+                path = self._index().get(ticker)
+                if path is None:
+                    self._frames[ticker] = pd.DataFrame()
+                else:
+                    df = pd.read_csv(path, index_col=0, parse_dates=True)
+                    self._frames[ticker] = df.apply(pd.to_numeric, errors="coerce").dropna(how="all")
+            return self._frames[ticker]
+
+    def history(self, ticker, period=None, start=None):
+        data = self._load(ticker)
+        if data.empty:
+            return data.copy()
+        if start:
+            return data[data.index >= pd.Timestamp(start)].copy()
+        if period:
+            from utils.data_loader import _period_start
+            first = _period_start(period, data.index[-1])
+            if first is not None:
+                return data[data.index >= first].copy()
+        return data.copy()
+
+    def _fixture(self, ticker, kind):
+        path = os.path.join(self.fixtures_dir, f"{ticker}_{kind}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _statement(self, ticker, key):
+        fixture = self._fixture(ticker, "fundamentals") or {}
+        return statement_from_dict(fixture.get(key))
+
+    def info(self, ticker):
+        return dict((self._fixture(ticker, "fundamentals") or {}).get("info", {}))
+
+    def balance_sheet(self, ticker):
+        return self._statement(ticker, "balance_sheet")
+
+    def cashflow(self, ticker):
+        return self._statement(ticker, "cashflow")
+
+    def news(self, ticker):
+        return self._fixture(ticker, "news") or []
+
+def statement_to_dict(df) -> dict:
+    """Statement frame (items x dates) -> JSON-friendly {date: {item: value}}."""
+    if df is None or df.empty:
+        return {}
+    return {str(pd.Timestamp(col).date()): {k: (None if pd.isna(v) else float(v)) for k, v in df[col].items()}
+            for col in df.columns}
+
+def statement_from_dict(statement) -> pd.DataFrame:
+    """Inverse of statement_to_dict."""
+    if not statement:
+        return pd.DataFrame()
+    df = pd.DataFrame(statement)
+    df.columns = pd.to_datetime(df.columns)
+    return df
+
+def record_fixtures(ticker: str, source: MarketDataProvider = None, fixtures_dir="data/fixtures"):
+    """
+    Records fundamentals and news for a ticker from a live provider into the
+    JSON files read by LocalFileProvider.
+    """
+    source = source or YFinanceProvider()
+    os.makedirs(fixtures_dir, exist_ok=True)
+
+    fundamentals = {
+        "ticker": ticker,
+        "recorded": pd.Timestamp.today().strftime("%Y-%m-%d"),
+        "info": source.info(ticker),
+        "balance_sheet": statement_to_dict(source.balance_sheet(ticker)),
+        "cashflow": statement_to_dict(source.cashflow(ticker)),
+    }
+    with open(os.path.join(fixtures_dir, f"{ticker}_fundamentals.json"), "w", encoding="utf-8") as f:
+        json.dump(fundamentals, f, indent=4, default=str)
+    with open(os.path.join(fixtures_dir, f"{ticker}_news.json"), "w", encoding="utf-8") as f:
+        json.dump(source.news(ticker), f, indent=4, default=str)
+
+_provider = None
+_provider_lock = threading.Lock()
+
+def get_provider() -> MarketDataProvider:
+    """
+    Returns the process-wide provider. Selected with the ARES_DATA_PROVIDER
+    environment variable ("yfinance" by default, "local" for offline runs).
+    """
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            if os.environ.get("ARES_DATA_PROVIDER", "yfinance").lower() == "local":
+                _provider = LocalFileProvider()
+            else:
+                _provider = YFinanceProvider()
+        return _provider
+
+def set_provider(provider: MarketDataProvider):
+    """Overrides the process-wide provider (benchmarks, load tests)."""
+    global _provider
+    with _provider_lock:
+        _provider = provider
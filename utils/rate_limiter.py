@@ -0,0 +1,160 @@
+import contextlib
+import contextvars
+import random
+import threading
+import time
+from utils.logger import setup_logger
+
+logger = setup_logger("RATE_LIMITER", "logs")
+
+# Requests per second and burst size per upstream. Override with a
+# "rate_limits" section in config.json, e.g. {"yahoo": {"rate": 1.0, "burst": 3}}
+DEFAULT_LIMITS = {
+    "yahoo": {"rate": 2.0, "burst": 5},
+    "gemini": {"rate": 0.25, "burst": 2},   # ~15 requests/minute free tier
+    "telegram": {"rate": 25.0, "burst": 30},
+}
+
+def is_rate_limited(error) -> bool:
+    """Heuristic: does this exception look like an upstream 429 / quota error?"""
+    text = str(error).lower()
+    return any(s in text for s in ("429", "too many requests", "rate limit", "quota"))
+
+# Exception type names / messages of network errors worth retrying
+# (requests, curl_cffi, urllib3, google.api_core)
+_TRANSIENT = ("timeout", "timed out", "connection", "dnserror", "unavailable",
+              "deadlineexceeded", "502", "503", "504", "curl: (")
+
+def is_transient(error) -> bool:
+    """Network / timeout failures that may succeed on retry (bad input never does)."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    text = f"{type(error).__name__} {error}".lower()
+    return any(s in text for s in _TRANSIENT)
+
+# time.monotonic() after which calls made in this context stop waiting and retrying
+_deadline = contextvars.ContextVar("rate_limit_deadline", default=None)
+
+@contextlib.contextmanager
+def deadline(at: float):
+    """
+    Bounds every RateLimiter.call() made inside the block (in this thread)
+    by time.monotonic() `at`: no token wait, retry or backoff past it. A
+    caller that stops waiting for a result stops its upstream calls too.
+    """
+    token = _deadline.set(at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by every caller of one upstream.
+
+    Calls wait only as long as needed for a token instead of fixed sleeps.
+    The rate adapts to the upstream: it is halved on every throttling
+    response (429) and recovers additively on success, up to the configured
+    rate (AIMD).
+    """
+    def __init__(self, name, rate, burst):
+        self.name = name
+        self.max_rate = rate
+        self.min_rate = rate / 16
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.throttled = 0
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, until=None):
+        """Blocks until a token is available. Raises TimeoutError if none is before `until`."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0 and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                if wait <= 0:
+                    wait = (1 - self._tokens) / self.rate
+            if until is not None and now + wait > until:
+                raise TimeoutError(f"{self.name}: deadline reached waiting for a token")
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def on_throttle(self, retry_after=None):
+        """Halves the rate and, if the upstream said so, pauses every caller."""
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + float(retry_after))
+        logger.warning(f"{self.name}: throttled upstream, rate now {self.rate:.2f}/s")
+
+    @staticmethod
+    def backoff_delay(attempt, base_delay=1.0, max_delay=30.0) -> float:
+        """Jittered exponential delay ("full jitter") for retry `attempt` (0-based)."""
+        return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+    def call(self, fn, *args, retries=3, base_delay=1.0, max_delay=30.0, until=None, **kwargs):
+        """
+        Runs fn(*args, **kwargs) paced by the bucket, retrying throttling and
+        network failures (is_rate_limited / is_transient) with jittered
+        exponential backoff. Other errors (bad ticker, KeyError...) are raised
+        at once; so is the last error once retries run out.
+
+        `until` (time.monotonic(); defaults to the enclosing deadline() block)
+        bounds the whole call: past it, no token wait or retry is started and
+        the last error (or TimeoutError) is raised instead.
+        """
+        until = _deadline.get() if until is None else until
+        for attempt in range(retries):
+            self.acquire(until)
+            try:
+                result = fn(*args, **kwargs)
+                self.on_success()
+                return result
+            except Exception as e:
+                throttled = is_rate_limited(e)
+                if throttled:
+                    self.on_throttle()
+                if attempt == retries - 1 or not (throttled or is_transient(e)):
+                    raise
+                delay = self.backoff_delay(attempt, base_delay, max_delay)
+                if until is not None and time.monotonic() + delay >= until:
+                    # The caller stops waiting before the retry could run
+                    raise
+                logger.debug(f"{self.name}: attempt {attempt + 1} failed ({e}), retrying")
+                time.sleep(delay)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"rate": self.rate, "max_rate": self.max_rate, "throttled": self.throttled}
+
+_limiters = {}
+_registry_lock = threading.Lock()
+
+def get_limiter(name: str) -> RateLimiter:
+    """Returns the process-wide limiter for an upstream ("yahoo", "gemini", "telegram")."""
+    with _registry_lock:
+        if name not in _limiters:
+            limits = dict(DEFAULT_LIMITS.get(name, {"rate": 1.0, "burst": 1}))
+            try:
+                from utils.config_loader import load_config
+                limits.update(load_config().get("rate_limits", {}).get(name, {}))
+            except Exception:
+                pass
+            _limiters[name] = RateLimiter(name, limits["rate"], limits["burst"])
+        return _limiters[name]
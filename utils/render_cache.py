@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import threading
+import pandas as pd
+
+# Columns a chart is drawn from
+CHART_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+class RenderCache:
+    """
+    Content-addressed cache for rendered charts (static PNGs and Plotly JSON).
+
+    An artifact's name is derived from what was drawn: the ticker, a digest
+    of the full OHLCV arrays and dates (an intraday bar or a split/dividend
+    restatement anywhere in the history changes it) and the chart spec. Repeat requests for unchanged data reuse
+    the file; concurrent requests write to private temp files and publish
+    them with an atomic rename, so they never overwrite each other.
+    Hits refresh the file's mtime, so age-based retention keeps hot charts.
+    """
+    def __init__(self, cache_dir="temp_dashboard"):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(ticker: str, data: pd.DataFrame, spec: dict = None) -> str:
+        """Hex digest identifying a chart of `data` drawn with `spec`."""
+        # Hashing the arrays costs far less than rendering the chart
+        cols = [c for c in CHART_COLUMNS if c in data.columns]
+        content = hashlib.sha256(data[cols].to_numpy(dtype="float64").tobytes())
+        content.update(data.index.astype("int64").to_numpy().tobytes())
+        content.update(",".join(cols).encode("utf-8"))
+        payload = json.dumps([ticker, content.hexdigest(), spec or {}], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, ticker: str, key: str, ext: str) -> str:
+        safe = "".join(c if c.isalnum() or c in "._^=-" else "_" for c in ticker)
+        return os.path.join(self.cache_dir, f"{safe}_{key[:16]}.{ext}")
+
+    def _lookup(self, path):
+        found = os.path.exists(path)
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if found:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return found
+
+    def _tmp_path(self, path):
+        root, ext = os.path.splitext(path)
+        return f"{root}.{os.getpid()}.{threading.get_ident()}.tmp{ext}"
+
+    def get_png(self, ticker: str, key: str, render) -> str:
+        """
+        Returns the path of the cached PNG, calling render(path) to draw it
+        on a miss.
+        """
+        path = self.path_for(ticker, key, "png")
+        if self._lookup(path):
+            return path
+        tmp_path = self._tmp_path(path)
+        try:
+            render(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path
+
+    def get_figure(self, ticker: str, key: str, build):
+        """
+        Returns the cached Plotly figure, calling build() and storing its JSON
+        on a miss.
+        """
+        import plotly.io as pio
+        path = self.path_for(ticker, key, "json")
+        if self._lookup(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return pio.from_json(f.read())
+            except Exception as e:
+                print(f"Render cache read error ({path}): {e}")
+
+        fig = build()
+        tmp_path = self._tmp_path(path)
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(fig.to_json())
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return fig
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / total if total else 0.0}
@@ -0,0 +1,196 @@
+import os
+import re
+import time
+import pandas as pd
+from utils.price_store import PriceStore
+from utils.file_lock import is_lock_file
+from utils.logger import setup_logger
+
+logger = setup_logger("RETENTION", "logs")
+
+MB = 1024 * 1024
+
+# Per-directory budgets. Files older than max_age_days are removed first, then the
+# oldest files until the directory fits in max_bytes. "compact" folds legacy
+# date-stamped CSVs into the per-ticker price store.
+DEFAULT_POLICIES = [
+    {"path": "data/raw", "max_age_days": 30, "max_bytes": 300 * MB, "compact": True},
+    {"path": "data/briefing", "max_age_days": 7, "max_bytes": 50 * MB, "compact": True},
+    {"path": "data/scanner", "max_age_days": 7, "max_bytes": 50 * MB, "compact": True},
+    {"path": "data/portfolio", "max_age_days": 7, "max_bytes": 50 * MB, "compact": True},
+    {"path": "data/fundamentals", "max_age_days": 400, "max_bytes": 20 * MB},
+    {"path": "data/news", "max_age_days": 400, "max_bytes": 50 * MB},
+    {"path": "temp_dashboard", "max_age_days": 2, "max_bytes": 100 * MB},
+    {"path": "reports", "max_age_days": 30, "max_bytes": 200 * MB},
+    {"path": "output", "max_age_days": 30, "max_bytes": 50 * MB},
+]
+
+# Tracked fixtures (offline replay, tests): never compacted or deleted, even if a
+# policy's directory contains them
+PROTECTED_PATHS = ["data/fixtures"]
+
+def is_protected(path) -> bool:
+    path = os.path.abspath(path)
+    for protected in PROTECTED_PATHS:
+        protected = os.path.abspath(protected)
+        if os.path.commonpath([path, protected]) == protected:
+            return True
+    return False
+
+# {ticker}_{period}_{YYYY-MM-DD}.csv written by the old get_market_data
+LEGACY_CSV = re.compile(r"^(?P<ticker>.+)_(?P<period>\d+(?:d|wk|mo|y)|ytd|max)_(?P<date>\d{4}-\d{2}-\d{2})\.csv$")
+
+# Orphaned temp files from interrupted store writes
+STALE_TMP_SECONDS = 3600
+
+class RetentionManager:
+    """
+    Keeps data caches, charts and reports within size and age budgets.
+
+    Designed to run incrementally from the scheduler: each run() call works
+    through the policies round-robin and stops once its time budget is used,
+    resuming from the next directory on the following call.
+    """
+    def __init__(self, policies=None, store_dir="data/raw"):
+        self.policies = policies or DEFAULT_POLICIES
+        self.store_dir = store_dir
+        self._cursor = 0
+
+    def run(self, max_seconds=5.0):
+        """
+        Applies retention to as many directories as fit in max_seconds
+        (None = a full pass over every policy).
+
+        Returns:
+            dict: {"files_removed": int, "bytes_freed": int, "compacted": int}
+        """
+        totals = {"files_removed": 0, "bytes_freed": 0, "compacted": 0}
+        deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+
+        for _ in range(len(self.policies)):
+            policy = self.policies[self._cursor]
+            self._cursor = (self._cursor + 1) % len(self.policies)
+            try:
+                result = self.apply(policy)
+                for key in totals:
+                    totals[key] += result[key]
+            except Exception as e:
+                logger.error(f"Retention failed for {policy['path']}: {e}")
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+        if totals["files_removed"] or totals["compacted"]:
+            logger.info(f"Retention: removed {totals['files_removed']} files "
+                        f"({totals['bytes_freed'] / MB:.1f} MB), compacted {totals['compacted']} histories.")
+        return totals
+
+    def apply(self, policy):
+        """Applies one directory policy."""
+        result = {"files_removed": 0, "bytes_freed": 0, "compacted": 0}
+        path = policy["path"]
+        if not os.path.isdir(path) or is_protected(path):
+            return result
+
+        if policy.get("compact"):
+            result["compacted"] = self.compact_legacy_csvs(path)
+
+        files = self._scan(path)
+        now = time.time()
+        max_age = policy.get("max_age_days")
+        max_bytes = policy.get("max_bytes")
+
+        kept = []
+        for entry in files:
+            too_old = max_age is not None and now - entry["mtime"] > max_age * 86400
+            stale_tmp = entry["path"].endswith(".tmp") and now - entry["mtime"] > STALE_TMP_SECONDS
+            if too_old or stale_tmp:
+                self._remove(entry, result)
+            else:
+                kept.append(entry)
+
+        if max_bytes is not None:
+            total = sum(e["size"] for e in kept)
+            # Oldest first until the directory fits its budget
+            for entry in sorted(kept, key=lambda e: e["mtime"]):
+                if total <= max_bytes:
+                    break
+                self._remove(entry, result)
+                total -= entry["size"]
+
+        self._remove_empty_dirs(path)
+        return result
+
+    def compact_legacy_csvs(self, path):
+        """
+        Folds date-stamped {ticker}_{period}_{date}.csv copies into the price store.
+        The newest, longest history per ticker is imported (unless the store already
+        holds a newer one) and every CSV copy for that ticker is deleted.
+
+        Returns:
+            int: Number of tickers compacted.
+        """
+        groups = {}
+        for name in os.listdir(path):
+            match = LEGACY_CSV.match(name)
+            if match and not is_protected(os.path.join(path, name)):
+                groups.setdefault(match.group("ticker"), []).append((match, os.path.join(path, name)))
+
+        if not groups:
+            return 0
+
+        store = PriceStore(self.store_dir)
+        compacted = 0
+        for ticker, copies in groups.items():
+            # Newest date wins; for the same date prefer the longest history
+            newest_match, newest_path = max(copies, key=lambda c: (c[0].group("date"), os.path.getsize(c[1])))
+            try:
+                if store.read_meta(ticker).get("fetched", "") < newest_match.group("date"):
+                    data = pd.read_csv(newest_path, index_col=0, parse_dates=True)
+                    data = data.apply(pd.to_numeric, errors="coerce").dropna(how="all")
+                    if not data.empty:
+                        store.save(ticker, data, period=newest_match.group("period"),
+                                   fetched=newest_match.group("date"))
+                for _, csv_path in copies:
+                    os.remove(csv_path)
+                compacted += 1
+            except Exception as e:
+                logger.warning(f"Could not compact {ticker} in {path}: {e}")
+        return compacted
+
+    def _scan(self, path):
+        files = []
+        for root, _, names in os.walk(path):
+            if is_protected(root):
+                continue
+            for name in names:
+                full = os.path.join(root, name)
+                if is_lock_file(full):
+                    # Held by other processes (e.g. the news store); never aged out
+                    continue
+                try:
+                    stat = os.stat(full)
+                except OSError:
+                    continue
+                files.append({"path": full, "size": stat.st_size, "mtime": stat.st_mtime})
+        return files
+
+    def _remove(self, entry, result):
+        try:
+            os.remove(entry["path"])
+            result["files_removed"] += 1
+            result["bytes_freed"] += entry["size"]
+        except OSError as e:
+            logger.warning(f"Could not remove {entry['path']}: {e}")
+
+    def _remove_empty_dirs(self, path):
+        # Bottom-up so reports/<ticker>/<date> folders disappear with their files
+        for root, _, _ in os.walk(path, topdown=False):
+            if root != path and not os.listdir(root):
+                try:
+                    os.rmdir(root)
+                except OSError:
+                    pass
+
+if __name__ == "__main__":
+    # Full pass: python -m utils.retention
+    print(RetentionManager().run(max_seconds=None))
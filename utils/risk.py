@@ -0,0 +1,134 @@
+"""
+Value at Risk and Conditional VaR (expected shortfall).
+
+Three estimators over daily log returns, for a single ticker or a weighted
+portfolio (buy-and-hold over the horizon):
+  - historical:  empirical quantile of overlapping h-day returns
+  - parametric:  normal approximation, scaled by sqrt(h)
+  - monte_carlo: correlated normal draws, generated in chunks so memory stays
+                 bounded (chunk_size x assets) for any number of paths
+
+VaR and CVaR are reported as horizon log returns (negative numbers are
+losses), the same convention as QuantEngine's "VaR (95%)".
+"""
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+CONFIDENCE_LEVELS = (0.95, 0.99)
+HORIZONS = (1, 10)
+MC_PATHS = 100_000
+MC_CHUNK_SIZE = 20_000
+
+def _as_frame(returns) -> pd.DataFrame:
+    if isinstance(returns, pd.Series):
+        return returns.to_frame()
+    return returns
+
+def _weights(returns: pd.DataFrame, weights) -> np.ndarray:
+    if weights is None:
+        return np.full(returns.shape[1], 1.0 / returns.shape[1])
+    if isinstance(weights, dict):
+        weights = [weights.get(c, 0.0) for c in returns.columns]
+    weights = np.asarray(weights, dtype="float64")
+    return weights / weights.sum()
+
+def portfolio_returns(returns: pd.DataFrame, weights: np.ndarray) -> np.ndarray:
+    """Log return of a buy-and-hold portfolio from per-asset log returns (rows)."""
+    returns = np.asarray(returns, dtype="float64")
+    if returns.shape[1] == 1:
+        return returns[:, 0]
+    return np.log(np.exp(returns) @ weights)
+
+def _var_cvar(samples: np.ndarray, confidence: float):
+    var = np.percentile(samples, (1 - confidence) * 100)
+    return var, samples[samples <= var].mean()
+
+def historical_var(returns, confidence=0.95, horizon=1, weights=None):
+    """
+    Returns:
+        tuple: (VaR, CVaR) from overlapping `horizon`-day returns.
+    """
+    returns = _as_frame(returns).dropna()
+    weights = _weights(returns, weights)
+    period_returns = returns.rolling(window=horizon).sum().dropna() if horizon > 1 else returns
+    return _var_cvar(portfolio_returns(period_returns, weights), confidence)
+
+def parametric_var(returns, confidence=0.95, horizon=1, weights=None):
+    """
+    Returns:
+        tuple: (VaR, CVaR) assuming normal daily portfolio returns.
+    """
+    returns = _as_frame(returns).dropna()
+    daily = portfolio_returns(returns, _weights(returns, weights))
+    mu = daily.mean() * horizon
+    sigma = daily.std(ddof=1) * np.sqrt(horizon)
+    z = norm.ppf(1 - confidence)
+    var = mu + z * sigma
+    cvar = mu - sigma * norm.pdf(z) / (1 - confidence)
+    return var, cvar
+
+def simulate_returns(returns, horizon=1, weights=None, n_paths=MC_PATHS,
+                     chunk_size=MC_CHUNK_SIZE, seed=None) -> np.ndarray:
+    """
+    Monte Carlo portfolio log returns over `horizon` days from a multivariate
+    normal fitted to the daily returns (mean vector + covariance). The h-day
+    sum of i.i.d. normal days is drawn directly as N(h*mu, h*cov).
+    Paths are generated `chunk_size` at a time; only the portfolio
+    return per path is kept. The result does not depend on chunk_size.
+    """
+    returns = _as_frame(returns).dropna()
+    weights = _weights(returns, weights)
+    values = returns.to_numpy(dtype="float64")
+    mu = values.mean(axis=0) * horizon
+    cov = np.atleast_2d(np.cov(values, rowvar=False)) * horizon
+    try:
+        factor = np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        # Singular covariance (e.g. duplicated assets): eigen factorization
+        eigval, eigvec = np.linalg.eigh(cov)
+        factor = eigvec * np.sqrt(np.clip(eigval, 0, None))
+
+    rng = np.random.default_rng(seed)
+    simulated = np.empty(n_paths)
+    for start in range(0, n_paths, chunk_size):
+        size = min(chunk_size, n_paths - start)
+        draws = rng.standard_normal((size, len(mu))) @ factor.T + mu
+        simulated[start:start + size] = portfolio_returns(draws, weights)
+    return simulated
+
+def monte_carlo_var(returns, confidence=0.95, horizon=1, weights=None, n_paths=MC_PATHS,
+                    chunk_size=MC_CHUNK_SIZE, seed=None):
+    """
+    Returns:
+        tuple: (VaR, CVaR) from simulated paths.
+    """
+    simulated = simulate_returns(returns, horizon, weights, n_paths, chunk_size, seed)
+    return _var_cvar(simulated, confidence)
+
+def risk_report(returns, weights=None, confidence_levels=CONFIDENCE_LEVELS, horizons=HORIZONS,
+                n_paths=MC_PATHS, chunk_size=MC_CHUNK_SIZE, seed=None) -> pd.DataFrame:
+    """
+    VaR and CVaR for every method, confidence level and horizon.
+
+    Args:
+        returns (pd.Series | pd.DataFrame): Daily log returns (one column per asset).
+        weights (array | dict, optional): Portfolio weights. Equal weights if None.
+
+    Returns:
+        pd.DataFrame: Columns Method, Confidence, Horizon, VaR, CVaR.
+    """
+    rows = []
+    for horizon in horizons:
+        # One simulation per horizon serves every confidence level
+        simulated = simulate_returns(returns, horizon, weights, n_paths, chunk_size, seed)
+        for confidence in confidence_levels:
+            estimates = {
+                "Historical": historical_var(returns, confidence, horizon, weights),
+                "Parametric": parametric_var(returns, confidence, horizon, weights),
+                "Monte Carlo": _var_cvar(simulated, confidence),
+            }
+            for method, (var, cvar) in estimates.items():
+                rows.append({"Method": method, "Confidence": confidence, "Horizon": horizon,
+                             "VaR": var, "CVaR": cvar})
+    return pd.DataFrame(rows)
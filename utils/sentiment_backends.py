@@ -0,0 +1,146 @@
+"""
+Headline polarity scorers for Researcher.
+
+Every backend has a `name` (also the name of its SentimentStore file) and
+score(titles) -> list of polarities in [-1, 1], one per title, for a whole
+batch at once. The backend is chosen with "sentiment_backend" in
+config.json ("textblob" by default, or "lexicon").
+
+"lexicon" is experimental and NOT a drop-in for TextBlob: on the 100
+recorded fixture headlines (`python bench_sentiment.py`) it reaches
+correlation 0.01, same label 53% and mean |diff| 0.202 against TextBlob.
+Its scores live in their own SentimentStore file and should not be
+compared with TextBlob history.
+"""
+import re
+import numpy as np
+from utils.logger import setup_logger
+
+logger = setup_logger("SENTIMENT", "logs")
+
+class SentimentBackend:
+    name = "base"
+
+    def score(self, titles: list) -> list:
+        raise NotImplementedError
+
+class TextBlobBackend(SentimentBackend):
+    """TextBlob's pattern-based polarity (the original scorer)."""
+    name = "textblob"
+
+    def score(self, titles):
+        from textblob import TextBlob
+        return [TextBlob(title).sentiment.polarity for title in titles]
+
+# Valence of headline words, on TextBlob's [-1, 1] scale
+FINANCIAL_LEXICON = {
+    # Positive
+    "beat": 0.6, "beats": 0.6, "tops": 0.5, "surge": 0.7, "surges": 0.7, "surged": 0.7,
+    "soar": 0.8, "soars": 0.8, "soared": 0.8, "jump": 0.5, "jumps": 0.5, "jumped": 0.5,
+    "rally": 0.6, "rallies": 0.6, "rallied": 0.6, "gain": 0.4, "gains": 0.4, "gained": 0.4,
+    "rise": 0.3, "rises": 0.3, "rising": 0.3, "rose": 0.3, "climb": 0.4, "climbs": 0.4, "rebound": 0.4,
+    "rebounds": 0.4, "record": 0.4, "high": 0.2, "highs": 0.3, "strong": 0.43, "stronger": 0.5,
+    "growth": 0.4, "grow": 0.3, "grows": 0.3, "profit": 0.4, "profits": 0.4, "profitable": 0.5,
+    "upgrade": 0.6, "upgrades": 0.6, "upgraded": 0.6, "outperform": 0.6, "bullish": 0.7,
+    "buy": 0.3, "boost": 0.5, "boosts": 0.5, "raises": 0.3, "raised": 0.3, "expands": 0.3,
+    "win": 0.6, "wins": 0.6, "approval": 0.4, "approved": 0.4, "breakthrough": 0.7,
+    "optimism": 0.5, "optimistic": 0.5, "positive": 0.23, "good": 0.7, "great": 0.8,
+    "best": 1.0, "better": 0.5, "robust": 0.4, "solid": 0.3, "success": 0.5, "successful": 0.6,
+    "dividend": 0.2, "buyback": 0.3, "recovery": 0.4, "recovers": 0.4, "upbeat": 0.5,
+    # Negative
+    "miss": -0.5, "misses": -0.5, "missed": -0.5, "fall": -0.4, "falls": -0.4, "falling": -0.4, "fell": -0.4,
+    "drop": -0.4, "drops": -0.4, "dropped": -0.4, "plunge": -0.8, "plunges": -0.8,
+    "plunged": -0.8, "tumble": -0.7, "tumbles": -0.7, "slump": -0.6, "slumps": -0.6,
+    "sink": -0.5, "sinks": -0.5, "slide": -0.4, "slides": -0.4, "decline": -0.4,
+    "declines": -0.4, "low": -0.2, "lows": -0.3, "weak": -0.38, "weaker": -0.45,
+    "loss": -0.5, "losses": -0.5, "downgrade": -0.6, "downgrades": -0.6, "downgraded": -0.6,
+    "underperform": -0.6, "bearish": -0.7, "sell": -0.3, "selloff": -0.6, "cut": -0.3,
+    "cuts": -0.3, "layoffs": -0.6, "lawsuit": -0.5, "sued": -0.5, "probe": -0.4,
+    "investigation": -0.4, "fine": -0.3, "fined": -0.5, "recall": -0.5, "recalls": -0.5,
+    "bankruptcy": -0.9, "default": -0.7, "fraud": -0.9, "crash": -0.8, "crashes": -0.8,
+    "warning": -0.4, "warns": -0.4, "risk": -0.2, "risks": -0.2, "fears": -0.5, "fear": -0.5,
+    "concern": -0.3, "concerns": -0.3, "volatile": -0.3, "volatility": -0.2, "bad": -0.7,
+    "worst": -1.0, "worse": -0.5, "negative": -0.3, "disappointing": -0.6, "disappoints": -0.6,
+    "slowdown": -0.5, "recession": -0.7, "inflation": -0.2, "delay": -0.3, "delays": -0.3,
+    "halt": -0.4, "halts": -0.4, "struggle": -0.5, "struggles": -0.5,
+}
+NEGATORS = frozenset({"not", "no", "never", "without", "isn't", "doesn't", "didn't", "won't"})
+# Multiply the next word's valence (TextBlob uses the same idea for "very")
+INTENSIFIERS = {"very": 1.3, "sharply": 1.4, "strongly": 1.3, "significantly": 1.3,
+                "slightly": 0.6, "modestly": 0.7, "huge": 1.3, "massive": 1.4}
+# TextBlob flips a negated word to -0.5x its valence
+NEGATION_FACTOR = -0.5
+
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+class LexiconBackend(SentimentBackend):
+    """
+    Financial-headline lexicon scored with NumPy. The whole batch is
+    tokenized in one pass, every token is looked up once in the vocabulary
+    and the per-title polarity is the mean valence of its sentiment words
+    (as in TextBlob), with negators and intensifiers applied to the word
+    that follows them. No import or corpus load on first use.
+
+    Much faster than TextBlob but it does not agree with it (correlation
+    0.01 on the fixture headlines, see the module docstring).
+    """
+    name = "lexicon"
+
+    def __init__(self, lexicon=FINANCIAL_LEXICON, negators=NEGATORS, intensifiers=INTENSIFIERS):
+        words = list(lexicon) + [w for w in list(negators) + list(intensifiers) if w not in lexicon]
+        self.vocab = {word: i for i, word in enumerate(words)}
+        self.valence = np.array([lexicon.get(w, 0.0) for w in words])
+        self.negation = np.array([NEGATION_FACTOR if w in negators else 1.0 for w in words])
+        self.intensity = np.array([intensifiers.get(w, 1.0) for w in words])
+
+    def score(self, titles):
+        if not titles:
+            return []
+        tokens, doc_ids = [], []
+        for i, title in enumerate(titles):
+            words = _TOKEN.findall(title.lower())
+            tokens.extend(words)
+            doc_ids.extend([i] * len(words))
+        if not tokens:
+            return [0.0] * len(titles)
+
+        vocab = self.vocab
+        ids = np.fromiter((vocab.get(t, -1) for t in tokens), dtype=np.int64, count=len(tokens))
+        doc_ids = np.asarray(doc_ids)
+        known = ids >= 0
+        safe_ids = np.where(known, ids, 0)
+        valence = np.where(known, self.valence[safe_ids], 0.0)
+        modifier = np.where(known, self.negation[safe_ids] * self.intensity[safe_ids], 1.0)
+
+        # A modifier applies to the next word of the same title
+        prev_modifier = np.ones_like(modifier)
+        same_doc = doc_ids[1:] == doc_ids[:-1]
+        prev_modifier[1:] = np.where(same_doc, modifier[:-1], 1.0)
+        valence = valence * prev_modifier
+
+        scored = valence != 0
+        totals = np.bincount(doc_ids, weights=valence, minlength=len(titles))
+        counts = np.bincount(doc_ids, weights=scored, minlength=len(titles))
+        polarity = np.divide(totals, counts, out=np.zeros(len(titles)), where=counts > 0)
+        return np.clip(polarity, -1.0, 1.0).tolist()
+
+BACKENDS = {
+    TextBlobBackend.name: TextBlobBackend,
+    LexiconBackend.name: LexiconBackend,
+}
+
+def get_backend(name: str = None) -> SentimentBackend:
+    """Backend `name`, or the one configured as "sentiment_backend" (default "textblob")."""
+    if name is None:
+        name = "textblob"
+        try:
+            from utils.config_loader import load_config
+            name = load_config().get("sentiment_backend", name)
+        except Exception:
+            pass
+    if name not in BACKENDS:
+        raise KeyError(f"Unknown sentiment backend '{name}' (available: {', '.join(BACKENDS)})")
+    if name == LexiconBackend.name:
+        logger.warning("sentiment backend 'lexicon' is experimental: it does not agree with "
+                       "TextBlob on the fixture headlines (correlation 0.01, same label 53%)")
+    return BACKENDS[name]()
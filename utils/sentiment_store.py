@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import threading
+from utils.file_lock import LOCK_SUFFIX, file_lock
+from utils.sentiment_backends import get_backend
+
+# Polarities kept on disk; the oldest entries are dropped beyond this
+MAX_ENTRIES = 50_000
+# The log is compacted once it holds this many times max_entries lines
+COMPACT_SLACK = 1.25
+
+def headline_key(title: str) -> str:
+    """Hash of the headline with whitespace normalized (same text, same key)."""
+    normalized = " ".join(title.split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+class SentimentStore:
+    """
+    Headline polarities memoized by headline hash, shared across tickers and
+    persisted as one append-only log per backend (a JSON [key, polarity] per
+    line), so a headline syndicated under several tickers or seen again on a
+    repeated /analyze is scored once.
+
+    score() looks every headline up, scores only the unseen ones in a single
+    batch and appends just those lines, under a file lock shared with other
+    processes (dashboard, bot). Lines other processes appended are picked up
+    incrementally. The log is rewritten (deduplicated, oldest headlines
+    dropped beyond max_entries) only once it outgrows max_entries by
+    COMPACT_SLACK, so a write costs O(new headlines), not O(store size).
+    A {key: polarity} JSON file left by older versions is imported once.
+    """
+    def __init__(self, path=None, backend=None, max_entries=MAX_ENTRIES):
+        self.backend = backend or get_backend()
+        # Backends disagree on polarities: one file each
+        self.path = path or os.path.join("data", "sentiment", f"{self.backend.name}.jsonl")
+        self.lock_path = f"{self.path}{LOCK_SUFFIX}"
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._scores = None
+        # Log position already read (file identity + byte offset)
+        self._file_id = None
+        self._offset = 0
+        self._lines = 0
+        self._lock = threading.Lock()
+
+    def _legacy_path(self):
+        root, ext = os.path.splitext(self.path)
+        return f"{root}.json" if ext == ".jsonl" else None
+
+    def _read_legacy(self) -> dict:
+        legacy = self._legacy_path()
+        if not legacy or not os.path.exists(legacy):
+            return {}
+        try:
+            with open(legacy, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Sentiment store read error ({legacy}): {e}")
+            return {}
+
+    def _catch_up(self):
+        """Reads the lines appended since the last call (everything after a compaction)."""
+        if self._scores is None:
+            self._scores = {}
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._file_id or stat.st_size < self._offset:
+            # First read, or the log was compacted (replaced) by another process
+            self._scores, self._offset, self._lines, self._file_id = {}, 0, 0, file_id
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                chunk = f.read()
+        except OSError as e:
+            print(f"Sentiment store read error ({self.path}): {e}")
+            return
+        # An unterminated last line is still being written: read it next time
+        chunk = chunk[:chunk.rfind(b"\n") + 1]
+        self._offset += len(chunk)
+        for line in chunk.splitlines():
+            try:
+                key, polarity = json.loads(line)
+            except ValueError:
+                continue
+            self._scores[key] = polarity
+            self._lines += 1
+
+    def _append(self, new_scores: dict):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with file_lock(self.lock_path):
+            self._catch_up()
+            if not os.path.exists(self.path):
+                # First write: carry over the old single-file store
+                new_scores = {**self._read_legacy(), **new_scores}
+            lines = "".join(json.dumps([key, polarity]) + "\n" for key, polarity in new_scores.items())
+            with open(self.path, "ab") as f:
+                f.write(lines.encode("utf-8"))
+            self._catch_up()
+            if self._lines > self.max_entries * COMPACT_SLACK:
+                self._compact()
+
+    def _compact(self):
+        """Rewrites the log with one line per headline, newest max_entries kept. Called under the file lock."""
+        # Dicts keep insertion order: drop the oldest headlines
+        self._scores = dict(list(self._scores.items())[-self.max_entries:])
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, polarity in self._scores.items():
+                f.write(json.dumps([key, polarity]) + "\n")
+        os.replace(tmp_path, self.path)
+        stat = os.stat(self.path)
+        self._file_id, self._offset, self._lines = (stat.st_dev, stat.st_ino), stat.st_size, len(self._scores)
+
+    def score(self, titles: list) -> list:
+        """Polarity of each headline, in order. Unseen headlines are scored in one batch."""
+        keys = [headline_key(t) for t in titles]
+        with self._lock:
+            if self._scores is None:
+                self._catch_up()
+                if not self._scores:
+                    self._scores = self._read_legacy()
+            missing = {}
+            for key, title in zip(keys, titles):
+                if key not in self._scores:
+                    missing.setdefault(key, title)
+            if missing:
+                # Another process may have scored them meanwhile
+                self._catch_up()
+                missing = {key: title for key, title in missing.items() if key not in self._scores}
+            # A headline repeated within the batch is scored once: one miss
+            self.misses += len(missing)
+            self.hits += len(keys) - len(missing)
+
+            if missing:
+                polarities = self.backend.score(list(missing.values()))
+                new_scores = dict(zip(missing, polarities))
+                try:
+                    self._append(new_scores)
+                except Exception as e:
+                    # Scores are still served from memory
+                    print(f"Sentiment store write error ({self.path}): {e}")
+                self._scores.update(new_scores)
+            return [self._scores[key] for key in keys]
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._scores or {}),
+                    "hit_rate": self.hits / total if total else 0.0}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_sentiment_store(backend: str = None) -> SentimentStore:
+    """Returns the process-wide headline store of a backend (the configured one by default)."""
+    backend = get_backend(backend)
+    with _stores_lock:
+        if backend.name not in _stores:
+            _stores[backend.name] = SentimentStore(backend=backend)
+        return _stores[backend.name]
@@ -0,0 +1,206 @@
+import copy
+import json
+import math
+import os
+import threading
+from collections import deque
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+# Bumped when the serialized layout changes; older files are rebuilt
+STATE_VERSION = 3
+
+class IndicatorState:
+    """
+    Incremental indicator state: each new daily bar is folded in in O(1)
+    instead of recomputing over the whole history.
+
+    Tracks the same quantities as QuantEngine / utils.indicators:
+      - RSI(14) from rolling windows of gains and losses (utils.indicators.rsi)
+      - SMA 10 / SMA 20 from rolling windows of closes
+      - log-return mean and variance (Welford) for volatility and Sharpe
+      - running peak of the cumulative return path for max drawdown
+    Results equal the batch computation (utils.indicators.batch_metrics) over
+    every bar seen since `first_timestamp`. VaR needs the full return distribution and is not
+    tracked here.
+
+    The state is JSON-serializable and is stored next to the cached history.
+    """
+    def __init__(self, rsi_period=14, sma_windows=(10, 20), risk_free_rate=0.04):
+        self.rsi_period = rsi_period
+        self.sma_windows = tuple(sma_windows)
+        self.risk_free_rate = risk_free_rate
+
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.last_close = None
+        self.gains = deque(maxlen=rsi_period)
+        self.losses = deque(maxlen=rsi_period)
+        self.closes = deque(maxlen=max(self.sma_windows))
+
+        # Welford accumulators over log returns
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+        # Cumulative return path, (1 + r) compounded as in QuantEngine
+        self.cumulative = 1.0
+        self.peak = None
+        self.max_drawdown = None
+
+        # Newest (timestamp, close), not yet folded in
+        self.pending = None
+
+    def update(self, timestamp, close):
+        """
+        Adds a bar in O(1). The newest bar stays pending (it may be an intraday
+        snapshot): a bar with the same timestamp replaces it, and it is only
+        folded into the running state once a later bar arrives. Older bars are
+        ignored.
+        """
+        timestamp = pd.Timestamp(timestamp)
+        if self.pending is not None:
+            if timestamp < self.pending[0]:
+                return self
+            if timestamp > self.pending[0]:
+                self._fold(*self.pending)
+        self.pending = (timestamp, float(close))
+        return self
+
+    def _fold(self, timestamp, close):
+        if self.last_close is None:
+            self.first_timestamp = timestamp
+            # First bar: the batch RSI counts its (undefined) change as a zero gain/loss
+            delta = 0.0
+        else:
+            delta = close - self.last_close
+            ret = math.log(close / self.last_close)
+
+            self.n += 1
+            diff = ret - self.mean
+            self.mean += diff / self.n
+            self.m2 += diff * (ret - self.mean)
+
+            self.cumulative *= 1 + ret
+            self.peak = self.cumulative if self.peak is None else max(self.peak, self.cumulative)
+            drawdown = self.cumulative / self.peak - 1
+            self.max_drawdown = drawdown if self.max_drawdown is None else min(self.max_drawdown, drawdown)
+
+        self.gains.append(delta if delta > 0 else 0.0)
+        self.losses.append(-delta if delta < 0 else 0.0)
+        self.closes.append(close)
+        self.last_close = close
+        self.last_timestamp = timestamp
+
+    def sync(self, data: pd.DataFrame):
+        """Applies only the bars of `data` newer than the state (O(new bars))."""
+        new = data if self.last_timestamp is None else data[data.index > self.last_timestamp]
+        if self.pending is not None:
+            new = new[new.index >= self.pending[0]]
+        for timestamp, close in new['Close'].items():
+            self.update(timestamp, close)
+        return self
+
+    @classmethod
+    def from_history(cls, data: pd.DataFrame, **kwargs):
+        return cls(**kwargs).sync(data)
+
+    def rsi(self):
+        if len(self.gains) < self.rsi_period:
+            return np.nan
+        # Window sums are recomputed (O(period)) to avoid floating point drift
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = np.float64(sum(self.gains) / self.rsi_period) / np.float64(sum(self.losses) / self.rsi_period)
+            return float(100 - (100 / (1 + rs)))
+
+    def sma(self, window):
+        if len(self.closes) < window:
+            return np.nan
+        return sum(list(self.closes)[-window:]) / window
+
+    def volatility(self):
+        if self.n < 2:
+            return np.nan
+        return math.sqrt(self.m2 / (self.n - 1))
+
+    def snapshot(self) -> dict:
+        """Current metrics (pending bar included), keyed like QuantEngine.analyze()."""
+        if self.pending is not None:
+            # Copying the state is O(window), independent of the history length
+            state = copy.deepcopy(self)
+            state._fold(*state.pending)
+            state.pending = None
+            return state.snapshot()
+
+        std = self.volatility()
+        sharpe = np.nan
+        if self.n >= 2 and std > 0:
+            sharpe = (self.mean - self.risk_free_rate / TRADING_DAYS) / std * math.sqrt(TRADING_DAYS)
+        result = {
+            "Last Price": self.last_close,
+            "RSI (14)": self.rsi(),
+            "Annualized Volatility": std * math.sqrt(TRADING_DAYS),
+            "Max Drawdown": self.max_drawdown if self.max_drawdown is not None else np.nan,
+            "Sharpe Ratio": sharpe,
+        }
+        for window in self.sma_windows:
+            result[f"SMA {window}"] = self.sma(window)
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "version": STATE_VERSION,
+            "rsi_period": self.rsi_period,
+            "sma_windows": list(self.sma_windows),
+            "risk_free_rate": self.risk_free_rate,
+            "first_timestamp": self.first_timestamp.isoformat() if self.first_timestamp is not None else None,
+            "last_timestamp": self.last_timestamp.isoformat() if self.last_timestamp is not None else None,
+            "last_close": self.last_close,
+            "gains": list(self.gains),
+            "losses": list(self.losses),
+            "closes": list(self.closes),
+            "n": self.n,
+            "mean": self.mean,
+            "m2": self.m2,
+            "cumulative": self.cumulative,
+            "peak": self.peak,
+            "max_drawdown": self.max_drawdown,
+            "pending": [self.pending[0].isoformat(), self.pending[1]] if self.pending else None,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict):
+        state = cls(d["rsi_period"], d["sma_windows"], d["risk_free_rate"])
+        state.first_timestamp = pd.Timestamp(d["first_timestamp"]) if d["first_timestamp"] else None
+        state.last_timestamp = pd.Timestamp(d["last_timestamp"]) if d["last_timestamp"] else None
+        state.last_close = d["last_close"]
+        state.gains.extend(d["gains"])
+        state.losses.extend(d["losses"])
+        state.closes.extend(d["closes"])
+        state.n, state.mean, state.m2 = d["n"], d["mean"], d["m2"]
+        state.cumulative, state.peak, state.max_drawdown = d["cumulative"], d["peak"], d["max_drawdown"]
+        if d.get("pending"):
+            state.pending = (pd.Timestamp(d["pending"][0]), d["pending"][1])
+        return state
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Returns the saved state, or None if missing/unreadable/outdated."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as f:
+                d = json.load(f)
+            if d.get("version") != STATE_VERSION:
+                return None
+            return cls.from_dict(d)
+        except Exception as e:
+            print(f"Indicator state read error ({path}): {e}")
+            return None
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from utils.indicators import log_returns, rsi, sma
+from utils.memory_cache import MemoryCache
+
+# Timeframe -> (resample rule, bars per year). Daily bars are used as-is.
+TIMEFRAMES = {
+    "Daily": (None, 252),
+    "Weekly": ("W-FRI", 52),
+    "Monthly": ("ME", 12),
+}
+
+# Results per (ticker, first bar, last bar, last close): a new bar or an
+# intraday revision changes the key, so entries never need invalidation
+_cache = MemoryCache(max_bytes=16 * 1024 * 1024, ttl=24 * 60 * 60)
+
+def resample_ohlcv(data: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """Aggregates daily OHLCV bars into `rule` bars (e.g. "W-FRI", "ME")."""
+    agg = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    agg = {col: how for col, how in agg.items() if col in data.columns}
+    return data.resample(rule).agg(agg).dropna(subset=["Close"])
+
+def _metrics(close: pd.Series, bars_per_year: int) -> dict:
+    returns = log_returns(close)
+    return {
+        "Last Close": close.iloc[-1],
+        "RSI (14)": rsi(close, 14).iloc[-1],
+        "SMA 10": sma(close, 10).iloc[-1],
+        "SMA 20": sma(close, 20).iloc[-1],
+        "Annualized Volatility": returns.std() * np.sqrt(bars_per_year),
+        "Bars": len(close),
+    }
+
+def multi_timeframe(ticker: str, data: pd.DataFrame, timeframes=TIMEFRAMES) -> dict:
+    """
+    RSI, SMA 10/20 and annualized volatility per timeframe, resampled from
+    the daily history (no extra downloads). Indicators need enough bars:
+    monthly SMA 20 or RSI 14 stay NaN on short histories.
+
+    Returns:
+        dict: {"Daily": {...}, "Weekly": {...}, "Monthly": {...}}
+    """
+    if data.empty:
+        return {}
+    key = (ticker, data.index[0], data.index[-1], float(data['Close'].iloc[-1]), tuple(timeframes))
+    cached = _cache.get(key)
+    if cached is not None:
+        return {name: dict(values) for name, values in cached.items()}
+
+    result = {}
+    for name, (rule, bars_per_year) in timeframes.items():
+        bars = data if rule is None else resample_ohlcv(data, rule)
+        result[name] = _metrics(bars['Close'], bars_per_year)
+    _cache.set(key, result)
+    return {name: dict(values) for name, values in result.items()}